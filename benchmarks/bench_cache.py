@@ -0,0 +1,128 @@
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.bench_generation import percentile
+from equation_generator import EQUATION_REGISTRY
+from equation_generator.cache_control import CacheManager, clear_caches, sympy_cache_entries, current_rss_bytes
+from equation_generator.generation import generate_record_safe
+
+
+def run_sequence(type_keys, count, manager):
+    clear_caches()
+    latencies = []
+    failures = 0
+
+    for i in range(count):
+        task = (type_keys[i % len(type_keys)], i)
+        t0 = time.perf_counter()
+        record, error = generate_record_safe(task)
+        if manager is not None:
+            manager.after_equation()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if record is None:
+            failures += 1
+
+    rss = current_rss_bytes()
+    return {
+        'count': count,
+        'failures': failures,
+        'mean_ms': sum(latencies) / len(latencies),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies),
+        'cache_entries': sympy_cache_entries(),
+        'rss_mb': rss / (1024 * 1024) if rss is not None else None,
+        'manager': manager.metrics if manager is not None else None,
+    }
+
+
+def measure_full_clear(repeats):
+    samples = []
+    for _ in range(repeats):
+        # Наповнюємо кеш однією генерацією кожного типу, потім міряємо очищення.
+        for type_key in EQUATION_REGISTRY:
+            generate_record_safe((type_key, 0))
+        t0 = time.perf_counter()
+        clear_caches()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {'p50_ms': percentile(samples, 50), 'max_ms': max(samples)}
+
+
+def summarize(runs):
+    return {
+        'runs': len(runs),
+        'mean_ms': sum(r['mean_ms'] for r in runs) / len(runs),
+        'p50_ms': percentile([r['p50_ms'] for r in runs], 50),
+        'p95_ms': percentile([r['p95_ms'] for r in runs], 50),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк впливу очищення кешів SymPy на затримку генерації.")
+    parser.add_argument('--types', default=','.join(EQUATION_REGISTRY))
+    parser.add_argument('--count', type=int, default=300)
+    parser.add_argument('--max-cache-entries', type=int, default=5000)
+    parser.add_argument('--max-rss-mb', type=float, default=None)
+    parser.add_argument('--check-every', type=int, default=1)
+    parser.add_argument('--mode', choices=('trim', 'clear'), default='trim')
+    parser.add_argument('--rounds', type=int, default=2, help="скільки разів прогнати обидва порядки")
+    parser.add_argument('--clear-repeats', type=int, default=5)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+
+    type_keys = [t.strip() for t in args.types.split(',') if t.strip()]
+
+    def make_manager(name):
+        if name == 'unmanaged':
+            return None
+        return CacheManager(max_cache_entries=args.max_cache_entries, max_rss_mb=args.max_rss_mb,
+                            check_every=args.check_every, mode=args.mode)
+
+    # Одноразові витрати (імпорт генераторів, компіляція просторів параметрів, lambdify) -- до вимірів,
+    # а порядок прогонів чергуємо, щоб жоден варіант не платив за прогрів.
+    t0 = time.perf_counter()
+    for type_key in type_keys:
+        generate_record_safe((type_key, 0))
+    results = {'warm_up_ms': (time.perf_counter() - t0) * 1000, 'runs': {'unmanaged': [], 'managed': []}}
+    for round_index in range(args.rounds):
+        for order in (('unmanaged', 'managed'), ('managed', 'unmanaged')):
+            for position, name in enumerate(order):
+                stats = run_sequence(type_keys, args.count, make_manager(name))
+                stats.update({'round': round_index, 'position': position})
+                results['runs'][name].append(stats)
+                rss = f"{stats['rss_mb']:.1f}MB" if stats['rss_mb'] is not None else "n/a"
+                print(f"{name:<10} {'першим' if position == 0 else 'другим':<7} mean={stats['mean_ms']:7.2f}ms  "
+                      f"p50={stats['p50_ms']:7.2f}ms  p95={stats['p95_ms']:7.2f}ms  p99={stats['p99_ms']:7.2f}ms  "
+                      f"cache={stats['cache_entries']:6d}  rss={rss}")
+
+    results['summary'] = {}
+    for name, runs in results['runs'].items():
+        results['summary'][name] = {
+            'all': summarize(runs),
+            'first': summarize([r for r in runs if r['position'] == 0]),
+            'second': summarize([r for r in runs if r['position'] == 1]),
+        }
+        summary = results['summary'][name]
+        print(f"{name:<10} усього mean={summary['all']['mean_ms']:7.2f}ms  "
+              f"першим {summary['first']['mean_ms']:7.2f}ms  другим {summary['second']['mean_ms']:7.2f}ms")
+
+    managed = [r['manager'] for r in results['runs']['managed']]
+    print(f"очищень: {sum(m['clears'] for m in managed)}, видалено записів: {sum(m['entries_cleared'] for m in managed)}, "
+          f"час очищення: {sum(m['clear_time_ms'] for m in managed):.2f}ms, "
+          f"пік кешу: {max(m['peak_cache_entries'] for m in managed)}")
+
+    results['full_clear'] = measure_full_clear(args.clear_repeats)
+    print(f"повне очищення: p50={results['full_clear']['p50_ms']:.2f}ms  max={results['full_clear']['max_ms']:.2f}ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from equation_generator import EquationSet, EQUATION_REGISTRY
+from equation_generator.compilers import StubLatexCompiler
+from equation_generator.generation import generate_record
+from equation_generator.latex_render import clear_latex_cache, latex_cache_stats
+
+# Метрики, для яких менше значення краще; для решти (eq_per_sec) краще більше.
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms', 'tracemalloc_peak_kb', 'mean_ms')
+HIGHER_IS_BETTER = ('eq_per_sec',)
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def peak_rss_kb():
+    # ru_maxrss -- пік усього процесу від старту, а не окремого типу.
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024
+    return peak
+
+
+def run_generator(type_key, seed):
+    # Той самий шлях, що й у EquationSet: генерація, перевірка відповіді (якщо увімкнена) і EquationRecord.
+    return generate_record((type_key, seed))
+
+
+def bench_type(type_key, seeds):
+    klass = EQUATION_REGISTRY[type_key]
+    latencies = []
+    failures = []
+
+    clear_latex_cache()
+    start = time.perf_counter()
+    for seed in seeds:
+        t0 = time.perf_counter()
+        try:
+            run_generator(type_key, seed)
+        except Exception as e:
+            failures.append({'seed': seed, 'error': repr(e)})
+            continue
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    latex_stats = latex_cache_stats()
+
+    tracemalloc.start()
+    for seed in seeds:
+        try:
+            run_generator(type_key, seed)
+        except Exception:
+            pass
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = [v * 1000 for v in latencies]
+    return {
+        'name': klass.__name__,
+        'count': len(latencies),
+        'eq_per_sec': len(latencies) / total if total > 0 else None,
+        'mean_ms': sum(ms) / len(ms) if ms else None,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'tracemalloc_peak_kb': traced_peak / 1024,
+        # Накопичений пік процесу після цього типу (включно з усіма попередніми типами).
+        'cumulative_peak_rss_kb': peak_rss_kb(),
+        'latex_cache': latex_stats,
+        'failures': failures,
+    }
+
+
+def bench_pdf(type_keys, per_type, repeats, seed, compile_latency=0.0):
+    eq_set = EquationSet(seed=seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for type_key in type_keys:
+            eq_set.add_equations(type_key, per_type)
+
+    timings = []
+    compiler = StubLatexCompiler(latency=compile_latency)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(repeats):
+            target = os.path.join(tmp_dir, f'bench_{i}.pdf')
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                eq_set.generate_pdf(target, compiler=compiler)
+            timings.append((time.perf_counter() - t0) * 1000)
+            if not os.path.exists(target):
+                raise RuntimeError(f"Заглушка компілятора не створила '{target}'")
+
+    if compiler.compiled != repeats:
+        raise RuntimeError("Не всі документи пройшли через заглушку компілятора.")
+
+    return {
+        'equations': len(eq_set.equations),
+        'repeats': repeats,
+        'compile_latency_ms': compile_latency * 1000,
+        'mean_ms': sum(timings) / len(timings),
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+    }
+
+
+def run_suite(type_keys, seeds, pdf_per_type, pdf_repeats, compile_latency=0.0):
+    import sympy
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sympy': sympy.__version__,
+            'platform': platform.platform(),
+            'seeds': [seeds[0], seeds[-1] + 1] if seeds else [],
+        },
+        'types': {},
+    }
+
+    for type_key in type_keys:
+        stats = bench_type(type_key, seeds)
+        results['types'][type_key] = stats
+        if stats['p50_ms'] is None:
+            print(f"[{type_key:>2}] {stats['name']:<32} усі {len(stats['failures'])} seed завершились помилкою")
+            continue
+        print(f"[{type_key:>2}] {stats['name']:<32} {stats['eq_per_sec']:8.1f} eq/s  "
+              f"p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms  "
+              f"tracemalloc={stats['tracemalloc_peak_kb']:.0f}KB  latex_hits={stats['latex_cache']['hit_rate']:.0%}  "
+              f"failures={len(stats['failures'])}")
+
+    if pdf_repeats > 0:
+        results['pdf'] = bench_pdf(type_keys, pdf_per_type, pdf_repeats, seeds[0] if seeds else 0,
+                                   compile_latency)
+        print(f"[pdf] {results['pdf']['equations']} equations: "
+              f"mean={results['pdf']['mean_ms']:.1f}ms p95={results['pdf']['p95_ms']:.1f}ms")
+
+    results['peak_rss_kb'] = peak_rss_kb()
+    return results
+
+
+def compare(baseline, current, threshold):
+    regressions = []
+
+    def check(scope, old, new):
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old_value, new_value = old.get(metric), new.get(metric)
+            if not old_value or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append({
+                    'scope': scope, 'metric': metric,
+                    'baseline': old_value, 'current': new_value, 'change': change,
+                })
+
+    for type_key, new_stats in current.get('types', {}).items():
+        old_stats = baseline.get('types', {}).get(type_key)
+        if old_stats is not None:
+            check(f"type {type_key} ({new_stats['name']})", old_stats, new_stats)
+
+    if ('pdf' in baseline and 'pdf' in current
+            and baseline['pdf']['equations'] == current['pdf']['equations']
+            and baseline['pdf'].get('compile_latency_ms') == current['pdf'].get('compile_latency_ms')):
+        check('generate_pdf', baseline['pdf'], current['pdf'])
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк генерації рівнянь та збирання PDF.")
+    parser.add_argument('--types', nargs='*', default=None, help="ключі EQUATION_REGISTRY (за замовчуванням усі)")
+    parser.add_argument('--seeds', type=int, default=20, help="кількість фіксованих seed на тип")
+    parser.add_argument('--seed-start', type=int, default=0)
+    parser.add_argument('--pdf-per-type', type=int, default=1)
+    parser.add_argument('--pdf-repeats', type=int, default=3)
+    parser.add_argument('--compile-latency', type=float, default=0.0,
+                        help="імітована затримка заглушки компілятора, с")
+    parser.add_argument('--output', default=os.path.join(tempfile.gettempdir(), 'bench_results.json'),
+                        help="куди записати результати (JSON), за замовчуванням у тимчасовий каталог")
+    parser.add_argument('--compare', default=None, help="базовий JSON для порівняння")
+    parser.add_argument('--threshold', type=float, default=0.2, help="допустиме погіршення (частка, 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    type_keys = args.types or list(EQUATION_REGISTRY)
+    for type_key in type_keys:
+        if type_key not in EQUATION_REGISTRY:
+            parser.error(f"Тип рівняння '{type_key}' не знайдено у EQUATION_REGISTRY.")
+
+    seeds = list(range(args.seed_start, args.seed_start + args.seeds))
+    results = run_suite(type_keys, seeds, args.pdf_per_type, args.pdf_repeats, args.compile_latency)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Результати записано у '{args.output}'.")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['scope']}: {r['metric']} {r['baseline']:.3f} -> {r['current']:.3f} "
+                  f"({r['change'] * 100:+.1f}%)")
+        if regressions:
+            return 1
+        print(f"Регресій понад {args.threshold * 100:.0f}% не виявлено.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_generation import percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE_SOURCE = '''import json, sys, time
+t0 = time.perf_counter()
+import equation_generator
+t1 = time.perf_counter()
+after_import = {'sympy': 'sympy' in sys.modules, 'pylatex': 'pylatex' in sys.modules}
+klass = equation_generator.EQUATION_REGISTRY[%(type_key)r]
+t2 = time.perf_counter()
+import random
+random.seed(0)
+klass()
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'first_lookup_ms': (t2 - t1) * 1000,
+    'first_equation_ms': (t3 - t2) * 1000,
+    'loaded_after_import': after_import,
+    'pylatex_after_generation': 'pylatex' in sys.modules,
+}))
+'''
+
+# Лінивий доступ до класів через атрибути пакета, поки жоден генератор ще не імпортовано.
+LAZY_PROBE_SOURCE = '''import json
+import equation_generator
+klass = equation_generator.%(class_name)s
+from equation_generator import %(class_name)s
+print(json.dumps({'ok': klass is %(class_name)s is equation_generator.EQUATION_REGISTRY[%(type_key)r]}))
+'''
+
+METRICS = ('import_ms', 'first_lookup_ms', 'first_equation_ms')
+
+
+def probe(type_key):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE_SOURCE % {'type_key': type_key}],
+        cwd=PROJECT_ROOT, env=env,
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def probe_lazy_attribute(type_key):
+    from equation_generator.registry import EQUATION_PATHS
+
+    class_name = EQUATION_PATHS[type_key][1]
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-c', LAZY_PROBE_SOURCE % {'type_key': type_key, 'class_name': class_name}],
+        cwd=PROJECT_ROOT, env=env, capture_output=True,
+    )
+    if result.returncode != 0:
+        return {'ok': False, 'error': result.stderr.decode().strip().splitlines()[-1]}
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def run(type_key, repeats):
+    samples = [probe(type_key) for _ in range(repeats)]
+    results = {'type_key': type_key, 'repeats': repeats}
+    for metric in METRICS:
+        values = [s[metric] for s in samples]
+        results[metric] = {'p50': percentile(values, 50), 'min': min(values), 'max': max(values)}
+    results['loaded_after_import'] = samples[-1]['loaded_after_import']
+    results['pylatex_after_generation'] = samples[-1]['pylatex_after_generation']
+    results['lazy_attribute'] = probe_lazy_attribute(type_key)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного старту: імпорт пакета та перший генератор.")
+    parser.add_argument('--type', dest='type_key', default='1')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.type_key, args.repeats)
+
+    for metric in METRICS:
+        stats = results[metric]
+        print(f"{metric:<20} p50={stats['p50']:8.1f}ms  min={stats['min']:8.1f}ms  max={stats['max']:8.1f}ms")
+    loaded = results['loaded_after_import']
+    print(f"після 'import equation_generator': sympy={loaded['sympy']} pylatex={loaded['pylatex']}; "
+          f"pylatex після генерації: {results['pylatex_after_generation']}")
+    lazy = results['lazy_attribute']
+    print(f"лінивий доступ до класу через equation_generator: {'OK' if lazy['ok'] else 'ПОМИЛКА'}"
+          + (f" ({lazy['error']})" if 'error' in lazy else ""))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if not lazy['ok']:
+        return 1
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = 0
+        for metric in METRICS:
+            old, new = baseline[metric]['p50'], results[metric]['p50']
+            if old and (new - old) / old > args.threshold:
+                regressions += 1
+                print(f"REGRESSION {metric}: {old:.1f}ms -> {new:.1f}ms ({(new - old) / old * 100:+.1f}%)")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
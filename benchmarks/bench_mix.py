@@ -0,0 +1,124 @@
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import time
+
+from equation_generator import EQUATION_REGISTRY, EquationSet
+from equation_generator.generation import generate_record_safe
+from equation_generator.scheduling import CostModel, plan_chunks
+from equation_generator.worker_pool import WorkerPool, warm_up
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        type_key, count = item.split(':')
+        mix[type_key.strip()] = int(count)
+    return mix
+
+
+def measure(tasks):
+    # Фактичний час кожної задачі на одному ядрі (після прогріву).
+    times = []
+    for task in tasks:
+        t0 = time.perf_counter()
+        generate_record_safe(task)
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def makespan(chunks, times, processes):
+    # Пакети роздаються вільним воркерам у заданому порядку, як у Pool.imap_unordered.
+    workers = [0.0] * processes
+    heapq.heapify(workers)
+    for chunk in chunks:
+        start = heapq.heappop(workers)
+        heapq.heappush(workers, start + sum(times[i] for i in chunk))
+    finish = max(workers)
+    busy = sum(times)
+    return {'makespan_ms': finish, 'idle_fraction': 1 - busy / (finish * processes) if finish else 0.0}
+
+
+def naive_chunks(count, processes):
+    # Pool.map без chunksize: порядок blueprint, розмір пакета ceil(n / (4 * processes)).
+    chunksize = max(1, math.ceil(count / (4 * processes)))
+    return [list(range(i, min(i + chunksize, count))) for i in range(0, count, chunksize)]
+
+
+def scheduled_chunks(tasks, processes, cost_model):
+    indexed = [(i, type_key, seed) for i, (type_key, seed) in enumerate(tasks)]
+    return [[index for index, _, _ in chunk] for chunk in plan_chunks(indexed, cost_model, processes)]
+
+
+def simulate(tasks, times, process_counts):
+    results = {}
+    lower_bound = max(times)
+    for processes in process_counts:
+        bound = max(lower_bound, sum(times) / processes)
+        results[processes] = {
+            'lower_bound_ms': bound,
+            'naive': makespan(naive_chunks(len(tasks), processes), times, processes),
+            'scheduled': makespan(scheduled_chunks(tasks, processes, CostModel()), times, processes),
+        }
+    return results
+
+
+def run_real(mix, processes, seed):
+    # Реальний прогін у пулі: наївний Pool.map проти EquationSet.add_mix (той самий прогрітий пул).
+    rng = random.Random(seed)
+    tasks = [(type_key, rng.getrandbits(32)) for type_key, count in mix.items() for _ in range(count)]
+    with WorkerPool(processes) as pool:
+        pool.map(generate_record_safe, [(type_key, 0) for type_key in mix] * processes)
+        t0 = time.perf_counter()
+        pool.map(generate_record_safe, tasks)
+        naive_s = time.perf_counter() - t0
+
+        eq_set = EquationSet(seed=seed, pool=pool)
+        t0 = time.perf_counter()
+        eq_set.add_mix(mix)
+        scheduled_s = time.perf_counter() - t0
+    return {'naive_s': naive_s, 'scheduled_s': scheduled_s}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Змішані пакети: наївний Pool.map проти планувальника add_mix "
+                                                 "(найдовші задачі першими, пакети за оцінкою вартості).")
+    parser.add_argument('--mix', default=None, help="тип:кількість через кому (за замовчуванням 10 кожного типу)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--simulate', default='2,4,8', help="кількості воркерів для симуляції за виміряними часами")
+    parser.add_argument('--processes', type=int, default=0, help="також прогнати реальний пул з цією кількістю")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix) if args.mix else {type_key: 10 for type_key in EQUATION_REGISTRY}
+    rng = random.Random(args.seed)
+    tasks = [(type_key, rng.getrandbits(32)) for type_key, count in mix.items() for _ in range(count)]
+
+    warm_up(list(mix))
+    times = measure(tasks)
+    report = {'mix': mix, 'tasks': len(tasks), 'total_ms': sum(times),
+              'simulated': simulate(tasks, times, [int(p) for p in args.simulate.split(',') if p])}
+
+    print(f"{len(tasks)} задач, сумарно {sum(times):.0f} мс на одному ядрі")
+    for processes, stats in report['simulated'].items():
+        naive, scheduled = stats['naive'], stats['scheduled']
+        print(f"  {processes} воркери: нижня межа {stats['lower_bound_ms']:.0f} мс | "
+              f"наївно {naive['makespan_ms']:.0f} мс (простій {naive['idle_fraction']:.1%}) | "
+              f"планувальник {scheduled['makespan_ms']:.0f} мс (простій {scheduled['idle_fraction']:.1%})")
+
+    if args.processes > 1:
+        report['real'] = run_real(mix, args.processes, args.seed)
+        print(f"  реальний пул, {args.processes} процеси: наївно {report['real']['naive_s']:.2f} с, "
+              f"add_mix {report['real']['scheduled_s']:.2f} с")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+
+from equation_generator import EQUATION_REGISTRY
+from equation_generator.cache_control import current_rss_bytes
+from equation_generator.generation import generate_equation
+from equation_generator.verification import check_solution
+from equation_generator.worker_pool import WorkerPool, warm_up
+
+# Скільки сідів зберігати на одну групу помилок у звіті.
+SEEDS_PER_GROUP = 20
+
+
+class CaseTimeout(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    # Зависання генератора (нескінченний while True) -- теж знахідка; на платформах без SIGALRM ліміту немає.
+    if not seconds or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise CaseTimeout(f"перевищено ліміт {seconds} с")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _location(exc):
+    # Останній кадр стеку в коді пакета: за ним групуємо однакові помилки.
+    frames = [f for f in traceback.extract_tb(exc.__traceback__) if 'equation_generator' in f.filename]
+    if not frames:
+        return None
+    frame = frames[-1]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} ({frame.name})"
+
+
+def fuzz_case(task):
+    type_key, seed, timeout, verify = task
+    result = {'type': type_key, 'seed': seed, 'status': 'ok'}
+
+    t0 = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            equation = generate_equation(type_key, seed)
+            result['ms'] = (time.perf_counter() - t0) * 1000
+            problem = check_solution(equation, seed) if verify else None
+    except Exception as e:
+        result['ms'] = (time.perf_counter() - t0) * 1000
+        result['status'] = 'timeout' if isinstance(e, CaseTimeout) else 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['where'] = _location(e)
+        return result
+
+    if problem is not None:
+        result['status'] = 'verify'
+        result['error'] = problem
+    rss = current_rss_bytes()
+    result['rss_mb'] = rss / (1024 * 1024) if rss else None
+    return result
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _group_key(case):
+    if case['status'] == 'timeout':
+        return 'timeout'
+    if case['status'] == 'verify':
+        # Повідомлення містить конкретний x; групуємо за видом проблеми.
+        return 'verify: ' + case['error'].split(' ', 3)[-1].split(' (')[0]
+    return f"{case['status']}: {case['error'].splitlines()[0][:160]} @ {case.get('where')}"
+
+
+def summarize(type_key, cases, outlier_factor):
+    times = [c['ms'] for c in cases if c['status'] == 'ok' or c['status'] == 'verify']
+    median = percentile(times, 50)
+    counts = {}
+    groups = {}
+    for case in cases:
+        counts[case['status']] = counts.get(case['status'], 0) + 1
+        if case['status'] != 'ok':
+            group = groups.setdefault(_group_key(case), {'count': 0, 'seeds': [], 'example': case['error']})
+            group['count'] += 1
+            if len(group['seeds']) < SEEDS_PER_GROUP:
+                group['seeds'].append(case['seed'])
+
+    outliers = []
+    if median:
+        slow = [c for c in cases if c['status'] != 'timeout' and c['ms'] > outlier_factor * median]
+        outliers = [{'seed': c['seed'], 'ms': round(c['ms'], 1)}
+                    for c in sorted(slow, key=lambda c: -c['ms'])[:SEEDS_PER_GROUP]]
+
+    rss = [c['rss_mb'] for c in cases if c.get('rss_mb')]
+    return {
+        'name': EQUATION_REGISTRY[type_key].__name__,
+        'cases': len(cases),
+        'counts': counts,
+        'failure_rate': 1 - counts.get('ok', 0) / len(cases) if cases else 0.0,
+        'p50_ms': median,
+        'p99_ms': percentile(times, 99),
+        'max_ms': max(times) if times else None,
+        'outliers': outliers,
+        'peak_rss_mb': max(rss) if rss else None,
+        'failures': sorted(({'group': key, **value} for key, value in groups.items()), key=lambda g: -g['count']),
+    }
+
+
+def run(type_keys, seeds, processes, timeout, verify, chunksize=8):
+    tasks = [(type_key, seed, timeout, verify) for type_key in type_keys for seed in seeds]
+    cases = {type_key: [] for type_key in type_keys}
+
+    if processes > 1:
+        # Прогрів пулу наповнює кеші SymPy, інакше перші сіди кожного воркера виглядали б повільними.
+        with WorkerPool(processes) as pool:
+            for done, case in enumerate(pool.imap_unordered(fuzz_case, tasks, chunksize), 1):
+                cases[case['type']].append(case)
+                if done % 500 == 0:
+                    print(f"  {done}/{len(tasks)}", file=sys.stderr)
+    else:
+        warm_up(type_keys)
+        for task in tasks:
+            case = fuzz_case(task)
+            cases[case['type']].append(case)
+    return cases
+
+
+def _ms(value):
+    return f"{value:.1f}ms" if value is not None else "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Фаз-тестування генераторів: винятки, зависання, повільні сіди "
+                                                 "та відповіді, що не пройшли числову перевірку.")
+    parser.add_argument('--types', default=None, help="ключі EQUATION_REGISTRY через кому (за замовчуванням усі)")
+    parser.add_argument('--seeds', type=int, default=2000, help="кількість сідів на тип")
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--timeout', type=float, default=30.0, help="ліміт на одне рівняння, с (0 -- без ліміту)")
+    parser.add_argument('--outlier-factor', type=float, default=10.0,
+                        help="повільний сід -- у скільки разів довше за медіану свого типу")
+    parser.add_argument('--no-verify', action='store_true', help="не перевіряти відповіді чисельно")
+    parser.add_argument('--output', default=None, help="куди записати звіт (JSON)")
+    args = parser.parse_args(argv)
+
+    type_keys = [t.strip() for t in args.types.split(',') if t.strip()] if args.types else list(EQUATION_REGISTRY)
+    unknown = [t for t in type_keys if t not in EQUATION_REGISTRY]
+    if unknown:
+        parser.error(f"невідомі типи: {', '.join(unknown)}")
+
+    seeds = range(args.start, args.start + args.seeds)
+    start = time.perf_counter()
+    cases = run(type_keys, seeds, args.processes, args.timeout, not args.no_verify)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'meta': {
+            'seeds': [args.start, args.start + args.seeds],
+            'processes': args.processes,
+            'verify': not args.no_verify,
+            'elapsed_s': elapsed,
+        },
+        'types': {type_key: summarize(type_key, cases[type_key], args.outlier_factor) for type_key in type_keys},
+    }
+
+    failed = False
+    for type_key, stats in report['types'].items():
+        counts = ", ".join(f"{k}={v}" for k, v in sorted(stats['counts'].items()))
+        print(f"[{type_key:>2}] {stats['name']:<32} {counts:<40} fail={stats['failure_rate']:.1%}  "
+              f"p50={_ms(stats['p50_ms'])} p99={_ms(stats['p99_ms'])} max={_ms(stats['max_ms'])}  "
+              f"outliers={len(stats['outliers'])}")
+        for group in stats['failures']:
+            failed = True
+            seeds_list = ", ".join(str(s) for s in group['seeds'])
+            print(f"      {group['count']:>5} x {group['group']}\n            сіди: {seeds_list}")
+    print(f"Відтворення: equation_generator.generation.generate_equation(тип, сід). Усього {elapsed:.1f} с")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from equation_generator import EQUATION_REGISTRY
+
+
+def _value_repr(value):
+    return getattr(value, '__name__', None) or str(value)
+
+
+def report_space(space, samples, seed):
+    t0 = time.perf_counter()
+    space.invalidate()
+    space.compiled
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    drawn = [space.sample(rng) for _ in range(samples)]
+    sample_us = (time.perf_counter() - t0) * 1e6 / samples if samples else None
+
+    coverage = space.coverage(drawn)
+    return {
+        'space': space.name,
+        'size': space.size,
+        'raw_size': space.raw_size,
+        'acceptance': float(space.acceptance),
+        'compile_ms': compile_ms,
+        'sample_us': sample_us,
+        'covered': coverage['covered'],
+        'coverage': coverage['coverage'],
+        'expected_covered': coverage['expected_covered'],
+        'max_marginal_deviation': coverage['max_marginal_deviation'],
+    }
+
+
+def dump_space(space):
+    for point, probability in space.points():
+        values = ", ".join(f"{name}={_value_repr(value)}" for name, value in point.items())
+        print(f"{probability}\t{values}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Простори параметрів генераторів: розмір, частка прийнятих точок, "
+                                                 "швидкість вибірки та покриття.")
+    parser.add_argument('--types', default=None, help="ключі EQUATION_REGISTRY через кому (за замовчуванням усі)")
+    parser.add_argument('--samples', type=int, default=10000, help="кількість вибірок для звіту про покриття")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--enumerate', dest='space_name', default=None,
+                        help="вивести всі точки простору з цим ім'ям та їхні ймовірності")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+
+    type_keys = [t.strip() for t in args.types.split(',') if t.strip()] if args.types else list(EQUATION_REGISTRY)
+    spaces = {type_key: EQUATION_REGISTRY[type_key].parameter_spaces() for type_key in type_keys}
+
+    if args.space_name:
+        for space in (s for type_spaces in spaces.values() for s in type_spaces):
+            if space.name == args.space_name:
+                dump_space(space)
+                return 0
+        print(f"Простір '{args.space_name}' не знайдено.", file=sys.stderr)
+        return 1
+
+    report = {}
+    for type_key, type_spaces in spaces.items():
+        if not type_spaces:
+            print(f"[{type_key:>2}] {EQUATION_REGISTRY[type_key].__name__}: простір параметрів не описано")
+            continue
+        report[type_key] = [report_space(space, args.samples, args.seed) for space in type_spaces]
+        for stats in report[type_key]:
+            deviation = max(stats['max_marginal_deviation'].values())
+            print(f"[{type_key:>2}] {stats['space']:<34} size={stats['size']:<6} raw={stats['raw_size']:<6} "
+                  f"accept={stats['acceptance']:.1%}  compile={stats['compile_ms']:.1f}ms "
+                  f"sample={stats['sample_us']:.2f}us  covered={stats['covered']}/{stats['size']} "
+                  f"(очікувано {stats['expected_covered']:.0f})  max_dev={deviation:.4f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
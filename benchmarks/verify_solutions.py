@@ -0,0 +1,76 @@
+import argparse
+import json
+import sys
+
+import sympy
+from sympy import solveset, Reals
+
+from equation_generator.generation import generate_equation
+from equation_generator.solution_sets import series_bases
+
+
+def residual(equation, value):
+    expr = equation.equation_obj.lhs - equation.equation_obj.rhs
+    return abs(complex(sympy.N(expr.subs(equation.x, value), 30)))
+
+
+def verify(type_key, seed, tolerance=1e-8):
+    # Порівнюємо побудовану відповідь із solveset за початками серій на [0, 2pi).
+    equation = generate_equation(type_key, seed)
+    reference = solveset(equation.equation_obj, equation.x, domain=Reals)
+
+    ours = series_bases(equation.solution_obj)
+    theirs = series_bases(reference)
+    if ours is None or theirs is None:
+        return {'seed': seed, 'status': 'unsupported'}
+    if ours == theirs:
+        return {'seed': seed, 'status': 'match'}
+
+    # Розбіжність: вирішуємо підстановкою, чия відповідь хибна.
+    extra = [v for v in ours if v not in theirs]
+    missing = [v for v in theirs if v not in ours]
+    generator_wrong = any(residual(equation, v) > tolerance for v in extra) or \
+        any(residual(equation, v) <= tolerance for v in missing)
+    return {
+        'seed': seed,
+        'status': 'generator_wrong' if generator_wrong else 'solveset_wrong',
+        'equation': equation.get_equation_latex(),
+        'extra': extra,
+        'missing': missing,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перевірка побудованих відповідей проти solveset на вибірці сідів.")
+    parser.add_argument('--types', default='8')
+    parser.add_argument('--seeds', type=int, default=200)
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+
+    type_keys = [t.strip() for t in args.types.split(',') if t.strip()]
+
+    results = {}
+    failed = False
+    for type_key in type_keys:
+        checks = [verify(type_key, seed) for seed in range(args.start, args.start + args.seeds)]
+        counts = {}
+        for check in checks:
+            counts[check['status']] = counts.get(check['status'], 0) + 1
+        results[type_key] = {
+            'counts': counts,
+            'mismatches': [c for c in checks if c['status'] in ('generator_wrong', 'solveset_wrong')],
+        }
+        failed = failed or counts.get('generator_wrong', 0) > 0
+        summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+        print(f"тип {type_key:>3}: {summary}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,24 +1,18 @@
-from .equations import *
-from .equation_container import EquationSet
+import importlib
 
-EQUATION_REGISTRY = {
-    "1": SimplestEquation,
-    "2": HomogeneousEquation,
-    "3": SumToProductEquation,
-    "4": GroupingEquation,
-    "5": PowerReductionEquation,
-    "6": QuadraticTrigEquation,
-    "7": DoubleAngleToQuadraticEquation,
-    "8": LinearCombinationEquation,
-    "9": ReducibleToHomogeneousEquation,
-    "10": SymmetricEquation,
-    "11": TanSubstitutionEquation,
-    "12": SumTanCotanEquation,
-    "13": BoundedSumEquation,
-    "14": InverseTrigEquation,
-}
+from .registry import EQUATION_REGISTRY
+from .equation_container import EquationSet
 
 __all__ = [
     'EquationSet',
     'EQUATION_REGISTRY',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # Класи рівнянь імпортуються лише під час першого звернення. Саме import_module: `from . import equations`
+    # спершу шукає атрибут 'equations' тут же, тобто знову викликає __getattr__, доки підпакет не імпортовано.
+    equations = importlib.import_module('.equations', __name__)
+    if name in equations.__all__:
+        return getattr(equations, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
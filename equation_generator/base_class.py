@@ -1,85 +1,44 @@
 import abc
-import sympy
-from pylatex import Document, Section, Math, Package
-from pylatex.utils import NoEscape
-import subprocess
 import os
-import shutil
-
-
-class FixedDocument(Document):
-
-    def generate_tex(self, file_name):
-        tex_file = file_name + '.tex'
-        with open(tex_file, 'w', encoding='utf-8') as f:
-            f.write(self.dumps())
-
-    def compile(self, file_name, clean_tex=True, clean=True,
-                compiler=None, compiler_args=None, silent=True):
-
-        tex_file = file_name + '.tex'
-        pdf_file = file_name + '.pdf'
-        log_file = file_name + '.log'
-        aux_file = file_name + '.aux'
 
-        if compiler is None:
-            if shutil.which("latexmk") is not None:
-                compiler = "latexmk"
-            elif shutil.which("pdflatex") is not None:
-                compiler = "pdflatex"
-            else:
-                raise (Exception("No LaTex compiler was found"))
-
-        if compiler_args is None:
-            compiler_args = []
-
-        if compiler == 'latexmk':
-            compiler_args = ['-pdf'] + compiler_args
-
-        args = [compiler] + compiler_args + [tex_file]
-
-        try:
-            FNULL = open(os.devnull, 'w')
-            stdout = FNULL if silent else None
-
-            p = subprocess.run(args, stdout=stdout, stderr=subprocess.STDOUT,
-                               cwd=self.temp_dir)
-        finally:
-            FNULL.close()
-
-        with open(log_file, 'r', encoding='latin-1') as f:
-            log = f.read()
-
-        if p.returncode != 0:
-            raise (Exception(
-                'This is pdfTeX, Version 3.14159265-2.6-1.40.18 '
-                '(TeX Live 2017)\n' + log
-            ))
-
-        if clean_tex:
-            os.remove(tex_file)
+import sympy
 
-        if clean:
-            for ext in [aux_file, log_file, '.out', '.fls',
-                        '.fdb_latexmk']:
-                try:
-                    os.remove(file_name + ext)
-                except FileNotFoundError:
-                    pass
+from .latex_render import latex
+from .polynomials import quadratic_roots, poly_expr
+from .trig_tables import X, T
 
 
 class TrigonometricEquation(abc.ABC):
+    x = X
+    # Символьна перевірка множників, побудованих без simplify (повільно, лише для налагодження).
+    debug_checks = os.environ.get('EQUAGEN_DEBUG_CHECKS', '') not in ('', '0')
+    # Кроки лише читають розв'язки, знайдені в _solve: у цьому режимі будь-який розв'язувач у кроках -- помилка.
+    strict_steps = os.environ.get('EQUAGEN_STRICT_STEPS', '') not in ('', '0')
+    # Декларативний простір параметрів (param_space.ParameterSpace), з якого _generate бере одну точку.
+    parameters = None
 
     def __init__(self):
-        self.x = sympy.symbols('x')
         self.equation_obj = None
         self.solution_obj = None
         self.variables = {}
         self.steps = []
+        self._sub_solutions = {}
+        self._building_steps = False
 
         self._generate()
         self._solve()
-        self._build_solution_steps()
+        self._building_steps = True
+        try:
+            self._build_solution_steps()
+        finally:
+            self._building_steps = False
+
+    @classmethod
+    def parameter_spaces(cls):
+        # Усі простори генератора, зокрема вкладені, -- для звітів про покриття.
+        if cls.parameters is None:
+            return []
+        return [cls.parameters, *cls.parameters.nested_spaces()]
 
     @abc.abstractmethod
     def _generate(self):
@@ -93,12 +52,52 @@ class TrigonometricEquation(abc.ABC):
     def _build_solution_steps(self):
         pass
 
+    def _debug_check(self, actual, expected, what):
+        # Через exp тотожності добутку/суми тригонометричних функцій зводяться до розкриття дужок.
+        if self.debug_checks and sympy.expand((actual - expected).rewrite(sympy.exp)) != 0:
+            raise ValueError(f"Перевірка '{what}' не пройдена для {type(self).__name__}: {actual} != {expected}")
+
+    def _debug_check_equal(self, actual, expected, what):
+        if self.debug_checks and actual != expected:
+            raise ValueError(f"Перевірка '{what}' не пройдена для {type(self).__name__}: {actual} != {expected}")
+
+    def _memo(self, key, compute):
+        # Підрозв'язки екземпляра: _solve заповнює, _build_solution_steps читає.
+        if key not in self._sub_solutions:
+            if self._building_steps and self.strict_steps:
+                raise AssertionError(f"Розв'язувач викликано під час побудови кроків {type(self).__name__}: {key}")
+            self._sub_solutions[key] = compute()
+        return self._sub_solutions[key]
+
+    def _solveset(self, equation, var=None, domain=sympy.S.Reals):
+        var = self.x if var is None else var
+        return self._memo(('solveset', equation, var, domain), lambda: sympy.solveset(equation, var, domain=domain))
+
+    def _solve_quadratic(self, a, b, c, var=T, known_roots=None):
+        def compute():
+            roots = quadratic_roots(a, b, c, var, known_roots)
+            if self.debug_checks:
+                for root in roots:
+                    # Корені алгебраїчні (можливо комплексні): досить розкрити дужки, без rewrite(exp).
+                    self._debug_check_equal(sympy.expand(poly_expr([a, b, c], var).subs(var, root)), 0,
+                                            "корінь квадратного рівняння")
+            return roots
+
+        return self._memo(('quadratic', a, b, c, var), compute)
+
     def get_equation_latex(self) -> str:
         if self.equation_obj is not None:
-            return sympy.latex(self.equation_obj)
+            return latex(self.equation_obj)
         return "Рівняння не згенеровано."
 
     def get_solution_latex(self) -> str:
         if self.solution_obj is not None:
-            return sympy.latex(self.solution_obj)
-        return "Розв'язок не знайдено."
\ No newline at end of file
+            return latex(self.solution_obj)
+        return "Розв'язок не знайдено."
+
+def __getattr__(name):
+    # FixedDocument живе в document.py, щоб pylatex завантажувався лише для PDF.
+    if name == 'FixedDocument':
+        from .document import FixedDocument
+        return FixedDocument
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
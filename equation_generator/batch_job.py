@@ -0,0 +1,219 @@
+import json
+import os
+import random
+
+from .equation_container import DEFAULT_MAX_FAILURES, EquationSet
+from .equation_record import EquationRecord
+from .errors import FailureBudgetExceeded
+from .generation import get_equation_class
+from .scheduling import CostModel
+
+JOURNAL_NAME = 'journal.jsonl'
+CHECKPOINT_NAME = 'checkpoint.json'
+CHECKPOINT_VERSION = 1
+DEFAULT_BLOCK_SIZE = 500
+
+
+def _type_rng(seed, type_key):
+    # Окремий потік сідів для кожного типу: результат типу не залежить від інших типів і від меж блоків.
+    return random.Random(f"{seed}:{type_key}")
+
+
+def _known_types(blueprint):
+    known = {}
+    for type_key, count in blueprint.items():
+        if get_equation_class(type_key) is None:
+            print(f"Попередження: Тип рівняння '{type_key}' не знайдено у EQUATION_REGISTRY.")
+            continue
+        known[type_key] = count
+    return known
+
+
+def _load_state(state):
+    # JSON перетворює кортежі стану Mersenne Twister на списки.
+    version, internal, gauss_next = state
+    return version, tuple(internal), gauss_next
+
+
+def _fsync_directory(directory):
+    # Без цього перейменування (і новий файл журналу) може не пережити втрату живлення, лише падіння процесу.
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+class BatchJob:
+    # Велике завдання генерації з журналом на диску: готові рівняння дописуються блоками в journal.jsonl,
+    # після кожного блоку checkpoint.json атомарно фіксує стан потоків сідів, лічильники та довжину журналу.
+    # Після збою run() продовжує з останньої контрольної точки, а журнал збігається з журналом
+    # безперервного прогону того самого завдання.
+
+    def __init__(self, directory, blueprint=None, seed=None, block_size=None,
+                 max_failures=DEFAULT_MAX_FAILURES, processes=None, pool=None, cache_manager=None, cost_model=None):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_NAME)
+        # Бюджет невдач (як у EquationSet) діє на все завдання, а не на блок.
+        self.equation_set = EquationSet(processes=processes, pool=pool, cache_manager=cache_manager,
+                                        max_failures=max_failures, cost_model=cost_model)
+
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            self._restore(checkpoint, blueprint, seed, block_size, cost_model)
+        else:
+            if blueprint is None:
+                raise ValueError(f"У '{directory}' немає контрольної точки, тож потрібен blueprint нового завдання.")
+            self._start(blueprint, seed, block_size or DEFAULT_BLOCK_SIZE)
+
+    def _start(self, blueprint, seed, block_size):
+        self.blueprint = _known_types(blueprint)
+        # Без seed завдання все одно має бути відтворюваним після відновлення, тож фіксуємо випадковий.
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self.block_size = block_size
+        self.blocks = 0
+        self.journal_bytes = 0
+        self.progress = {type_key: {'type_key': type_key, 'requested': count, 'generated': 0, 'failures': 0,
+                                    'errors': {}}
+                         for type_key, count in self.blueprint.items()}
+        self._rngs = {type_key: _type_rng(self.seed, type_key) for type_key in self.blueprint}
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Журнал без контрольної точки лишився від збою до першого блоку.
+        with open(self.journal_path, 'wb'):
+            pass
+        self._write_checkpoint()
+
+    def _restore(self, checkpoint, blueprint, seed, block_size, cost_model):
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Непідтримувана версія контрольної точки: {checkpoint.get('version')}.")
+        job = checkpoint['job']
+        # Параметри, передані повторно, мусять збігатися з записаними: інакше журнал не продовжить той самий прогін.
+        if blueprint is not None and _known_types(blueprint) != job['blueprint']:
+            raise ValueError(f"Завдання в '{self.directory}' має інший blueprint: {job['blueprint']}.")
+        if seed is not None and seed != job['seed']:
+            raise ValueError(f"Завдання в '{self.directory}' має інший seed: {job['seed']}.")
+        if block_size is not None and block_size != job['block_size']:
+            raise ValueError(f"Завдання в '{self.directory}' має інший block_size: {job['block_size']}.")
+
+        self.blueprint = job['blueprint']
+        self.seed = job['seed']
+        self.block_size = job['block_size']
+        self.blocks = checkpoint['blocks']
+        self.journal_bytes = checkpoint['journal_bytes']
+        self.progress = checkpoint['progress']
+        self._rngs = {}
+        for type_key, state in checkpoint['rng_states'].items():
+            rng = random.Random()
+            rng.setstate(_load_state(state))
+            self._rngs[type_key] = rng
+        if cost_model is None and checkpoint.get('cost_model') is not None:
+            self.equation_set.cost_model = CostModel.from_dict(checkpoint['cost_model'])
+
+        # Усе, що дописано після контрольної точки (зокрема обірваний рядок), відкидаємо: ці сіди згенеруються знову.
+        with open(self.journal_path, 'ab') as f:
+            f.truncate(self.journal_bytes)
+
+    def _write_checkpoint(self):
+        _write_atomic(self.checkpoint_path, {
+            'version': CHECKPOINT_VERSION,
+            'job': {'blueprint': self.blueprint, 'seed': self.seed, 'block_size': self.block_size},
+            'blocks': self.blocks,
+            'journal_bytes': self.journal_bytes,
+            'progress': self.progress,
+            'rng_states': {type_key: rng.getstate() for type_key, rng in self._rngs.items()},
+            'cost_model': self.equation_set.cost_model.to_dict(),
+        })
+
+    def _check_budgets(self):
+        for type_key, report in self.progress.items():
+            budget = self.equation_set.failure_budget(type_key)
+            if budget is not None and report['failures'] > budget:
+                raise FailureBudgetExceeded(type_key, report['requested'], report['generated'],
+                                            report['failures'], budget, report['errors'])
+
+    @property
+    def done(self):
+        return all(report['generated'] >= report['requested'] for report in self.progress.values())
+
+    def _next_block(self):
+        # Сіди блоку по типах у порядку blueprint; кожен тип просить не більше, ніж йому бракує,
+        # тож зайвих рівнянь не буває, а збережені сіди типу -- найкоротший префікс його потоку з count успіхами.
+        # Як і в EquationSet, тип просить не більше за залишок бюджету невдач + 1.
+        tasks = []
+        for type_key, report in self.progress.items():
+            needed = min(self.equation_set.round_size(report['requested'] - report['generated'], report['failures'],
+                                                      self.equation_set.failure_budget(type_key)),
+                         self.block_size - len(tasks))
+            rng = self._rngs[type_key]
+            tasks.extend((type_key, rng.getrandbits(32)) for _ in range(needed))
+            if len(tasks) == self.block_size:
+                break
+        return tasks
+
+    def run(self, max_blocks=None):
+        # max_blocks обмежує кількість блоків за виклик (наприклад, щоб розбити завдання на сеанси).
+        self._check_budgets()
+        blocks_run = 0
+        while not self.done and (max_blocks is None or blocks_run < max_blocks):
+            tasks = self._next_block()
+            lines = []
+            for (type_key, _), (record, error) in zip(tasks, self.equation_set.run_scheduled(tasks)):
+                report = self.progress[type_key]
+                if record is None:
+                    report['failures'] += 1
+                    report['errors'][error] = report['errors'].get(error, 0) + 1
+                    print(f"Помилка при генерації класу {get_equation_class(type_key).__name__}: {error}")
+                    continue
+                report['generated'] += 1
+                lines.append(json.dumps(record.to_dict(), ensure_ascii=False) + '\n')
+
+            # Спершу журнал на диск, потім контрольна точка: точка ніколи не випереджає журнал.
+            data = ''.join(lines).encode('utf-8')
+            with open(self.journal_path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_bytes += len(data)
+            self.blocks += 1
+            blocks_run += 1
+            self._write_checkpoint()
+            # Бюджет перевіряємо після фіксації блоку: успішні рівняння блоку вже в журналі й не згенеруються знову.
+            self._check_budgets()
+        return self.progress
+
+    def records(self):
+        # Лише зафіксовані контрольною точкою рядки журналу.
+        with open(self.journal_path, 'rb') as f:
+            data = f.read(self.journal_bytes)
+        for line in data.decode('utf-8').splitlines():
+            yield EquationRecord.from_dict(json.loads(line))
+
+    def load(self, equation_set=None):
+        # Записи журналу в EquationSet (наприклад, для generate_pdf).
+        equation_set = equation_set if equation_set is not None else EquationSet()
+        equation_set.equations.extend(self.records())
+        return equation_set
+
+    def close(self):
+        self.equation_set.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
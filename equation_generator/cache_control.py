@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def _unwrap_cached(func):
+    while func is not None:
+        if hasattr(func, 'cache_info'):
+            return func
+        func = getattr(func, '__wrapped__', None)
+    return None
+
+
+def sympy_caches():
+    from sympy.core.cache import CACHE
+
+    caches = []
+    for item in CACHE:
+        cached = _unwrap_cached(item)
+        if cached is not None:
+            caches.append(cached)
+    return caches
+
+
+def sympy_cache_entries() -> int:
+    if 'sympy' not in sys.modules:
+        return 0
+    return sum(c.cache_info().currsize for c in sympy_caches())
+
+
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    if resource is not None:
+        # Без /proc доступний лише піковий RSS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+def clear_caches():
+    from .latex_render import clear_latex_cache
+
+    if 'sympy' in sys.modules:
+        from sympy.core.cache import clear_cache
+        clear_cache()
+    clear_latex_cache()
+
+
+def clear_largest_sympy_caches(target_entries: int) -> int:
+    # Кеші SymPy -- lru_cache, частково їх не витиснути; тож очищаємо найбільші цілком,
+    # доки загальний розмір не опуститься до target_entries.
+    caches = sorted(sympy_caches(), key=lambda c: c.cache_info().currsize, reverse=True)
+    total = sum(c.cache_info().currsize for c in caches)
+    cleared = 0
+    for cached in caches:
+        if total <= target_entries:
+            break
+        size = cached.cache_info().currsize
+        cached.cache_clear()
+        total -= size
+        cleared += size
+    return cleared
+
+
+# Лічильники, які воркер пулу повертає батьківському процесу як приріст (take_delta / merge).
+_COUNTERS = ('equations', 'checks', 'clears', 'rss_clears', 'entries_cleared', 'clear_time')
+
+
+class CacheManager:
+
+    def __init__(self, max_cache_entries=50000, max_rss_mb=None, check_every=1, mode='trim', trim_ratio=0.5,
+                 rss_regrowth_mb=None):
+        if mode not in ('trim', 'clear'):
+            raise ValueError(f"Невідомий режим очищення кешу: '{mode}'")
+
+        self.max_cache_entries = max_cache_entries
+        self.max_rss_mb = max_rss_mb
+        self.check_every = max(1, check_every)
+        self.mode = mode
+        self.trim_ratio = trim_ratio
+        # CPython рідко повертає звільнену пам'ять ОС, тож після очищення RSS лишається над межею.
+        # Повторно чистимо лише тоді, коли RSS виріс ще на rss_regrowth_mb (за замовчуванням 10% від межі).
+        if rss_regrowth_mb is None and max_rss_mb is not None:
+            rss_regrowth_mb = max_rss_mb * 0.1
+        self.rss_regrowth_mb = rss_regrowth_mb
+        self.rss_after_clear = None
+
+        self.equations = 0
+        self.checks = 0
+        self.clears = 0
+        self.rss_clears = 0
+        self.entries_cleared = 0
+        self.clear_time = 0.0
+        self.last_cache_entries = 0
+        self.peak_cache_entries = 0
+        self.last_rss_bytes = None
+        self.peak_rss_bytes = None
+        self._reported = dict.fromkeys(_COUNTERS, 0)
+
+    def after_equation(self):
+        self.equations += 1
+        if self.equations % self.check_every == 0:
+            self.check()
+
+    def check(self) -> bool:
+        self.checks += 1
+        entries = sympy_cache_entries()
+        rss = current_rss_bytes()
+
+        self.last_cache_entries = entries
+        self.peak_cache_entries = max(self.peak_cache_entries, entries)
+        self.last_rss_bytes = rss
+        if rss is not None:
+            self.peak_rss_bytes = max(self.peak_rss_bytes or 0, rss)
+
+        over_entries = self.max_cache_entries is not None and entries > self.max_cache_entries
+        over_rss = self.max_rss_mb is not None and rss is not None and rss > self.max_rss_mb * 1024 * 1024
+        if not over_rss:
+            self.rss_after_clear = None
+        elif self.rss_after_clear is not None and rss < self.rss_after_clear + (self.rss_regrowth_mb or 0) * 1024 * 1024:
+            over_rss = False
+
+        if not (over_entries or over_rss):
+            return False
+
+        t0 = time.perf_counter()
+        if self.mode == 'clear' or over_rss:
+            clear_caches()
+            self.entries_cleared += entries
+        else:
+            self.entries_cleared += clear_largest_sympy_caches(int(self.max_cache_entries * self.trim_ratio))
+        self.clear_time += time.perf_counter() - t0
+        self.clears += 1
+        if over_rss:
+            self.rss_clears += 1
+            self.rss_after_clear = current_rss_bytes()
+
+        self.last_cache_entries = sympy_cache_entries()
+        return True
+
+    def take_delta(self) -> dict:
+        # У воркері: приріст лічильників з попереднього виклику та поточні показники процесу.
+        delta = {name: getattr(self, name) - self._reported[name] for name in _COUNTERS}
+        self._reported = {name: getattr(self, name) for name in _COUNTERS}
+        delta.update(cache_entries=self.last_cache_entries, peak_cache_entries=self.peak_cache_entries,
+                     rss_bytes=self.last_rss_bytes, peak_rss_bytes=self.peak_rss_bytes)
+        return delta
+
+    def merge(self, delta):
+        # У батьківському процесі: лічильники воркерів сумуються, піки -- найбільші серед воркерів,
+        # поточні показники -- з останнього звіту.
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) + delta[name])
+        self.last_cache_entries = delta['cache_entries']
+        self.peak_cache_entries = max(self.peak_cache_entries, delta['peak_cache_entries'])
+        if delta['rss_bytes'] is not None:
+            self.last_rss_bytes = delta['rss_bytes']
+        if delta['peak_rss_bytes'] is not None:
+            self.peak_rss_bytes = max(self.peak_rss_bytes or 0, delta['peak_rss_bytes'])
+
+    @property
+    def metrics(self) -> dict:
+        mb = 1024 * 1024
+        return {
+            'equations': self.equations,
+            'checks': self.checks,
+            'clears': self.clears,
+            'rss_clears': self.rss_clears,
+            'entries_cleared': self.entries_cleared,
+            'clear_time_ms': self.clear_time * 1000,
+            'cache_entries': self.last_cache_entries,
+            'peak_cache_entries': self.peak_cache_entries,
+            'rss_mb': self.last_rss_bytes / mb if self.last_rss_bytes is not None else None,
+            'peak_rss_mb': self.peak_rss_bytes / mb if self.peak_rss_bytes is not None else None,
+        }
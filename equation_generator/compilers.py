@@ -0,0 +1,169 @@
+import abc
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+PLACEHOLDER_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [] /Count 0 >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n"
+    b"%%EOF\n"
+)
+
+CLEAN_EXTENSIONS = ['.aux', '.log', '.out', '.fls', '.fdb_latexmk']
+
+
+class LatexCompilationError(Exception):
+
+    def __init__(self, message, log=""):
+        super().__init__(message)
+        self.log = log
+
+
+class LatexCompiler(abc.ABC):
+
+    @abc.abstractmethod
+    def compile(self, tex_file: str, clean: bool = True) -> str:
+        pass
+
+    @staticmethod
+    def _clean(base):
+        for ext in CLEAN_EXTENSIONS:
+            try:
+                os.remove(base + ext)
+            except FileNotFoundError:
+                pass
+
+
+class PdfLatexCompiler(LatexCompiler):
+
+    def __init__(self, executable=None, args=None, silent=True):
+        self.executable = executable
+        self.args = list(args) if args else []
+        self.silent = silent
+
+    def _resolve_executable(self):
+        if self.executable is not None:
+            return self.executable
+
+        env_compiler = os.environ.get('EQUAGEN_LATEX')
+        if env_compiler:
+            return env_compiler
+
+        for candidate in ('latexmk', 'pdflatex'):
+            if shutil.which(candidate) is not None:
+                return candidate
+
+        raise LatexCompilationError("No LaTex compiler was found")
+
+    def compile(self, tex_file, clean=True):
+        tex_file = os.path.abspath(tex_file)
+        work_dir = os.path.dirname(tex_file)
+        base = os.path.splitext(tex_file)[0]
+
+        executable = self._resolve_executable()
+        args = list(self.args)
+        if os.path.splitext(os.path.basename(executable))[0] == 'latexmk':
+            args = ['-pdf'] + args
+
+        command = [executable] + args + ['-interaction=nonstopmode', os.path.basename(tex_file)]
+        stdout = subprocess.DEVNULL if self.silent else None
+
+        try:
+            p = subprocess.run(command, stdout=stdout, stderr=subprocess.STDOUT, cwd=work_dir)
+        except FileNotFoundError:
+            raise LatexCompilationError(f"LaTeX compiler '{executable}' was not found")
+
+        log = ""
+        if os.path.exists(base + '.log'):
+            with open(base + '.log', 'r', encoding='latin-1') as f:
+                log = f.read()
+
+        if p.returncode != 0:
+            raise LatexCompilationError(f"'{executable}' exited with code {p.returncode}", log)
+
+        if clean:
+            self._clean(base)
+
+        return base + '.pdf'
+
+
+class StubLatexCompiler(LatexCompiler):
+
+    def __init__(self, latency=0.0, validate=True):
+        self.latency = latency
+        self.validate = validate
+        self.compiled = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def check_balance(source):
+        errors = []
+        depth = 0
+        dollars = 0
+
+        for line_no, line in enumerate(source.splitlines(), 1):
+            i = 0
+            while i < len(line):
+                ch = line[i]
+                if ch == '\\':
+                    i += 2
+                    continue
+                if ch == '%':
+                    break
+                if ch == '{':
+                    depth += 1
+                elif ch == '}':
+                    depth -= 1
+                    if depth < 0:
+                        errors.append(f"l.{line_no}: unmatched '}}'")
+                        depth = 0
+                elif ch == '$':
+                    dollars += 1
+                i += 1
+
+        if depth > 0:
+            errors.append(f"{depth} unclosed '{{'")
+        if dollars % 2 != 0:
+            errors.append("unbalanced '$' (odd number of math shifts)")
+        return errors
+
+    def compile(self, tex_file, clean=True):
+        base = os.path.splitext(tex_file)[0]
+
+        with open(tex_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        errors = self.check_balance(source) if self.validate else []
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        log_lines = [f"This is StubLaTeX, input '{os.path.basename(tex_file)}' ({len(source)} bytes)"]
+        log_lines.extend(f"! {e}" for e in errors)
+
+        with open(base + '.log', 'w', encoding='utf-8') as f:
+            f.write("\n".join(log_lines) + "\n")
+
+        if errors:
+            raise LatexCompilationError("; ".join(errors), "\n".join(log_lines))
+
+        with open(base + '.pdf', 'wb') as f:
+            f.write(PLACEHOLDER_PDF)
+
+        with self._lock:
+            self.compiled += 1
+
+        if clean:
+            self._clean(base)
+
+        return base + '.pdf'
+
+
+def get_compiler(compiler=None) -> LatexCompiler:
+    if isinstance(compiler, LatexCompiler):
+        return compiler
+    return PdfLatexCompiler(executable=compiler)
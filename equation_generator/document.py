@@ -0,0 +1,26 @@
+import os
+
+from pylatex import Document
+
+from .compilers import get_compiler
+
+
+class FixedDocument(Document):
+
+    def generate_tex(self, file_name):
+        tex_file = file_name + '.tex'
+        with open(tex_file, 'w', encoding='utf-8') as f:
+            f.write(self.dumps())
+
+    def compile(self, file_name, compiler=None, clean_tex=True, clean=True):
+        tex_file = file_name + '.tex'
+
+        self.generate_tex(file_name)
+
+        try:
+            pdf_file = get_compiler(compiler).compile(tex_file, clean=clean)
+        finally:
+            if clean_tex and os.path.exists(tex_file):
+                os.remove(tex_file)
+
+        return pdf_file
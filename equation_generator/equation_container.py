@@ -1,31 +1,207 @@
-from .base_class import FixedDocument
-from pylatex import Document, Section, Math, Package
-from pylatex.utils import NoEscape
+import os
+import random
+import time
+
+from .errors import FailureBudgetExceeded
+from .generation import get_equation_class, generate_record_metered, generate_record_safe
+from .scheduling import CostModel, plan_chunks, run_chunk
+from .worker_pool import WorkerPool
+
+
+# Скільки невдалих генерацій одного типу допускаємо за виклик add_equations.
+DEFAULT_MAX_FAILURES = 10
 
 
 class EquationSet:
 
-    def __init__(self):
+    def __init__(self, seed=None, processes=None, pool=None, cache_manager=None, max_failures=DEFAULT_MAX_FAILURES,
+                 cost_model=None):
         self.equations = []
+        self.processes = processes
+        self.pool = pool
+        self.cache_manager = cache_manager
+        # Число для всіх типів або словник {type_key: бюджет}; відсутні у словнику типи отримують DEFAULT_MAX_FAILURES.
+        self.max_failures = max_failures
+        # Оцінки вартості типів для add_mix; можна передати спільну модель кільком наборам.
+        self.cost_model = cost_model if cost_model is not None else CostModel()
+        self._owns_pool = False
+        self._rng = random.Random(seed)
+
+    def _get_pool(self):
+        if self.pool is None and self.processes and self.processes > 1:
+            self.pool = WorkerPool(self.processes, cache_manager=self.cache_manager)
+            self._owns_pool = True
+        return self.pool
+
+    def close(self):
+        if self._owns_pool and self.pool is not None:
+            self.pool.close()
+            self.pool = None
+            self._owns_pool = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _metrics_manager(self):
+        # Менеджер, у який зводяться метрики воркерів: власний або той, що переданий готовому пулу.
+        if self.cache_manager is not None:
+            return self.cache_manager
+        return getattr(self.pool, 'cache_manager', None)
+
+    def _merge_cache_metrics(self, cache_delta):
+        manager = self._metrics_manager()
+        if cache_delta is not None and manager is not None:
+            manager.merge(cache_delta)
+
+    def failure_budget(self, type_key):
+        if isinstance(self.max_failures, dict):
+            return self.max_failures.get(type_key, DEFAULT_MAX_FAILURES)
+        return self.max_failures
+
+    @staticmethod
+    def round_size(missing, failures, budget):
+        # Раунд не більший за залишок бюджету + 1: навіть якщо всі спроби невдалі, бюджет перевищено рівно на одну,
+        # і тип, що завжди падає, не витрачає count спроб.
+        if budget is None:
+            return missing
+        return max(0, min(missing, budget - failures + 1))
+
+    def _generate_tasks(self, tasks):
+        # Результати видаються по одному, тож виняток у споживача зупиняє послідовну генерацію одразу.
+        pool = self._get_pool() if len(tasks) > 1 else None
+        if pool is not None:
+            for record, error, cache_delta in pool.map(generate_record_metered, tasks):
+                self._merge_cache_metrics(cache_delta)
+                yield record, error
+            return
+
+        for task in tasks:
+            result = generate_record_safe(task)
+            if self.cache_manager is not None:
+                self.cache_manager.after_equation()
+            yield result
 
-    def add_equations(self, type_key: str, count: int = 1):
-        from . import EQUATION_REGISTRY
-        klass = EQUATION_REGISTRY.get(type_key)
+    def add_equations(self, type_key: str, count: int = 1, max_failures=None):
+        # Добираємо нові сіди, доки не буде рівно count рівнянь; кожен раунд просить лише відсутню кількість.
+        klass = get_equation_class(type_key)
 
         if klass is None:
             print(f"Попередження: Тип рівняння '{type_key}' не знайдено у EQUATION_REGISTRY.")
-            return
+            return None
+
+        budget = self.failure_budget(type_key) if max_failures is None else max_failures
+        records = []
+        errors = {}
+        failures = 0
+
+        while len(records) < count:
+            size = self.round_size(count - len(records), failures, budget)
+            tasks = [(type_key, self._rng.getrandbits(32)) for _ in range(size)]
+            for record, error in self._generate_tasks(tasks):
+                if record is None:
+                    failures += 1
+                    errors[error] = errors.get(error, 0) + 1
+                    print(f"Помилка при генерації класу {klass.__name__}: {error}")
+                    if budget is not None and failures > budget:
+                        raise FailureBudgetExceeded(type_key, count, len(records), failures, budget, errors)
+                    continue
+                records.append(record)
+
+        self.equations.extend(records)
+        return {
+            'type_key': type_key,
+            'requested': count,
+            'generated': len(records),
+            'failures': failures,
+            'errors': errors,
+        }
+
+    def run_scheduled(self, tasks):
+        # tasks: [(type_key, seed)] -> [(record, error)] у тому самому порядку. У пулі задачі плануються за оцінкою
+        # вартості (add_mix, BatchJob); попутно оновлюємо оцінки вартості типів.
+        pool = self._get_pool() if len(tasks) > 1 else None
+        if pool is None:
+            results = []
+            for task in tasks:
+                t0 = time.perf_counter()
+                results.append(generate_record_safe(task))
+                self.cost_model.record(task[0], (time.perf_counter() - t0) * 1000)
+                if self.cache_manager is not None:
+                    self.cache_manager.after_equation()
+            return results
+
+        results = [None] * len(tasks)
+        chunks = plan_chunks([(i, type_key, seed) for i, (type_key, seed) in enumerate(tasks)],
+                             self.cost_model, pool.processes)
+        for chunk_results, cache_delta in pool.imap_unordered(run_chunk, chunks):
+            self._merge_cache_metrics(cache_delta)
+            for index, record, error, ms in chunk_results:
+                results[index] = (record, error)
+                self.cost_model.record(tasks[index][0], ms)
+        return results
+
+    def add_mix(self, blueprint, max_failures=None):
+        # blueprint: {type_key: count}. Сіди тягнемо по типах у порядку blueprint, тож без помилок результат той самий,
+        # що й у послідовних add_equations; порядок виконання визначає лише планувальник.
+        counts = {}
+        for type_key, count in blueprint.items():
+            if get_equation_class(type_key) is None:
+                print(f"Попередження: Тип рівняння '{type_key}' не знайдено у EQUATION_REGISTRY.")
+                continue
+            counts[type_key] = count
 
-        for _ in range(count):
-            try:
-                self.equations.append(klass())
-            except Exception as e:
-                print(f"Помилка при генерації класу {klass.__name__}: {e}")
+        records = {type_key: [] for type_key in counts}
+        reports = {type_key: {'type_key': type_key, 'requested': count, 'generated': 0, 'failures': 0, 'errors': {}}
+                   for type_key, count in counts.items()}
+
+        budgets = {type_key: self.failure_budget(type_key) if max_failures is None else max_failures
+                   for type_key in counts}
+
+        while True:
+            tasks = []
+            for type_key, count in counts.items():
+                size = self.round_size(count - len(records[type_key]), reports[type_key]['failures'], budgets[type_key])
+                tasks.extend((type_key, self._rng.getrandbits(32)) for _ in range(size))
+            if not tasks:
+                break
+
+            for (type_key, _), (record, error) in zip(tasks, self.run_scheduled(tasks)):
+                if record is None:
+                    report = reports[type_key]
+                    report['failures'] += 1
+                    report['errors'][error] = report['errors'].get(error, 0) + 1
+                    print(f"Помилка при генерації класу {get_equation_class(type_key).__name__}: {error}")
+                    budget = budgets[type_key]
+                    if budget is not None and report['failures'] > budget:
+                        raise FailureBudgetExceeded(type_key, report['requested'], len(records[type_key]),
+                                                    report['failures'], budget, report['errors'])
+                    continue
+                records[type_key].append(record)
+
+        for type_key in counts:
+            self.equations.extend(records[type_key])
+            reports[type_key]['generated'] = len(records[type_key])
+        return reports
 
     def clear(self):
         self.equations = []
 
-    def generate_pdf(self, filename: str):
+    @property
+    def cache_metrics(self):
+        # У пулі -- зведені метрики воркерів: лічильники сумарні, піки -- найбільші серед воркерів.
+        manager = self._metrics_manager()
+        if manager is None:
+            return None
+        return manager.metrics
+
+    def generate_pdf(self, filename: str, compiler=None):
+        from pylatex import Section, Math, Package
+        from pylatex.utils import NoEscape
+        from .document import FixedDocument
+
         geometry_options = {"tmargin": "1in", "lmargin": "1in", "rmargin": "1in"}
 
         doc = FixedDocument(
@@ -73,13 +249,10 @@ class EquationSet:
             if filename.endswith('.pdf'):
                 filename = filename[:-4]
 
-            compiler_path = r"D:\apps\latex\texlive\2025\bin\windows\pdflatex.exe"
+            filename = os.path.abspath(filename)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-            doc.generate_pdf(
-                filename,
-                clean_tex=True,
-                compiler=compiler_path
-            )
+            doc.compile(filename, compiler=compiler, clean_tex=True)
 
             print(f"PDF-файл '{filename}.pdf' успішно створено.")
 
@@ -0,0 +1,96 @@
+class EquationRecord:
+    __slots__ = ('type_key', 'seed', 'params', 'problem_latex', 'steps', 'answer_latex')
+
+    def __init__(self, type_key, seed, params, problem_latex, steps, answer_latex):
+        object.__setattr__(self, 'type_key', type_key)
+        object.__setattr__(self, 'seed', seed)
+        object.__setattr__(self, 'params', tuple(params))
+        object.__setattr__(self, 'problem_latex', problem_latex)
+        object.__setattr__(self, 'steps', tuple((step_type, step_data) for step_type, step_data in steps))
+        object.__setattr__(self, 'answer_latex', answer_latex)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"EquationRecord is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"EquationRecord is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return (EquationRecord, self._fields())
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, EquationRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"EquationRecord(type_key={self.type_key!r}, seed={self.seed!r}, params={self.params!r})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        # Після JSON пари параметрів і кроки -- списки; конструктор зводить кроки до кортежів сам.
+        return cls(
+            type_key=data['type_key'],
+            seed=data['seed'],
+            params=(tuple(param) for param in data['params']),
+            problem_latex=data['problem_latex'],
+            steps=data['steps'],
+            answer_latex=data['answer_latex'],
+        )
+
+    @classmethod
+    def from_equation(cls, equation, type_key, seed):
+        return cls(
+            type_key=type_key,
+            seed=seed,
+            params=extract_params(equation.variables),
+            problem_latex=equation.get_equation_latex(),
+            steps=equation.steps,
+            answer_latex=equation.get_solution_latex(),
+        )
+
+    def get_equation_latex(self) -> str:
+        return self.problem_latex
+
+    def get_solution_latex(self) -> str:
+        return self.answer_latex
+
+    def rehydrate(self):
+        from .generation import generate_equation
+
+        equation = generate_equation(self.type_key, self.seed)
+        restored = EquationRecord.from_equation(equation, self.type_key, self.seed)
+        if restored != self:
+            raise ValueError(
+                f"Не вдалося відновити рівняння типу '{self.type_key}' з seed={self.seed}: "
+                f"параметри генерації не збігаються."
+            )
+        return equation
+
+
+def _param_value(value):
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, type):
+        return value.__name__
+    if getattr(value, 'is_number', False) and not getattr(value, 'free_symbols', True):
+        return str(value)
+    return None
+
+
+def extract_params(variables):
+    params = []
+    for name in sorted(variables):
+        value = _param_value(variables[name])
+        if value is not None:
+            params.append((name, value))
+    return tuple(params)
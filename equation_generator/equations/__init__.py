@@ -1,31 +1,33 @@
-from .simplest_equation import SimplestEquation
-from .homogeneous_equation import HomogeneousEquation
-from .sum_to_product_equation import SumToProductEquation
-from .grouping_equation import GroupingEquation
-from .power_reduction_equation import PowerReductionEquation
-from .quadratic_trig_equation import QuadraticTrigEquation
-from .double_angle_to_quadratic_equation import DoubleAngleToQuadraticEquation
-from .linear_combination_equation import LinearCombinationEquation
-from .reducible_to_homogenous_equation import ReducibleToHomogeneousEquation
-from .symmetric_equation import SymmetricEquation
-from .tan_substitution_equation import TanSubstitutionEquation
-from .sum_tan_cotan_equation import SumTanCotanEquation
-from .bounded_sum_equation import BoundedSumEquation
-from .inverse_trig_equation import InverseTrigEquation
+import importlib
 
-__all__ = [
-    'SimplestEquation',
-    'HomogeneousEquation',
-    'SumToProductEquation',
-    'GroupingEquation',
-    'PowerReductionEquation',
-    'QuadraticTrigEquation',
-    'DoubleAngleToQuadraticEquation',
-    'LinearCombinationEquation',
-    'ReducibleToHomogeneousEquation',
-    'SymmetricEquation',
-    'TanSubstitutionEquation',
-    'SumTanCotanEquation',
-    'BoundedSumEquation',
-    'InverseTrigEquation',
-]
\ No newline at end of file
+_MODULES = {
+    'SimplestEquation': '.simplest_equation',
+    'HomogeneousEquation': '.homogeneous_equation',
+    'SumToProductEquation': '.sum_to_product_equation',
+    'GroupingEquation': '.grouping_equation',
+    'PowerReductionEquation': '.power_reduction_equation',
+    'QuadraticTrigEquation': '.quadratic_trig_equation',
+    'DoubleAngleToQuadraticEquation': '.double_angle_to_quadratic_equation',
+    'LinearCombinationEquation': '.linear_combination_equation',
+    'ReducibleToHomogeneousEquation': '.reducible_to_homogenous_equation',
+    'SymmetricEquation': '.symmetric_equation',
+    'TanSubstitutionEquation': '.tan_substitution_equation',
+    'SumTanCotanEquation': '.sum_tan_cotan_equation',
+    'BoundedSumEquation': '.bounded_sum_equation',
+    'InverseTrigEquation': '.inverse_trig_equation',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module_path = _MODULES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    klass = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = klass
+    return klass
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,81 +1,98 @@
-import random
+from fractions import Fraction
+
 import sympy
-from sympy import sin, cos, Eq, solveset, Reals, symbols, pi, S, Intersection, Union
+from sympy import Eq, solveset, Reals, pi, S, Intersection, Union
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import Domain, ParameterSpace
+from ..solution_sets import union_solution_sets
+from ..trig_tables import BOUNDED_SUM_ROOTS, BOUNDED_SUM_TERMS, N_INT
+
+
+def _remaining_terms(point, position):
+    if position > point['num_terms']:
+        return [None]
+    chosen = [point[f'term_{i}'] for i in range(1, position)]
+    pool = [term for term in BOUNDED_SUM_TERMS[point['x0']] if term not in chosen]
+    return Domain(pool, [term[3] for term in pool])
+
+
+# sign * func(k x) = 1  <=>  k x = base * pi + 2 pi m; base у частках pi.
+_UNIT_BASES = {('sin', 1): Fraction(1, 2), ('sin', -1): Fraction(3, 2), ('cos', 1): Fraction(0), ('cos', -1): Fraction(1)}
+
+
+def _term_roots(term):
+    # Корені доданка на [0, 2pi) у частках pi.
+    base = _UNIT_BASES[(term['func'].__name__, term['sign'])]
+    return {(base + 2 * j) / term['k'] % 2 for j in range(term['k'])}
 
 
 class BoundedSumEquation(TrigonometricEquation):
 
+    golden_roots = BOUNDED_SUM_ROOTS
+    term_table = BOUNDED_SUM_TERMS
+
+    # Доданки (func, k, sign, weight) вибираються без повторень з вагами таблиці.
+    # Для кожного x0 у таблиці є 6 доданків зі значенням +-1, тож вибірка без повторень завжди вдається.
+    parameters = ParameterSpace('bounded_sum', [
+        ('num_terms', [2, 2, 3]),
+        ('x0', golden_roots),
+        ('term_1', lambda p: _remaining_terms(p, 1)),
+        ('term_2', lambda p: _remaining_terms(p, 2)),
+        ('term_3', lambda p: _remaining_terms(p, 3)),
+    ])
+
     def _generate(self):
-        while True:
-            num_terms = random.choice([2, 2, 3])
-            golden_roots = [0, pi, pi / 2, 3 * pi / 2]
-            x0 = random.choice(golden_roots)
-
-            terms_data = []
-
-            for _ in range(num_terms):
-                for attempt in range(50):
-                    func = random.choice([sin, cos])
-                    k = random.choice([1, 1, 2, 3, 4, 5, 6])
-
-                    val = func(k * x0)
-                    val = sympy.simplify(val)
-
-                    if abs(val) == 1:
-                        sign = int(val)
-                        terms_data.append({
-                            'func': func,
-                            'k': k,
-                            'sign': sign
-                        })
-                        break
-                else:
-                    break
-
-            if len(terms_data) < num_terms:
-                continue
-
-            signatures = set()
-            is_duplicate = False
-            for t in terms_data:
-                sig = (t['func'].__name__, t['k'])
-                if sig in signatures:
-                    is_duplicate = True
-                    break
-                signatures.add(sig)
-
-            if is_duplicate:
-                continue
-
-            lhs_expr = 0
-            for t in terms_data:
-                term_expr = t['sign'] * t['func'](t['k'] * self.x)
-                lhs_expr += term_expr
-
-            rhs_value = num_terms
-
-            self.equation_obj = Eq(lhs_expr, rhs_value)
-
-            self.variables = {
-                'x0': x0,
-                'terms_data': terms_data,
-                'rhs_value': rhs_value
-            }
-            break
+        p = self.parameters.sample()
+        num_terms, x0 = p['num_terms'], p['x0']
+
+        terms_data = []
+        for i in range(1, num_terms + 1):
+            func, k, sign, _ = p[f'term_{i}']
+            terms_data.append({
+                'func': func,
+                'k': k,
+                'sign': sign
+            })
+
+        lhs_expr = 0
+        for t in terms_data:
+            term_expr = t['sign'] * t['func'](t['k'] * self.x)
+            lhs_expr += term_expr
+
+        rhs_value = num_terms
+
+        self.equation_obj = Eq(lhs_expr, rhs_value)
+
+        self.variables = {
+            'x0': x0,
+            'terms_data': terms_data,
+            'rhs_value': rhs_value
+        }
+
+    def _system_roots(self):
+        # Корені системи на [0, 2pi): спільні корені всіх доданків. x0 -- лише один із них,
+        # наприклад cos 2x + cos 6x = 2 має ще й x = pi.
+        def compute():
+            roots = set.intersection(*[_term_roots(t) for t in self.variables['terms_data']])
+            return sorted(roots)
+
+        return self._memo('system_roots', compute)
 
     def _solve(self):
-        x0 = self.variables['x0']
-        n = symbols('n', integer=True)
-        self.solution_obj = sympy.ImageSet(sympy.Lambda(n, x0 + 2 * pi * n), sympy.Integers)
+        n = N_INT
+        self.solution_obj = union_solution_sets([
+            sympy.ImageSet(sympy.Lambda(n, sympy.Rational(r.numerator, r.denominator) * pi + 2 * pi * n), sympy.Integers)
+            for r in self._system_roots()
+        ])
 
     def _build_solution_steps(self):
         terms_data = self.variables['terms_data']
         rhs_value = self.variables['rhs_value']
         x0 = self.variables['x0']
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         lhs_latex_parts = []
         ineq_parts = []
@@ -131,14 +148,14 @@ class BoundedSumEquation(TrigonometricEquation):
             x0_latex = ""
             plus_sign = ""
         else:
-            x0_latex = sympy.latex(x0)
+            x0_latex = latex(x0)
             plus_sign = " + "
 
         if k == 1:
             root_series = rf"x = {x0_latex}{plus_sign}2\pi n, n \in \mathbb{{Z}}"
         else:
             base_angle = sympy.asin(rhs_simple) if func_name == 'sin' else sympy.acos(rhs_simple)
-            base_latex = sympy.latex(base_angle)
+            base_latex = latex(base_angle)
 
             self.steps.append(("math", rf"{k}x = {base_latex} + 2\pi n"))
 
@@ -146,7 +163,7 @@ class BoundedSumEquation(TrigonometricEquation):
             term_2_num = 2
             term_2_den = k
 
-            term_1_lat = sympy.latex(term_1) if term_1 != 0 else ""
+            term_1_lat = latex(term_1) if term_1 != 0 else ""
             plus = " + " if term_1 != 0 else ""
             term_2_lat = rf"\frac{{{term_2_num}\pi n}}{{{term_2_den}}}"
 
@@ -156,7 +173,7 @@ class BoundedSumEquation(TrigonometricEquation):
         self.steps.append(("text", f"Перевіримо, чи задовольняють ці корені інші рівняння системи."))
 
         self.steps.append(("text",
-                           rf"Підставимо значення $x$, які відповідають $n$ кратному {k} (щоб період $2\pi n$ зберігся), наприклад, серію $x = {sympy.latex(x0)} + 2\pi m$:"))
+                           rf"Підставимо значення $x$, які відповідають $n$ кратному {k} (щоб період $2\pi n$ зберігся), наприклад, серію $x = {latex(x0)} + 2\pi m$:"))
 
         for i in range(1, len(terms_data)):
             t = terms_data[i]
@@ -165,22 +182,24 @@ class BoundedSumEquation(TrigonometricEquation):
             tsign = t['sign']
             sign_sym = "-" if tsign == -1 else ""
 
-            arg_sub = rf"{tk}\left({sympy.latex(x0)} + 2\pi m\right)"
-            arg_open = rf"{sympy.latex(tk * x0)} + {2 * tk}\pi m"
+            arg_sub = rf"{tk}\left({latex(x0)} + 2\pi m\right)"
+            arg_open = rf"{latex(tk * x0)} + {2 * tk}\pi m"
 
-            val_x0 = t['func'](tk * x0)
+            val_x0 = tsign
             res = tsign * val_x0
 
-            check_line = rf"{sign_sym}\{func_name}\left( {arg_sub} \right) = {sign_sym}\{func_name}\left( {arg_open} \right) = {sign_sym}\{func_name}\left( {sympy.latex(tk * x0)} \right) = {sign_sym}({sympy.latex(val_x0)}) = {res}"
+            check_line = rf"{sign_sym}\{func_name}\left( {arg_sub} \right) = {sign_sym}\{func_name}\left( {arg_open} \right) = {sign_sym}\{func_name}\left( {latex(tk * x0)} \right) = {sign_sym}({latex(val_x0)}) = {res}"
 
             self.steps.append(("math", check_line))
 
         self.steps.append(("text", "Усі рівняння системи задовольняються."))
 
-        if x0 == 0:
-            ans_latex = r"2\pi n"
-        else:
-            ans_latex = rf"{sympy.latex(x0)} + 2\pi n"
+        roots = self._system_roots()
+        if len(roots) > 1:
+            # Інші корені першого рівняння на одному періоді теж можуть задовольняти всю систему.
+            roots_latex = ", ".join(latex(sympy.Rational(r.numerator, r.denominator) * pi) for r in roots)
+            self.steps.append(("text", rf"Перевіривши так само решту коренів першого рівняння на проміжку $[0, 2\pi)$, "
+                                       rf"отримуємо всі розв'язки системи на цьому проміжку: $x = {roots_latex}$."))
 
         self.steps.append(("text", "Кінцева відповідь:"))
-        self.steps.append(("math", rf"x = {ans_latex}, n \in \mathbb{{Z}}"))
\ No newline at end of file
+        self.steps.append(("math", rf"x \in {latex(self.solution_obj)}"))
@@ -1,87 +1,85 @@
-import random
-import sympy
-from sympy import sin, cos, tan, Eq, solveset, Reals, symbols, Rational, sqrt
+from fractions import Fraction
+from sympy import sin, cos, tan, Eq
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import union_solution_sets
+from ..surd import Surd, terms_denominators_lcm
+from ..trig_tables import T
 
 
-class DoubleAngleToQuadraticEquation(TrigonometricEquation):
+_HALF = Fraction(1, 2)
+_NICE_ROOTS = [Surd(0), Surd(1), Surd(-1), Surd(_HALF), Surd(-_HALF), Surd.sqrt(3, _HALF), Surd.sqrt(3, -_HALF),
+               Surd.sqrt(2, _HALF), Surd.sqrt(2, -_HALF)]
+_OTHER_ROOTS = [Surd(2), Surd(-2), Surd(3), Surd(Fraction(3, 2))]
 
-    def _generate(self):
-        while True:
-            target_func = random.choice([sin, cos])
 
-            nice_roots = [0, 1, -1, Rational(1, 2), Rational(-1, 2), sqrt(3) / 2, -sqrt(3) / 2, sqrt(2) / 2,
-                          -sqrt(2) / 2]
-            other_roots = [2, -2, 3, Rational(3, 2)]
+class DoubleAngleToQuadraticEquation(TrigonometricEquation):
 
-            t1 = random.choice(nice_roots)
-            t2 = random.choice(nice_roots + other_roots)
+    # Старший коефіцієнт ядра після нормування ненульовий, тож A_eq != 0 без окремої перевірки.
+    parameters = ParameterSpace('double_angle_to_quadratic', [
+        ('target_func', [sin, cos]),
+        ('t1', _NICE_ROOTS),
+        ('t2', _NICE_ROOTS + _OTHER_ROOTS),
+    ], constraints=[
+        lambda p: p['t1'] + p['t2'] != 0,
+        lambda p: abs(p['t1']) <= 1 or abs(p['t2']) <= 1,
+    ])
 
-            if t1 + t2 == 0:
-                continue
+    def _generate(self):
+        p = self.parameters.sample()
+        target_func, t1, t2 = p['target_func'], p['t1'], p['t2']
 
-            if (abs(t1) > 1) and (abs(t2) > 1):
-                continue
+        a_quad = Surd(1)
+        b_quad = -(t1 + t2)
+        c_quad = t1 * t2
 
-            a_quad = 1
-            b_quad = -(t1 + t2)
-            c_quad = t1 * t2
+        # Зводимо знаменники всіх доданків, зокрема при коренях: коефіцієнти рівняння -- точні числа з Z[sqrt(d)].
+        mult = terms_denominators_lcm([a_quad, b_quad, c_quad])
 
-            coeffs = [a_quad, b_quad, c_quad]
-            denoms = [c.q for c in coeffs if hasattr(c, 'q')]
-            lcm = sympy.lcm(denoms)
+        a = (a_quad * mult).to_sympy()
+        b = (b_quad * mult).to_sympy()
+        c = (c_quad * mult).to_sympy()
+        t1, t2 = t1.to_sympy(), t2.to_sympy()
 
-            a = int(a_quad * lcm)
-            b = int(b_quad * lcm)
-            c = int(c_quad * lcm)
+        if target_func == sin:
+            A_eq = -a
+            B_eq = 2 * b
+            C_eq = a + 2 * c
 
-            if a == 0 and b == 0:
-                continue
+            term_double = cos(2 * self.x)
+            term_linear = sin(self.x)
+            formula_latex = r"\cos(2x) = 1 - 2\sin^2(x)"
 
-            if target_func == sin:
-                A_eq = -a
-                B_eq = 2 * b
-                C_eq = a + 2 * c
+        else:
+            A_eq = a
+            B_eq = 2 * b
+            C_eq = a + 2 * c
 
-                term_double = cos(2 * self.x)
-                term_linear = sin(self.x)
-                formula_latex = r"\cos(2x) = 1 - 2\sin^2(x)"
-                substitution_latex = rf"{A_eq}(1 - 2\sin^2(x)) + {B_eq}\sin(x) + {C_eq} = 0" if A_eq != 0 else ""
+            term_double = cos(2 * self.x)
+            term_linear = cos(self.x)
+            formula_latex = r"\cos(2x) = 2\cos^2(x) - 1"
 
-            else:
-                A_eq = a
-                B_eq = 2 * b
-                C_eq = a + 2 * c
-
-                term_double = cos(2 * self.x)
-                term_linear = cos(self.x)
-                formula_latex = r"\cos(2x) = 2\cos^2(x) - 1"
-                substitution_latex = rf"{A_eq}(2\cos^2(x) - 1) + {B_eq}\cos(x) + {C_eq} = 0" if A_eq != 0 else ""
-
-            if A_eq == 0:
-                continue
-
-            self.equation_obj = Eq(A_eq * term_double + B_eq * term_linear + C_eq, 0)
-
-            self.variables = {
-                'target_func': target_func,
-                't1': t1,
-                't2': t2,
-                'a': a, 'b': b, 'c': c,
-                'formula_latex': formula_latex,
-                'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq
-            }
-            break
+        self.equation_obj = Eq(A_eq * term_double + B_eq * term_linear + C_eq, 0)
+
+        self.variables = {
+            'target_func': target_func,
+            't1': t1,
+            't2': t2,
+            'a': a, 'b': b, 'c': c,
+            'formula_latex': formula_latex,
+            'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq
+        }
 
     def _solve(self):
         target_func = self.variables['target_func']
         t1 = self.variables['t1']
         t2 = self.variables['t2']
 
-        sol1 = solveset(Eq(target_func(self.x), t1), self.x, domain=Reals)
-        sol2 = solveset(Eq(target_func(self.x), t2), self.x, domain=Reals)
+        sol1 = self._solveset(Eq(target_func(self.x), t1))
+        sol2 = self._solveset(Eq(target_func(self.x), t2))
 
-        self.solution_obj = sympy.Union(sol1, sol2)
+        self.solution_obj = union_solution_sets([sol1, sol2])
 
     def _build_solution_steps(self):
         target_func = self.variables['target_func']
@@ -95,10 +93,10 @@ class DoubleAngleToQuadraticEquation(TrigonometricEquation):
         B_eq = self.variables['B_eq']
         C_eq = self.variables['C_eq']
 
-        t = symbols('t')
+        t = T
         func_name = target_func.__name__
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         self.steps.append(("text",
                            rf"Рівняння містить $\cos(2x)$ та ${func_name}(x)$. Використаємо формулу косинуса подвійного кута, щоб звести все до ${func_name}(x)$:"))
@@ -111,7 +109,7 @@ class DoubleAngleToQuadraticEquation(TrigonometricEquation):
         elif A_eq == -1:
             A_str = "-"
         else:
-            A_str = str(A_eq)
+            A_str = latex(A_eq)
 
         if target_func == sin:
             sub_step = f"{A_str}(1 - 2\\sin^2 x)"
@@ -120,39 +118,44 @@ class DoubleAngleToQuadraticEquation(TrigonometricEquation):
 
         B_sign = "+" if B_eq >= 0 else "-"
         C_sign = "+" if C_eq >= 0 else "-"
-        sub_step += f" {B_sign} {abs(B_eq)}{func_name} x {C_sign} {abs(C_eq)} = 0"
+        def abs_latex(value):
+            # Ірраціональні коефіцієнти на кшталт 4 - 2sqrt(6) беремо в дужки.
+            value_latex = latex(abs(value))
+            return f"({value_latex})" if getattr(value, 'is_Add', False) else value_latex
+
+        sub_step += f" {B_sign} {abs_latex(B_eq)}{func_name} x {C_sign} {abs_latex(C_eq)} = 0"
 
         self.steps.append(("math", sub_step))
 
         self.steps.append(("text", "Розкриємо дужки та зведемо подібні доданки:"))
 
         quad_eq_func = Eq(a * target_func(self.x) ** 2 + b * target_func(self.x) + c, 0)
-        self.steps.append(("math", sympy.latex(quad_eq_func)))
+        self.steps.append(("math", latex(quad_eq_func)))
 
         self.steps.append(("text", rf"Введемо заміну $t = {func_name}(x)$ (де $|t| \le 1$):"))
         quad_eq_t = Eq(a * t ** 2 + b * t + c, 0)
-        self.steps.append(("math", sympy.latex(quad_eq_t)))
+        self.steps.append(("math", latex(quad_eq_t)))
 
         self.steps.append(("text", "Знаходимо корені квадратного рівняння:"))
-        self.steps.append(("math", f"t_1 = {sympy.latex(t1)}, \\quad t_2 = {sympy.latex(t2)}"))
+        self.steps.append(("math", f"t_1 = {latex(t1)}, \\quad t_2 = {latex(t2)}"))
 
         self.steps.append(("text", "Повертаємось до заміни:"))
 
         if abs(t1) <= 1:
             self.steps.append(("math",
-                               rf"1) {func_name}(x) = {sympy.latex(t1)} \implies x \in {sympy.latex(solveset(Eq(target_func(self.x), t1), self.x))}"))
+                               rf"1) {func_name}(x) = {latex(t1)} \implies x \in {latex(self._solveset(Eq(target_func(self.x), t1)))}"))
         else:
             self.steps.append(("math",
-                               rf"1) {func_name}(x) = {sympy.latex(t1)} \implies \text{{розв'язків немає, бо }} |{sympy.latex(t1)}| > 1"))
+                               rf"1) {func_name}(x) = {latex(t1)} \implies \text{{розв'язків немає, бо }} |{latex(t1)}| > 1"))
 
         if t1 != t2:
             if abs(t2) <= 1:
                 self.steps.append(("math",
-                                   rf"2) {func_name}(x) = {sympy.latex(t2)} \implies x \in {sympy.latex(solveset(Eq(target_func(self.x), t2), self.x))}"))
+                                   rf"2) {func_name}(x) = {latex(t2)} \implies x \in {latex(self._solveset(Eq(target_func(self.x), t2)))}"))
             else:
                 self.steps.append(("math",
-                                   rf"2) {func_name}(x) = {sympy.latex(t2)} \implies \text{{розв'язків немає, бо }} |{sympy.latex(t2)}| > 1"))
+                                   rf"2) {func_name}(x) = {latex(t2)} \implies \text{{розв'язків немає, бо }} |{latex(t2)}| > 1"))
 
-        final_solution_latex = sympy.latex(self.solution_obj)
+        final_solution_latex = latex(self.solution_obj)
         self.steps.append(("text", f"Об'єднуючи розв'язки, отримуємо кінцеву відповідь:"))
         self.steps.append(("math", f"x = {final_solution_latex}"))
\ No newline at end of file
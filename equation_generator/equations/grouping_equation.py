@@ -1,31 +1,52 @@
 import random
+from types import MappingProxyType
+
 import sympy
-from sympy import sin, cos, tan, cot, pi, Eq, solveset, Reals, symbols, ImageSet, Lambda, Integers, EmptySet, Add, gcd
+from sympy import sin, cos, tan, cot, Eq, Add, gcd
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace, PooledSpace
+from ..solution_sets import zero_solution_set, zero_solution_set_by_solve, union_solution_sets
+from ..trig_tables import SUM_TO_PRODUCT_FORMULAS, ZERO_CASE_SOLUTIONS, N_INT, N
+
+
+def _grouping_space(k_pool, m_n_pool):
+    # Індекс усіх допустимих (k, m, n): m, n > k бажано іншої парності, ніж k (інакше -- тієї ж),
+    # а чотири аргументи m +- k, n +- k різні й ненульові.
+    def m_n_candidates(k):
+        valid = [x for x in m_n_pool if x > k and (x % 2 != k % 2)]
+        if len(valid) < 2:
+            valid = [x for x in m_n_pool if x > k and (x % 2 == k % 2)]
+        return valid if len(valid) >= 2 else []
+
+    def distinct_args(p):
+        args_set = {p['m'] + p['k'], p['m'] - p['k'], p['n'] + p['k'], p['n'] - p['k']}
+        return 0 not in args_set and len(args_set) == 4
+
+    return ParameterSpace('grouping', [
+        ('k', k_pool),
+        ('m', lambda p: m_n_candidates(p['k'])),
+        ('n', lambda p: [x for x in m_n_candidates(p['k']) if x != p['m']]),
+        ('f', [sin, cos]),
+        ('op_transform', ['+', '-']),
+        ('op_group', lambda p: ['-'] if p['op_transform'] == '-' else ['+', '-']),
+    ], constraints=[distinct_args])
 
 
 class GroupingEquation(TrigonometricEquation):
 
-    def __init__(self):
-        self.formula_map = {
-            'sin+sin': r'\sin(\alpha) + \sin(\beta) = 2\sin\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
-            'sin-sin': r'\sin(\alpha) - \sin(\beta) = 2\sin\left(\frac{\alpha-\beta}{2}\right)\cos\left(\frac{\alpha+\beta}{2}\right)',
-            'cos+cos': r'\cos(\alpha) + \cos(\beta) = 2\cos\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
-            'cos-cos': r'\cos(\alpha) - \cos(\beta) = -2\sin\left(\frac{\alpha+\beta}{2}\right)\sin\left(\frac{\alpha-\beta}{2}\right)'
-        }
-
-        n_int = symbols('n', integer=True)
-        self.special_case_map = {
-            'sin': {
-                0: pi * n_int
-            },
-            'cos': {
-                0: pi / 2 + pi * n_int
-            }
-        }
+    formula_map = SUM_TO_PRODUCT_FORMULAS
+    special_case_map = ZERO_CASE_SOLUTIONS
 
-        super().__init__()
+    # f(p+k) op f(p-k) = coeff * common_f(kx) * other_f(px).
+    # Незмінна, як і таблиці trig_tables: спільна для всіх екземплярів.
+    pair_factors = MappingProxyType({
+        ('sin', '+'): (2, cos, sin),
+        ('sin', '-'): (2, sin, cos),
+        ('cos', '+'): (2, cos, cos),
+        ('cos', '-'): (-2, sin, sin),
+    })
 
     def _get_transform(self, f, op, alpha_expr, beta_expr):
         f_name = f.__name__
@@ -39,42 +60,19 @@ class GroupingEquation(TrigonometricEquation):
             return -2 * sin((alpha_expr + beta_expr) / 2) * sin((alpha_expr - beta_expr) / 2)
 
     def get_equation_latex(self) -> str:
-        return sympy.latex(self.equation_obj)
-
-    def _generate(self):
-
-        k_pool = [1, 2, 3, 4]
-        m_n_pool = [2, 3, 4, 5, 6, 7, 8, 9]
-
-        while True:
-            k = random.choice(k_pool)
-
-            valid_pool = [x for x in m_n_pool if x > k and (x % 2 != k % 2)]
-
-            if len(valid_pool) < 2:
-                valid_pool = [x for x in m_n_pool if x > k and (x % 2 == k % 2)]
-                if len(valid_pool) < 2:
-                    continue
-
-            m, n = random.sample(valid_pool, 2)
-
-            alpha1_arg, beta1_arg = m + k, m - k
-            alpha2_arg, beta2_arg = n + k, n - k
-
-            args_set = {alpha1_arg, beta1_arg, alpha2_arg, beta2_arg}
+        return latex(self.equation_obj)
 
-            if 0 in args_set or len(args_set) < 4:
-                continue
-
-            break
+    k_pool = [1, 2, 3, 4]
+    m_n_pool = [2, 3, 4, 5, 6, 7, 8, 9]
+    parameters = PooledSpace(_grouping_space, 'k_pool', 'm_n_pool')
 
-        f = random.choice([sin, cos])
-        op_transform = random.choice(['+', '-'])
+    def _generate(self):
+        p = self.parameters.sample()
+        k, m, n = p['k'], p['m'], p['n']
+        f, op_transform, op_group = p['f'], p['op_transform'], p['op_group']
 
-        if op_transform == '-':
-            op_group = '-'
-        else:
-            op_group = random.choice(['+', '-'])
+        alpha1_arg, beta1_arg = m + k, m - k
+        alpha2_arg, beta2_arg = n + k, n - k
 
         alpha1_expr, beta1_expr = alpha1_arg * self.x, beta1_arg * self.x
         alpha2_expr, beta2_expr = alpha2_arg * self.x, beta2_arg * self.x
@@ -119,18 +117,29 @@ class GroupingEquation(TrigonometricEquation):
         self.variables['pair1_lhs'] = pair1_lhs
         self.variables['pair2_lhs'] = pair2_lhs
 
+    def _pair_args(self):
+        v = self.variables
+        k = (v['a1_arg'] - v['b1_arg']) // 2
+        m = (v['a1_arg'] + v['b1_arg']) // 2
+        n = (v['a2_arg'] + v['b2_arg']) // 2
+        return k, m, n
+
     def _factor_common_term(self):
-        pair1_lhs = self.variables['pair1_lhs']
-        pair2_lhs = self.variables['pair2_lhs']
         op_g = self.variables['op_group']
+        coeff, common_f, other_f = self.pair_factors[(self.variables['f'].__name__, self.variables['op_transform'])]
+        k, m, n = self._pair_args()
 
-        common_factor_expr = gcd(pair1_lhs, pair2_lhs)
-        other_term1_expr = sympy.simplify(pair1_lhs / common_factor_expr)
-        other_term2_expr = sympy.simplify(pair2_lhs / common_factor_expr)
+        # Спільний множник відомий з побудови: 2 * common_f(kx), знак переходить у дужки.
+        sign = coeff // 2
+        common_factor_expr = 2 * common_f(k * self.x)
+        other_term1_expr = sign * other_f(m * self.x)
+        other_term2_expr = sign * other_f(n * self.x)
 
         self.variables['common_factor'] = common_factor_expr
         self.variables['other_term1'] = other_term1_expr
         self.variables['other_term2'] = other_term2_expr
+        self.variables['other_f'] = other_f
+        self.variables['other_sign'] = sign
 
         if op_g == '+':
             other_group = other_term1_expr + other_term2_expr
@@ -139,17 +148,24 @@ class GroupingEquation(TrigonometricEquation):
 
         self.variables['other_group_expr'] = other_group
 
+        if self.debug_checks:
+            pair1_lhs, pair2_lhs = self.variables['pair1_lhs'], self.variables['pair2_lhs']
+            self._debug_check(common_factor_expr * other_term1_expr, pair1_lhs, "перша пара")
+            self._debug_check(common_factor_expr * other_term2_expr, pair2_lhs, "друга пара")
+
+            common_by_gcd = gcd(pair1_lhs, pair2_lhs)
+            self._debug_check_equal(common_factor_expr, common_by_gcd, "спільний множник")
+            self._debug_check(other_term1_expr, sympy.simplify(pair1_lhs / common_by_gcd), "перша пара")
+            self._debug_check(other_term2_expr, sympy.simplify(pair2_lhs / common_by_gcd), "друга пара")
+
     def _factor_remaining_group(self):
         op_g = self.variables['op_group']
-        other_term1_expr = self.variables['other_term1']
-        other_term2_expr = self.variables['other_term2']
+        other_f = self.variables['other_f']
+        _, m, n = self._pair_args()
 
-        other_f = other_term1_expr.func
-        if not hasattr(other_f, '__name__') or not other_f.__name__ in ('sin', 'cos'):
-            other_f = other_term2_expr.func
-
-        final_factors_expr = self._get_transform(other_f, op_g, other_term1_expr.args[0], other_term2_expr.args[0])
+        final_factors_expr = self.variables['other_sign'] * self._get_transform(other_f, op_g, m * self.x, n * self.x)
         self.variables['final_factors_expr'] = final_factors_expr
+        self._debug_check(final_factors_expr, self.variables['other_group_expr'], "вираз у дужках")
 
         all_factors_expr = self.variables['common_factor'] * final_factors_expr
         all_factors = all_factors_expr.as_ordered_factors()
@@ -157,9 +173,7 @@ class GroupingEquation(TrigonometricEquation):
 
     def _solve_factors(self):
         all_factors = self.variables['all_factors']
-        n_int = symbols('n', integer=True)
 
-        final_solution_set = EmptySet
         sub_solutions_list = []
 
         for factor_obj in all_factors:
@@ -173,22 +187,18 @@ class GroupingEquation(TrigonometricEquation):
                 continue
 
             arg_expr = factor_obj.args[0]
-            rhs = 0
-
-            special_formula_expr = self.special_case_map.get(f_sub.__name__, {}).get(rhs)
 
-            if special_formula_expr:
-                simple_eq = Eq(arg_expr, special_formula_expr)
-                sub_sol_expr = sympy.solve(simple_eq, self.x)[0].expand()
-                sub_sol_set = ImageSet(Lambda(n_int, sub_sol_expr), Integers)
-            else:
-                sub_sol_set = solveset(sub_eq, self.x, domain=Reals)
+            sub_sol_set = zero_solution_set(f_sub.__name__, arg_expr, self.x)
+            if sub_sol_set is None:
+                sub_sol_set = self._solveset(sub_eq)
+            elif self.debug_checks:
+                self._debug_check_equal(sub_sol_set, zero_solution_set_by_solve(f_sub.__name__, arg_expr, self.x),
+                                        "множина розв'язків")
 
             sub_solutions_list.append(sub_sol_set)
-            final_solution_set = final_solution_set.union(sub_sol_set)
 
         self.variables['sub_solutions'] = sub_solutions_list
-        self.solution_obj = final_solution_set
+        self.solution_obj = union_solution_sets(sub_solutions_list)
 
     def _build_solution_steps(self):
         if self.equation_obj is None: return
@@ -197,12 +207,12 @@ class GroupingEquation(TrigonometricEquation):
         op_t = self.variables['op_transform']
         op_g = self.variables['op_group']
         f_name = f.__name__
-        n_latex = symbols('n')
+        n_latex = N
 
-        a1_lat = sympy.latex(self.variables['a1_arg'] * self.x)
-        b1_lat = sympy.latex(self.variables['b1_arg'] * self.x)
-        a2_lat = sympy.latex(self.variables['a2_arg'] * self.x)
-        b2_lat = sympy.latex(self.variables['b2_arg'] * self.x)
+        a1_lat = latex(self.variables['a1_arg'] * self.x)
+        b1_lat = latex(self.variables['b1_arg'] * self.x)
+        a2_lat = latex(self.variables['a2_arg'] * self.x)
+        b2_lat = latex(self.variables['b2_arg'] * self.x)
 
         formula_transform_key = f"{f_name}{op_t}{f_name}"
         formula_transform = self.formula_map.get(formula_transform_key)
@@ -217,8 +227,8 @@ class GroupingEquation(TrigonometricEquation):
 
         self.steps.append(("text", rf"Використовуємо формулу: ${formula_transform}$"))
 
-        pair1_lat = sympy.latex(self.variables['pair1_lhs'])
-        pair2_lat = sympy.latex(self.variables['pair2_lhs'])
+        pair1_lat = latex(self.variables['pair1_lhs'])
+        pair2_lat = latex(self.variables['pair2_lhs'])
         self.steps.append(("text", "Застосовуємо формулу до кожної пари:"))
 
         pair1_term = self.variables['pair1_lhs']
@@ -229,20 +239,16 @@ class GroupingEquation(TrigonometricEquation):
         else:
             step2_expr = pair1_term - pair2_term
 
-        step2_latex = sympy.latex(step2_expr) + " = 0"
+        step2_latex = latex(step2_expr) + " = 0"
         self.steps.append(("math", step2_latex))
 
-        common_factor_lat = sympy.latex(self.variables['common_factor'])
-        other_group_lat = sympy.latex(self.variables['other_group_expr'])
+        common_factor_lat = latex(self.variables['common_factor'])
+        other_group_lat = latex(self.variables['other_group_expr'])
 
         self.steps.append(("text", rf"Винесемо спільний множник ${common_factor_lat}$ за дужки:"))
         self.steps.append(("math", rf"{common_factor_lat} \cdot \left( {other_group_lat} \right) = 0"))
 
-        other_f = self.variables['other_term1'].func
-        if not hasattr(other_f, '__name__') or not other_f.__name__ in ('sin', 'cos'):
-            other_f = self.variables['other_term2'].func
-
-        other_f_name = other_f.__name__
+        other_f_name = self.variables['other_f'].__name__
         formula_group_key = f"{other_f_name}{op_g}{other_f_name}"
         formula_group = self.formula_map.get(formula_group_key)
 
@@ -250,7 +256,7 @@ class GroupingEquation(TrigonometricEquation):
             self.steps.append(("text", rf"Тепер застосуємо формулу (${formula_group}$) до виразу в дужках:"))
 
             final_factors_expr = self.variables['common_factor'] * self.variables['final_factors_expr']
-            full_final_lat = sympy.latex(sympy.simplify(final_factors_expr)) + " = 0"
+            full_final_lat = latex(final_factors_expr) + " = 0"
             self.steps.append(("math", full_final_lat))
 
         self.steps.append(("text", "Добуток дорівнює нулю, коли хоча б один із множників дорівнює нулю."))
@@ -274,18 +280,18 @@ class GroupingEquation(TrigonometricEquation):
             special_formula_expr = self.special_case_map.get(f_sub.__name__, {}).get(rhs)
 
             self.steps.append(("text", f"Розв'язуємо {factor_index + 1}-й множник:"))
-            self.steps.append(("math", sympy.latex(sub_eq)))
+            self.steps.append(("math", latex(sub_eq)))
 
             is_simple_arg = (arg_expr == self.x)
 
             if not is_simple_arg:
-                if special_formula_expr:
-                    formula_latex = sympy.latex(special_formula_expr.subs(symbols('n', integer=True), n_latex))
-                    formula_str = f"{sympy.latex(arg_expr)} = {formula_latex}, n " + r"\in \mathbb{Z}"
+                if special_formula_expr is not None:
+                    formula_latex = latex(special_formula_expr.subs(N_INT, n_latex))
+                    formula_str = f"{latex(arg_expr)} = {formula_latex}, n " + r"\in \mathbb{Z}"
                     self.steps.append(("math", formula_str))
 
             sub_sol_set = sub_sols[factor_index]
-            sub_sol_latex = sympy.latex(sub_sol_set)
+            sub_sol_latex = latex(sub_sol_set)
 
             if not is_simple_arg:
                 self.steps.append(("text", "Виражаємо $x$:"))
@@ -296,6 +302,6 @@ class GroupingEquation(TrigonometricEquation):
 
             factor_index += 1
 
-        final_sol_latex = sympy.latex(self.solution_obj)
+        final_sol_latex = latex(self.solution_obj)
         self.steps.append(("text", "Об'єднуючи всі розв'язки, отримуємо кінцеву відповідь:"))
         self.steps.append(("math", f"x = {final_sol_latex}"))
\ No newline at end of file
@@ -1,13 +1,19 @@
-import random
-import sympy
-from sympy import sin, cos, tan, Eq, solveset, Reals, symbols, Rational
+from sympy import sin, cos, tan, Eq, symbols, Rational
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import union_solution_sets
 
 class HomogeneousEquation(TrigonometricEquation):
 
+    parameters = ParameterSpace('homogeneous', [
+        ('t1', [-3, -2, -1, 1, 2, 3]),
+        ('t2', [-1, 1, Rational(1, 2), 2]),
+    ])
+
     def _generate(self):
-        t1 = random.choice([-3, -2, -1, 1, 2, 3])
-        t2 = random.choice([-1, 1, Rational(1, 2), 2])
+        p = self.parameters.sample()
+        t1, t2 = p['t1'], p['t2']
 
         A = 1
         B = -(t1 + t2)
@@ -27,10 +33,11 @@ class HomogeneousEquation(TrigonometricEquation):
         t_eq_1 = Eq(tan(self.x), self.variables['t1'])
         t_eq_2 = Eq(tan(self.x), self.variables['t2'])
 
-        sol1 = solveset(t_eq_1, self.x, domain=Reals)
-        sol2 = solveset(t_eq_2, self.x, domain=Reals)
+        sol1 = self._solveset(t_eq_1)
+        sol2 = self._solveset(t_eq_2)
 
-        self.solution_obj = sympy.Union(sol1, sol2)
+        self.variables['sub_solutions'] = [sol1, sol2]
+        self.solution_obj = union_solution_sets([sol1, sol2])
 
     def _build_solution_steps(self):
         A = self.variables['A']
@@ -38,13 +45,14 @@ class HomogeneousEquation(TrigonometricEquation):
         C = self.variables['C']
         t1 = self.variables['t1']
         t2 = self.variables['t2']
+        sol1, sol2 = self.variables['sub_solutions']
 
         A_str = "" if A == 1 else str(A)
         B_str = f"+ {B}" if B > 0 else f"{B}"
         C_str = f"+ {C}" if C > 0 else f"{C}"
 
         self.steps = [
-            ("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"),
+            ("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"),
             ("text", "Це однорідне тригонометричне рівняння другого порядку."),
             ("text", rf"Розділимо обидві частини рівняння на $cos^2(x) \neq 0$:"),
             ("math", f"{A_str}\\frac{{sin^2(x)}}{{cos^2(x)}} {B_str}\\frac{{sin(x)cos(x)}}{{cos^2(x)}} {C_str}\\frac{{cos^2(x)}}{{cos^2(x)}} = 0"),
@@ -53,7 +61,7 @@ class HomogeneousEquation(TrigonometricEquation):
             ("math", f"{A_str}t^2 {B_str}t {C_str} = 0"),
             ("text", f"Коренями цього квадратного рівняння (наприклад, за теоремою Вієта) є $t_1 = {t1}$ та $t_2 = {t2}$."),
             ("text", "Повертаємось до заміни:"),
-            ("math", rf"$tg(x) = {t1} \implies x = {sympy.latex(solveset(Eq(tan(self.x), self.variables['t1']), self.x))}$"),
-            ("math", rf"$tg(x) = {t2} \implies x = {sympy.latex(solveset(Eq(tan(self.x), self.variables['t2']), self.x))}$"),
+            ("math", rf"$tg(x) = {t1} \implies x = {latex(sol1)}$"),
+            ("math", rf"$tg(x) = {t2} \implies x = {latex(sol2)}$"),
             ("text", f"Об'єднуючи розв'язки, отримуємо кінцеву відповідь.")
         ]
\ No newline at end of file
@@ -1,79 +1,96 @@
-import random
-import sympy
 from sympy import (sin, cos, tan, cot, asin, acos, atan, acot,
                    Eq, solveset, Reals, symbols, expand,
-                   pi, sqrt, Rational, S, Union)
+                   pi, sqrt, Rational, S, Union, FiniteSet)
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
 
 
 class InverseTrigEquation(TrigonometricEquation):
 
+    parameters = ParameterSpace('inverse_trig', [
+        ('func_type', ['arcsin', 'arccos', 'arctg', 'arcctg']),
+        ('V', lambda p: [0, 1, -1, Rational(1, 2), Rational(-1, 2)] if p['func_type'] in ['arcsin', 'arccos']
+                        else [0, 1, -1]),
+        ('k', [1, 2, 3, 4]),
+        ('poly_degree', [1, 2]),
+        ('x1', range(-5, 6)),
+        ('x2', lambda p: range(-5, 6) if p['poly_degree'] == 2 else [None]),
+        ('a', lambda p: [1, -1, 2, -2, 3] if p['poly_degree'] == 1 else [1, -1, 2]),
+    ])
+
     def _generate(self):
-        while True:
-            func_type = random.choice(['arcsin', 'arccos', 'arctg', 'arcctg'])
-
-            if func_type in ['arcsin', 'arccos']:
-                V_choices = [0, 1, -1, Rational(1, 2), Rational(-1, 2)]
-            else:
-                V_choices = [0, 1, -1]
-
-            V = random.choice(V_choices)
-
-            if func_type == 'arcsin':
-                alpha = asin(V)
-                sympy_func = asin
-            elif func_type == 'arccos':
-                alpha = acos(V)
-                sympy_func = acos
-            elif func_type == 'arctg':
-                alpha = atan(V)
-                sympy_func = atan
-            elif func_type == 'arcctg':
-                alpha = acot(V)
-                if V < 0:
-                    alpha = alpha + pi
-                sympy_func = acot
-
-            k = random.choice([1, 2, 3, 4])
-
-            rhs = k * alpha
-
-            poly_degree = random.choice([1, 2])
-
-            if poly_degree == 1:
-                x1 = random.randint(-5, 5)
-                a = random.choice([1, -1, 2, -2, 3])
-                b = V - a * x1
-                P = a * self.x + b
-
-            else:
-                x1 = random.randint(-5, 5)
-                x2 = random.randint(-5, 5)
-                a = random.choice([1, -1, 2])
-                P = expand(a * (self.x - x1) * (self.x - x2)) + V
-
-            P = sympy.simplify(P)
-
-            self.equation_obj = Eq(k * sympy_func(P), rhs)
-
-            self.variables = {
-                'func_type': func_type,
-                'V': V,
-                'alpha': alpha,
-                'k': k,
-                'rhs': rhs,
-                'P': P,
-                'poly_degree': poly_degree
-            }
-            break
+        p = self.parameters.sample()
+        func_type, V, k, poly_degree = p['func_type'], p['V'], p['k'], p['poly_degree']
+        x1, x2, a = p['x1'], p['x2'], p['a']
+
+        if func_type == 'arcsin':
+            alpha = asin(V)
+            sympy_func = asin
+        elif func_type == 'arccos':
+            alpha = acos(V)
+            sympy_func = acos
+        elif func_type == 'arctg':
+            alpha = atan(V)
+            sympy_func = atan
+        elif func_type == 'arcctg':
+            alpha = acot(V)
+            if V < 0:
+                alpha = alpha + pi
+            sympy_func = acot
+
+        rhs = k * alpha
+
+        if poly_degree == 1:
+            b = V - a * x1
+            P = a * self.x + b
+            roots = (x1,)
+
+        else:
+            P = expand(a * (self.x - x1) * (self.x - x2)) + V
+            roots = (x1, x2)
+
+        P = expand(P)
+
+        # SymPy виносить мінус з acot(-P), а для arcctg зі значеннями в (0, pi) це вже інше рівняння.
+        self.equation_obj = Eq(k * sympy_func(P, evaluate=func_type != 'arcctg'), rhs)
+
+        self.variables = {
+            'func_type': func_type,
+            'V': V,
+            'alpha': alpha,
+            'k': k,
+            'rhs': rhs,
+            'P': P,
+            'poly_degree': poly_degree,
+            'roots': roots
+        }
 
     def _solve(self):
-        P = self.variables['P']
+        func_type = self.variables['func_type']
         V = self.variables['V']
+        current_rhs = self.variables['rhs'] / self.variables['k']
 
-        sol = solveset(Eq(P, V), self.x, domain=Reals)
-        self.solution_obj = sol
+        # P(x) = V має корені, з яких P будувався; для arcsin/arccos ще потрібно |V| <= 1.
+        if func_type == 'arcsin':
+            is_valid = -1 <= V <= 1 and -pi / 2 <= current_rhs <= pi / 2
+        elif func_type == 'arccos':
+            is_valid = -1 <= V <= 1 and 0 <= current_rhs <= pi
+        elif func_type == 'arctg':
+            is_valid = -pi / 2 < current_rhs < pi / 2
+        else:
+            is_valid = 0 < current_rhs < pi
+        self.variables['is_valid'] = bool(is_valid)
+
+        if not is_valid:
+            self.solution_obj = S.EmptySet
+            return
+
+        self.solution_obj = FiniteSet(*self.variables['roots'])
+        if self.debug_checks:
+            self._debug_check_equal(self.solution_obj, solveset(Eq(self.variables['P'], V), self.x, domain=Reals),
+                                    "корені")
 
     def _build_solution_steps(self):
         func_type = self.variables['func_type']
@@ -99,63 +116,56 @@ class InverseTrigEquation(TrigonometricEquation):
         elif func_type == 'arcctg':
             direct_func = r"\text{ctg}"
 
-        P_latex = sympy.latex(P)
+        P_latex = latex(P)
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         current_rhs = rhs
         if k != 1:
             self.steps.append(("text", rf"Поділимо обидві частини рівняння на ${k}$:"))
             current_rhs = rhs / k
-            self.steps.append(("math", rf"{func_latex}({P_latex}) = {sympy.latex(current_rhs)}"))
+            self.steps.append(("math", rf"{func_latex}({P_latex}) = {latex(current_rhs)}"))
 
-        range_info = ""
-        is_valid = True
         if func_type == 'arcsin':
             range_info = r"\left[-\frac{\pi}{2}; \frac{\pi}{2}\right]"
-            if not (-pi / 2 <= current_rhs <= pi / 2): is_valid = False
         elif func_type == 'arccos':
             range_info = r"[0; \pi]"
-            if not (0 <= current_rhs <= pi): is_valid = False
         elif func_type == 'arctg':
             range_info = r"\left(-\frac{\pi}{2}; \frac{\pi}{2}\right)"
-            if not (-pi / 2 < current_rhs < pi / 2): is_valid = False
         elif func_type == 'arcctg':
             range_info = r"(0; \pi)"
-            if not (0 < current_rhs < pi): is_valid = False
 
         self.steps.append(("text",
                            rf"Перевіримо, чи належить права частина області значень функції ${func_latex}$, тобто проміжку ${range_info}$."))
 
-        if not is_valid:
+        if not self.variables['is_valid']:
             self.steps.append(("text", r"Значення виходить за межі області значень. Рівняння розв'язків немає."))
-            self.solution_obj = S.EmptySet
             return
 
         self.steps.append(("text", r"Значення належить області визначення."))
 
         self.steps.append(("text", r"За означенням обернених тригонометричних функцій:"))
-        self.steps.append(("math", rf"{P_latex} = {direct_func}\left({sympy.latex(current_rhs)}\right)"))
+        self.steps.append(("math", rf"{P_latex} = {direct_func}\left({latex(current_rhs)}\right)"))
 
         self.steps.append(("text",
-                           rf"Оскільки ${direct_func}\left({sympy.latex(current_rhs)}\right) = {sympy.latex(V)}$, отримуємо алгебраїчне рівняння:"))
+                           rf"Оскільки ${direct_func}\left({latex(current_rhs)}\right) = {latex(V)}$, отримуємо алгебраїчне рівняння:"))
 
         alg_eq = Eq(P, V)
-        self.steps.append(("math", sympy.latex(alg_eq)))
+        self.steps.append(("math", latex(alg_eq)))
 
         if V != 0:
             lhs_final = P - V
-            self.steps.append(("math", rf"{sympy.latex(lhs_final)} = 0"))
+            self.steps.append(("math", rf"{latex(lhs_final)} = 0"))
 
         self.steps.append(("text", "Розв'язуємо отримане рівняння:"))
 
-        final_sol = sympy.latex(self.solution_obj)
+        final_sol = latex(self.solution_obj)
         self.steps.append(("math", f"x \in {final_sol}"))
 
         if func_type in ['arcsin', 'arccos']:
             self.steps.append(("text", r"Перевірка: знайдені корені повинні задовольняти умову $|P(x)| \le 1$."))
             self.steps.append(
-                ("text", rf"Оскільки $P(x) = {sympy.latex(V)}$ і $|{sympy.latex(V)}| \le 1$, корені підходять."))
+                ("text", rf"Оскільки $P(x) = {latex(V)}$ і $|{latex(V)}| \le 1$, корені підходять."))
 
         self.steps.append(("text", "Кінцева відповідь:"))
         self.steps.append(("math", f"x \in {final_sol}"))
\ No newline at end of file
@@ -1,32 +1,51 @@
 import random
 import sympy
-from sympy import sin, cos, tan, cot, pi, Eq, S, solveset, Reals, symbols, ImageSet, Lambda, Integers, EmptySet, Add, gcd, \
-    Rational
+from sympy import sin, cos, tan, cot, Eq, S, Add, Rational
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace, PooledSpace
+from ..solution_sets import zero_solution_set, zero_solution_set_by_solve, union_solution_sets
+from ..trig_tables import POWER_REDUCTION_FORMULAS, ZERO_CASE_SOLUTIONS, N_INT, N
+
+
+def _power_reduction_space(k_pool, m_n_pool, k_3_pool, m_3_pool):
+    # Індекси (k, m, n) для кожного шляху та (k_3, m_3) для "3_terms_const": генерація -- один вибір з індексу.
+    def disjoint_args(p):
+        return {p['m'] + p['k'], p['m'] - p['k']}.isdisjoint({p['n'] + p['k'], p['n'] - p['k']})
+
+    def k_m_n_space(path_type, constraints):
+        return ParameterSpace(f'power_reduction.k_m_n.{path_type}', [
+            ('k', k_pool),
+            ('m', lambda p: [x for x in m_n_pool if x > p['k']]),
+            ('n', lambda p: [x for x in m_n_pool if x > p['k'] and x != p['m']]),
+        ], constraints=constraints)
+
+    k_m_n = {
+        "3_terms_const": k_m_n_space("3_terms_const", []),
+        "4_terms": k_m_n_space("4_terms", [disjoint_args]),
+    }
+    # Аргументи m_3 + k_3, m_3 - k_3, m_3 різні, а k_3, m_3 різної парності.
+    k_3_m_3 = ParameterSpace('power_reduction.k_3_m_3', [
+        ('k_3', k_3_pool),
+        ('m_3', m_3_pool),
+    ], constraints=[
+        lambda p: p['k_3'] != p['m_3'] and p['k_3'] % 2 != p['m_3'] % 2,
+        lambda p: len({p['m_3'] + p['k_3'], p['m_3'] - p['k_3'], p['m_3']}) == 3,
+    ])
+
+    return ParameterSpace('power_reduction', [
+        ('path_type', ["3_terms_const", "4_terms"]),
+        ('f_type', [sin, cos]),
+        ('k_m_n', lambda p: k_m_n[p['path_type']]),
+        ('k_3_m_3', lambda p: k_3_m_3 if p['path_type'] == "3_terms_const" else None),
+    ])
 
 
 class PowerReductionEquation(TrigonometricEquation):
 
-    def __init__(self):
-        self.formula_map = {
-            'sin': r'\sin^2(\alpha) = \frac{1 - \cos(2\alpha)}{2}',
-            'cos': r'\cos^2(\alpha) = \frac{1 + \cos(2\alpha)}{2}',
-            'cos+cos': r'\cos(\alpha) + \cos(\beta) = 2\cos\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
-            'cos-cos': r'\cos(\alpha) - \cos(\beta) = -2\sin\left(\frac{\alpha+\beta}{2}\right)\sin\left(\frac{\alpha-\beta}{2}\right)'
-        }
-
-        n_int = symbols('n', integer=True)
-        self.special_case_map = {
-            'sin': {
-                0: pi * n_int
-            },
-            'cos': {
-                0: pi / 2 + pi * n_int
-            }
-        }
-
-        super().__init__()
+    formula_map = POWER_REDUCTION_FORMULAS
+    special_case_map = ZERO_CASE_SOLUTIONS
 
     def _get_transform(self, f, op, alpha_expr, beta_expr):
         f_name = f.__name__
@@ -37,51 +56,29 @@ class PowerReductionEquation(TrigonometricEquation):
         else:
             return None
 
-    def _generate(self):
+    k_pool = [1, 2, 3]
+    m_n_pool = [2, 3, 4, 5, 6, 7, 8, 9]
+    k_3_pool = [1, 2, 3]
+    m_3_pool = [2, 3, 4, 5]
+    parameters = PooledSpace(_power_reduction_space, 'k_pool', 'm_n_pool', 'k_3_pool', 'm_3_pool')
 
-        path_type = random.choice(["3_terms_const", "4_terms"])
+    def _generate(self):
+        p = self.parameters.sample()
+        path_type = p['path_type']
         self.variables = {'path_type': path_type}
 
-        self.variables['f_type'] = random.choice([sin, cos])
+        self.variables['f_type'] = p['f_type']
         f = self.variables['f_type']
 
-        k_pool = [1, 2, 3]
-        m_n_pool = [2, 3, 4, 5, 6, 7, 8, 9]
-
-        while True:
-            k = random.choice(k_pool)
-            m_n_valid_pool = [x for x in m_n_pool if x > k]
-
-            if len(m_n_valid_pool) < 2:
-                continue
-
-            m, n = random.sample(m_n_valid_pool, 2)
-
-            if path_type == "4_terms":
-                args_set1 = {m + k, m - k}
-                args_set2 = {n + k, n - k}
-                if not args_set1.isdisjoint(args_set2):
-                    continue
-
-            break
-
-        self.variables['k_arg'] = k
-        self.variables['m_arg'] = m
-        self.variables['n_arg'] = n
+        self.variables['k_arg'] = p['k']
+        self.variables['m_arg'] = p['m']
+        self.variables['n_arg'] = p['n']
 
         if path_type == "3_terms_const":
             const = Rational(3, 2)
 
-            while True:
-                k_3 = random.randint(1, 3)
-                m_3 = random.randint(2, 5)
-                if k_3 == m_3 or (k_3 % 2 == m_3 % 2):
-                    continue
-
-                a, b, c = (m_3 + k_3), (m_3 - k_3), m_3
-                if len({a, b, c}) < 3:
-                    continue
-                break
+            k_3, m_3 = p['k_3'], p['m_3']
+            a, b, c = (m_3 + k_3), (m_3 - k_3), m_3
 
             final_args = [a, b, c]
             self.variables['final_args'] = final_args
@@ -98,6 +95,7 @@ class PowerReductionEquation(TrigonometricEquation):
             self.variables['const'] = const
 
         else:
+            k, m, n = p['k'], p['m'], p['n']
             a1, b1 = (m + k), (m - k)
             a2, b2 = (n + k), (n - k)
 
@@ -142,8 +140,14 @@ class PowerReductionEquation(TrigonometricEquation):
         group1_trans = self._get_transform(cos, '+', group1_terms[0].args[0], group1_terms[1].args[0])
         self.variables['group1_trans'] = group1_trans
 
-        common_factor = gcd(group1_trans, group2_term)
-        other_group = sympy.simplify(group1_trans / common_factor + group2_term / common_factor)
+        # a + b = 2 * m_3, a - b = 2 * k_3, c = m_3, тому множники відомі з побудови:
+        # 2cos(2m_3 x)cos(2k_3 x) + cos(2m_3 x) = cos(2m_3 x) * (2cos(2k_3 x) + 1).
+        k_3, m_3 = self.variables['k_3'], self.variables['m_3']
+        common_factor = cos(2 * m_3 * self.x)
+        other_group = 2 * cos(2 * k_3 * self.x) + 1
+
+        self._debug_check(group1_trans, group1_terms[0] + group1_terms[1], "cos+cos")
+        self._debug_check(common_factor * other_group, group1_trans + group2_term, "спільний множник")
 
         self.variables['common_factor'] = common_factor
         self.variables['other_group_expr'] = other_group
@@ -167,17 +171,23 @@ class PowerReductionEquation(TrigonometricEquation):
         self.variables['trans_lhs'] = trans_lhs
         self.variables['trans_rhs'] = trans_rhs
 
-        common_factor = gcd(trans_lhs, trans_rhs)
-        other_term1 = sympy.simplify(trans_lhs / common_factor)
-        other_term2 = sympy.simplify(trans_rhs / common_factor)
+        # cos((m+k)x) + cos((m-k)x) = 2cos(mx)cos(kx), аналогічно для n: спільний множник 2cos(kx).
+        common_factor = 2 * cos(k * self.x)
+        other_term1 = cos(m * self.x)
+        other_term2 = cos(n * self.x)
         other_group = other_term1 - other_term2
 
         self.variables['common_factor'] = common_factor
         self.variables['other_group_expr'] = other_group
 
-        final_factors_expr = self._get_transform(cos, '-', other_term1.args[0], other_term2.args[0])
+        final_factors_expr = self._get_transform(cos, '-', m * self.x, n * self.x)
         self.variables['final_factors_expr'] = final_factors_expr
 
+        self._debug_check(trans_lhs, kernel_eq_lhs, "cos+cos")
+        self._debug_check(trans_rhs, kernel_eq_rhs, "cos+cos")
+        self._debug_check(common_factor * other_group, trans_lhs - trans_rhs, "спільний множник")
+        self._debug_check(final_factors_expr, other_group, "cos-cos")
+
         if final_factors_expr is None:
             final_factors_expr = S(1)
 
@@ -187,8 +197,6 @@ class PowerReductionEquation(TrigonometricEquation):
         self._solve_factors(self.variables['all_factors'])
 
     def _solve_factors(self, all_factors):
-        n_int = symbols('n', integer=True)
-        final_solution_set = EmptySet
         sub_solutions_list = []
 
         for factor_obj in all_factors:
@@ -197,38 +205,34 @@ class PowerReductionEquation(TrigonometricEquation):
             sub_eq = Eq(factor_obj, 0)
 
             if factor_obj.func == Add:
-                sub_sol_set = solveset(sub_eq, self.x, domain=Reals)
+                sub_sol_set = self._solveset(sub_eq)
+                if sub_sol_set.has(sympy.asin, sympy.acos):
+                    # Для кроків: та сама множина у вигляді розв'язку f(x) = a замість arcsin/arccos від Add.
+                    self._solveset(Eq(factor_obj.args[1], -factor_obj.args[0]))
                 sub_solutions_list.append(sub_sol_set)
-                final_solution_set = final_solution_set.union(sub_sol_set)
                 continue
 
             f_sub = factor_obj.func
             if not hasattr(f_sub, '__name__') or not f_sub.__name__ in ('sin', 'cos'):
-                sub_sol_set = solveset(sub_eq, self.x, domain=Reals)
+                sub_sol_set = self._solveset(sub_eq)
                 sub_solutions_list.append(sub_sol_set)
-                final_solution_set = final_solution_set.union(sub_sol_set)
                 continue
 
             arg_expr = factor_obj.args[0]
-            rhs = 0
-            special_formula_expr = self.special_case_map.get(f_sub.__name__, {}).get(rhs)
 
-            if special_formula_expr:
-                simple_eq = Eq(arg_expr, special_formula_expr)
-                sub_sol_expr_list = sympy.solve(simple_eq, self.x)
-                if sub_sol_expr_list:
-                    sub_sol_expr = sub_sol_expr_list[0].expand()
-                    sub_sol_set = ImageSet(Lambda(n_int, sub_sol_expr), Integers)
-                else:
-                    sub_sol_set = EmptySet
-            else:
-                sub_sol_set = solveset(sub_eq, self.x, domain=Reals)
+            sub_sol_set = zero_solution_set(f_sub.__name__, arg_expr, self.x)
+            if sub_sol_set is None:
+                sub_sol_set = zero_solution_set_by_solve(f_sub.__name__, arg_expr, self.x)
+            elif self.debug_checks:
+                self._debug_check_equal(sub_sol_set, zero_solution_set_by_solve(f_sub.__name__, arg_expr, self.x),
+                                        "множина розв'язків")
+            if sub_sol_set is None:
+                sub_sol_set = self._solveset(sub_eq)
 
             sub_solutions_list.append(sub_sol_set)
-            final_solution_set = final_solution_set.union(sub_sol_set)
 
         self.variables['sub_solutions'] = sub_solutions_list
-        self.solution_obj = final_solution_set
+        self.solution_obj = union_solution_sets(sub_solutions_list)
 
     def _build_solution_steps(self):
         if self.variables['path_type'] == "3_terms_const":
@@ -244,7 +248,7 @@ class PowerReductionEquation(TrigonometricEquation):
         self.steps.append(("text", f"Маємо рівняння: ${self.get_equation_latex()}$"))
         self.steps.append(("text", "Перенесемо доданки, щоб згрупувати їх:"))
 
-        grouped_eq_latex = rf"{f_name}^2({sympy.latex(a * self.x)}) + {f_name}^2({sympy.latex(b * self.x)}) = {f_name}^2({sympy.latex(c * self.x)}) + {f_name}^2({sympy.latex(d * self.x)})"
+        grouped_eq_latex = rf"{f_name}^2({latex(a * self.x)}) + {f_name}^2({latex(b * self.x)}) = {f_name}^2({latex(c * self.x)}) + {f_name}^2({latex(d * self.x)})"
         self.steps.append(("math", grouped_eq_latex))
 
         formula_reduce = self.formula_map.get(f_name)
@@ -266,15 +270,15 @@ class PowerReductionEquation(TrigonometricEquation):
         formula_cos_plus = self.formula_map.get('cos+cos')
         self.steps.append(("text", rf"Застосуємо формулу суми косинусів до обох частин: ${formula_cos_plus}$"))
 
-        trans_lhs_lat = sympy.latex(self.variables['trans_lhs'])
-        trans_rhs_lat = sympy.latex(self.variables['trans_rhs'])
+        trans_lhs_lat = latex(self.variables['trans_lhs'])
+        trans_rhs_lat = latex(self.variables['trans_rhs'])
         self.steps.append(("math", rf"{trans_lhs_lat} = {trans_rhs_lat}"))
 
         self.steps.append(("text", "Перенесемо всі доданки вліво:"))
         self.steps.append(("math", rf"{trans_lhs_lat} - {trans_rhs_lat} = 0"))
 
-        common_factor_lat = sympy.latex(self.variables['common_factor'])
-        other_group_lat = sympy.latex(self.variables['other_group_expr'])
+        common_factor_lat = latex(self.variables['common_factor'])
+        other_group_lat = latex(self.variables['other_group_expr'])
 
         self.steps.append(("text", rf"Винесемо спільний множник ${common_factor_lat}$ за дужки:"))
         self.steps.append(("math", rf"{common_factor_lat} \cdot \left( {other_group_lat} \right) = 0"))
@@ -284,7 +288,7 @@ class PowerReductionEquation(TrigonometricEquation):
             ("text", rf"Тепер застосуємо формулу різниці косинусів до виразу в дужках: ${formula_cos_minus}$"))
 
         final_factors_expr = self.variables['common_factor'] * self.variables['final_factors_expr']
-        full_final_lat = sympy.latex(sympy.simplify(final_factors_expr)) + " = 0"
+        full_final_lat = latex(final_factors_expr) + " = 0"
         self.steps.append(("math", full_final_lat))
 
         self._build_steps_solve_factors()
@@ -310,24 +314,24 @@ class PowerReductionEquation(TrigonometricEquation):
             step2_lhs = rf"\frac{{1 + {t1_lat}}}{{2}} + \frac{{1 + {t2_lat}}}{{2}} + \frac{{1 + {t3_lat}}}{{2}}"
             step3 = rf"{t1_lat} + {t2_lat} + {t3_lat} = 0"
 
-        self.steps.append(("math", rf"{step2_lhs} = {sympy.latex(const)}"))
+        self.steps.append(("math", rf"{step2_lhs} = {latex(const)}"))
         self.steps.append(("text", "Домножимо на 2 та спростимо:"))
         self.steps.append(("math", step3))
 
         g1, g2, g3 = self.variables['grouped_kernel_terms']
-        grouped_lat = rf"\left( {sympy.latex(g1)} + {sympy.latex(g2)} \right) + {sympy.latex(g3)} = 0"
+        grouped_lat = rf"\left( {latex(g1)} + {latex(g2)} \right) + {latex(g3)} = 0"
         self.steps.append(("text", rf"Згрупуємо доданки:"))
         self.steps.append(("math", grouped_lat))
 
         formula_cos_plus = self.formula_map.get('cos+cos')
         self.steps.append(("text", rf"Використовуємо формулу: ${formula_cos_plus}$"))
 
-        group1_trans_lat = sympy.latex(self.variables['group1_trans'])
-        group2_term_lat = sympy.latex(self.variables['group2_term'])
+        group1_trans_lat = latex(self.variables['group1_trans'])
+        group2_term_lat = latex(self.variables['group2_term'])
         self.steps.append(("math", rf"{group1_trans_lat} + {group2_term_lat} = 0"))
 
-        common_factor_lat = sympy.latex(self.variables['common_factor'])
-        other_group_lat = sympy.latex(self.variables['other_group_expr'])
+        common_factor_lat = latex(self.variables['common_factor'])
+        other_group_lat = latex(self.variables['other_group_expr'])
 
         self.steps.append(("text", rf"Винесемо спільний множник ${common_factor_lat}$ за дужки:"))
         self.steps.append(("math", rf"{common_factor_lat} \cdot \left( {other_group_lat} \right) = 0"))
@@ -337,7 +341,7 @@ class PowerReductionEquation(TrigonometricEquation):
     def _build_steps_solve_factors(self):
         sub_sols = self.variables['sub_solutions']
         factor_index = 0
-        n_latex = symbols('n')
+        n_latex = N
 
         self.steps.append(("text", "Добуток дорівнює нулю, коли хоча б один із множників дорівнює нулю."))
 
@@ -348,15 +352,15 @@ class PowerReductionEquation(TrigonometricEquation):
 
             if factor_obj.func == Add:
                 self.steps.append(("text", f"Розв'язуємо {factor_index + 1}-й множник:"))
-                self.steps.append(("math", sympy.latex(sub_eq)))
+                self.steps.append(("math", latex(sub_eq)))
 
                 if factor_index < len(sub_sols):
                     sub_sol_set = sub_sols[factor_index]
-                    sub_sol_latex = sympy.latex(sub_sol_set)
+                    sub_sol_latex = latex(sub_sol_set)
 
                     if "arccos" in sub_sol_latex or "arcsin" in sub_sol_latex:
                         t_eq = Eq(factor_obj.args[1], -factor_obj.args[0])
-                        sub_sol_latex = sympy.latex(solveset(t_eq, self.x, domain=Reals))
+                        sub_sol_latex = latex(self._solveset(t_eq))
 
                     self.steps.append(("text", "Отримуємо розв'язок:"))
                     self.steps.append(("math", rf"x \in {sub_sol_latex}"))
@@ -373,18 +377,18 @@ class PowerReductionEquation(TrigonometricEquation):
             special_formula_expr = self.special_case_map.get(f_sub.__name__, {}).get(rhs)
 
             self.steps.append(("text", f"Розв'язуємо {factor_index + 1}-й множник:"))
-            self.steps.append(("math", sympy.latex(sub_eq)))
+            self.steps.append(("math", latex(sub_eq)))
 
             is_simple_arg = (arg_expr == self.x)
 
             if not is_simple_arg:
-                if special_formula_expr:
-                    formula_latex = sympy.latex(special_formula_expr.subs(symbols('n', integer=True), n_latex))
-                    formula_str = rf"{sympy.latex(arg_expr)} = {formula_latex}, n \in \mathbb{{Z}}"
+                if special_formula_expr is not None:
+                    formula_latex = latex(special_formula_expr.subs(N_INT, n_latex))
+                    formula_str = rf"{latex(arg_expr)} = {formula_latex}, n \in \mathbb{{Z}}"
                     self.steps.append(("math", formula_str))
 
             sub_sol_set = sub_sols[factor_index]
-            sub_sol_latex = sympy.latex(sub_sol_set)
+            sub_sol_latex = latex(sub_sol_set)
 
             if not is_simple_arg:
                 self.steps.append(("text", "Виражаємо $x$:"))
@@ -393,7 +397,7 @@ class PowerReductionEquation(TrigonometricEquation):
 
             factor_index += 1
 
-        final_sol_latex = sympy.latex(self.solution_obj)
+        final_sol_latex = latex(self.solution_obj)
         self.steps.append(("text", "Об'єднуючи всі розв'язки, отримуємо кінцеву відповідь:"))
 
         self.steps.append(("math", rf"x \in {final_sol_latex}"))
@@ -1,8 +1,21 @@
-import random
 import sympy
-from sympy import sin, cos, Eq, solveset, Reals, symbols, Rational, pi, Mul, Add, expand, Union, sqrt
+from sympy import sin, cos, Eq, Rational, pi, Mul, Add, expand
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import union_solution_sets
+from ..surd import Surd, denominators_lcm
+from ..trig_tables import T
+
+
+_NICE_ROOTS = [
+    Surd(0),
+    Surd(1), Surd(-1),
+    Surd.sqrt(3), -Surd.sqrt(3),
+    Surd.sqrt(3) / 3, -Surd.sqrt(3) / 3
+]
+
 
 class ReducibleToHomogeneousEquation(TrigonometricEquation):
 
@@ -11,7 +24,7 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
             if val == 1: return ""
             if val == -1: return "-"
 
-            lat = sympy.latex(abs(val))
+            lat = latex(abs(val))
             if getattr(val, 'is_Add', False):
                 return f"({lat})"
             return lat
@@ -26,9 +39,9 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
                 terms.append(f"-{var_name}^2")
             else:
                 if A > 0:
-                    terms.append(f"{sympy.latex(A)} {var_name}^2")
+                    terms.append(f"{latex(A)} {var_name}^2")
                 else:
-                    terms.append(f"-{sympy.latex(abs(A))} {var_name}^2")
+                    terms.append(f"-{latex(abs(A))} {var_name}^2")
 
         if B != 0:
             sign = "+" if B > 0 else "-"
@@ -40,7 +53,7 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
 
         if C != 0:
             sign = "+" if C > 0 else "-"
-            val_latex = sympy.latex(abs(C))
+            val_latex = latex(abs(C))
             if getattr(C, 'is_Add', False):
                 val_latex = f"({val_latex})"
             terms.append(f"{sign} {val_latex}")
@@ -60,7 +73,7 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
             elif A == -1:
                 term = "-\\sin^2 x"
             else:
-                coeff = sympy.latex(A)
+                coeff = latex(A)
                 if getattr(A, 'is_Add', False):
                     coeff = f"({coeff})"
                 term = f"{coeff}\\sin^2 x"
@@ -74,7 +87,7 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
             if val == 1:
                 term = f"{sign} \\sin x \\cos x"
             else:
-                coeff = sympy.latex(val)
+                coeff = latex(val)
                 if getattr(val, 'is_Add', False):
                     coeff = f"({coeff})"
                 term = f"{sign} {coeff}\\sin x \\cos x"
@@ -86,7 +99,7 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
             if val == 1:
                 term = f"{sign} \\cos^2 x"
             else:
-                coeff = sympy.latex(val)
+                coeff = latex(val)
                 if getattr(val, 'is_Add', False):
                     coeff = f"({coeff})"
                 term = f"{sign} {coeff}\\cos^2 x"
@@ -98,68 +111,63 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
 
         return homo_str + " = 0"
 
+    # Ядро A t^2 + B t + C з усіма ненульовими коефіцієнтами: t1 + t2 != 0 і жоден корінь не 0.
+    parameters = ParameterSpace('reducible_to_homogeneous', [
+        ('t1', _NICE_ROOTS),
+        ('t2', _NICE_ROOTS),
+        ('A_kern', [1, 2, -1, -2]),
+        ('D', [1, -1, 2, -2, 3]),
+    ], constraints=[
+        lambda p: p['t1'] + p['t2'] != 0,
+        lambda p: p['t1'] * p['t2'] != 0,
+    ])
+
     def _generate(self):
-        while True:
-            nice_roots = [
-                0,
-                1, -1,
-                sqrt(3), -sqrt(3),
-                sqrt(3) / 3, -sqrt(3) / 3
-            ]
-
-            t1 = random.choice(nice_roots)
-            t2 = random.choice(nice_roots)
-
-            A_kern = random.choice([1, 2, -1, -2])
-            B_kern = -A_kern * (t1 + t2)
-            C_kern = A_kern * (t1 * t2)
-
-            coeffs_list = [A_kern, B_kern, C_kern]
-            denoms = [c.q for c in coeffs_list if hasattr(c, 'q')]
-            if denoms:
-                lcm = sympy.lcm(denoms)
-                A_kern = A_kern * lcm
-                B_kern = B_kern * lcm
-                C_kern = C_kern * lcm
-
-            if hasattr(A_kern, 'is_Integer') and A_kern.is_Integer: A_kern = int(A_kern)
-            if hasattr(B_kern, 'is_Integer') and B_kern.is_Integer: B_kern = int(B_kern)
-            if hasattr(C_kern, 'is_Integer') and C_kern.is_Integer: C_kern = int(C_kern)
-
-            D = random.choice([1, -1, 2, -2, 3])
-
-            A_final = A_kern
-            C_final = C_kern
-
-            if A_final == 0 or B_kern == 0 or C_final == 0:
-                continue
-
-            A_orig = A_final + D
-            C_orig = C_final + D
-            B_orig = B_kern
-
-            self.equation_obj = Eq(
-                A_orig * sin(self.x) ** 2 +
-                B_orig * sin(self.x) * cos(self.x) +
-                C_orig * cos(self.x) ** 2,
-                D
-            )
-
-            self.variables = {
-                'A_orig': A_orig, 'B_orig': B_orig, 'C_orig': C_orig, 'D': D,
-                'A_final': A_final, 'B_final': B_kern, 'C_final': C_final,
-                't1': t1, 't2': t2
-            }
-            break
+        p = self.parameters.sample()
+        t1, t2, A_kern, D = p['t1'], p['t2'], p['A_kern'], p['D']
+
+        B_kern = -A_kern * (t1 + t2)
+        C_kern = A_kern * (t1 * t2)
+
+        lcm = denominators_lcm([A_kern, B_kern, C_kern])
+        A_kern = Surd(A_kern * lcm).to_sympy()
+        B_kern = (B_kern * lcm).to_sympy()
+        C_kern = (C_kern * lcm).to_sympy()
+        t1, t2 = t1.to_sympy(), t2.to_sympy()
+
+        if hasattr(A_kern, 'is_Integer') and A_kern.is_Integer: A_kern = int(A_kern)
+        if hasattr(B_kern, 'is_Integer') and B_kern.is_Integer: B_kern = int(B_kern)
+        if hasattr(C_kern, 'is_Integer') and C_kern.is_Integer: C_kern = int(C_kern)
+
+        A_final = A_kern
+        C_final = C_kern
+
+        A_orig = A_final + D
+        C_orig = C_final + D
+        B_orig = B_kern
+
+        self.equation_obj = Eq(
+            A_orig * sin(self.x) ** 2 +
+            B_orig * sin(self.x) * cos(self.x) +
+            C_orig * cos(self.x) ** 2,
+            D
+        )
+
+        self.variables = {
+            'A_orig': A_orig, 'B_orig': B_orig, 'C_orig': C_orig, 'D': D,
+            'A_final': A_final, 'B_final': B_kern, 'C_final': C_final,
+            't1': t1, 't2': t2
+        }
 
     def _solve(self):
         t1 = self.variables['t1']
         t2 = self.variables['t2']
 
-        sol1 = solveset(Eq(sympy.tan(self.x), t1), self.x, domain=Reals)
-        sol2 = solveset(Eq(sympy.tan(self.x), t2), self.x, domain=Reals)
+        sol1 = self._solveset(Eq(sympy.tan(self.x), t1))
+        sol2 = self._solveset(Eq(sympy.tan(self.x), t2))
 
-        self.solution_obj = Union(sol1, sol2)
+        self.variables['sub_solutions'] = [sol1, sol2]
+        self.solution_obj = union_solution_sets([sol1, sol2])
 
     def _build_solution_steps(self):
         A_orig = self.variables['A_orig']
@@ -172,20 +180,20 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
         t1 = self.variables['t1']
         t2 = self.variables['t2']
 
-        t = symbols('t')
+        t = T
 
         self.steps.append(("text", f"Маємо рівняння: ${self.get_equation_latex()}$"))
 
         self.steps.append(("text",
-                           f"Це рівняння, що зводиться до однорідного, оскільки права частина є константою $D={sympy.latex(D)}$."))
+                           f"Це рівняння, що зводиться до однорідного, оскільки права частина є константою $D={latex(D)}$."))
 
         self.steps.append(
-            ("text", rf"Помножимо константу $D={sympy.latex(D)}$ на тригонометричну одиницю $\sin^2 x + \cos^2 x$:"))
-        self.steps.append(("math", rf"{sympy.latex(D)} = {sympy.latex(D)}(\sin^2 x + \cos^2 x)"))
+            ("text", rf"Помножимо константу $D={latex(D)}$ на тригонометричну одиницю $\sin^2 x + \cos^2 x$:"))
+        self.steps.append(("math", rf"{latex(D)} = {latex(D)}(\sin^2 x + \cos^2 x)"))
 
-        original_LHS_latex = sympy.latex(self.equation_obj.lhs)
+        original_LHS_latex = latex(self.equation_obj.lhs)
 
-        D_latex = sympy.latex(D)
+        D_latex = latex(D)
         if getattr(D, 'is_Add', False):
             D_latex = f"({D_latex})"
         D_sub_latex = f"{D_latex} (\\sin^2 x + \\cos^2 x)"
@@ -206,20 +214,22 @@ class ReducibleToHomogeneousEquation(TrigonometricEquation):
         self.steps.append(("math", t_eq_latex))
 
         self.steps.append(("text", "Розв'язуємо квадратне рівняння:"))
-        roots_latex = f"t_1 = {sympy.latex(t1)}"
+        roots_latex = f"t_1 = {latex(t1)}"
         if t2 != t1:
-            roots_latex += rf", \quad t_2 = {sympy.latex(t2)}"
+            roots_latex += rf", \quad t_2 = {latex(t2)}"
         self.steps.append(("math", roots_latex))
 
         self.steps.append(("text", rf"Повертаємось до заміни $\text{{tg}}(x) = t$:"))
 
-        sol1_latex = sympy.latex(solveset(Eq(sympy.tan(self.x), t1), self.x, domain=Reals))
-        self.steps.append(("math", rf"1) \text{{tg}}(x) = {sympy.latex(t1)} \implies x = {sol1_latex}"))
+        sol1, sol2 = self.variables['sub_solutions']
+
+        sol1_latex = latex(sol1)
+        self.steps.append(("math", rf"1) \text{{tg}}(x) = {latex(t1)} \implies x = {sol1_latex}"))
 
         if t2 != t1:
-            sol2_latex = sympy.latex(solveset(Eq(sympy.tan(self.x), t2), self.x, domain=Reals))
-            self.steps.append(("math", rf"2) \text{{tg}}(x) = {sympy.latex(t2)} \implies x = {sol2_latex}"))
+            sol2_latex = latex(sol2)
+            self.steps.append(("math", rf"2) \text{{tg}}(x) = {latex(t2)} \implies x = {sol2_latex}"))
 
-        final_sol_latex = sympy.latex(self.solution_obj)
+        final_sol_latex = latex(self.solution_obj)
         self.steps.append(("text", "Об'єднуючи розв'язки, отримуємо кінцеву відповідь:"))
         self.steps.append(("math", f"x = {final_sol_latex}"))
\ No newline at end of file
@@ -1,83 +1,34 @@
-import random
 import sympy
-from sympy import sin, cos, tan, cot, pi, Eq, solveset, Reals, oo, zoo, nan, symbols, Rational, EmptySet, sqrt, \
+from sympy import sin, cos, tan, cot, pi, Eq, EmptySet, sqrt, \
     ImageSet, Lambda, Integers
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import union_solution_sets
+from ..trig_tables import GENERAL_FORMULAS, SPECIAL_CASE_FORMULAS, TABULAR_VALUES, N_INT, T
 
 
 class SimplestEquation(TrigonometricEquation):
 
-    def __init__(self):
-        self.general_formula_map = {
-            'sin': r't = (-1)^n \arcsin(val) + \pi n, n \in \mathbb{Z}',
-            'cos': r't = \pm \arccos(val) + 2\pi n, n \in \mathbb{Z}',
-            'tan': r't = \arctan(val) + \pi n, n \in \mathbb{Z}',
-            'cot': r't = \text{arcctg}(val) + \pi n, n \in \mathbb{Z}'
-        }
-
-        n = symbols('n', integer=True)
-        self.special_case_map = {
-            'sin': {
-                0: (pi * n, r't = \pi n, n \in \mathbb{Z}'),
-                1: (pi / 2 + 2 * pi * n, r't = \frac{\pi}{2} + 2\pi n, n \in \mathbb{Z}'),
-                -1: (-pi / 2 + 2 * pi * n, r't = -\frac{\pi}{2} + 2\pi n, n \in \mathbb{Z}')
-            },
-            'cos': {
-                0: (pi / 2 + pi * n, r't = \frac{\pi}{2} + \pi n, n \in \mathbb{Z}'),
-                1: (2 * pi * n, r't = 2\pi n, n \in \mathbb{Z}'),
-                -1: (pi + 2 * pi * n, r't = \pi + 2\pi n, n \in \mathbb{Z}')
-            }
-        }
-
-        super().__init__()
+    general_formula_map = GENERAL_FORMULAS
+    special_case_map = SPECIAL_CASE_FORMULAS
+
+    # Табличні значення скінченні, тож рівняння завжди визначене і обмежень не потрібно.
+    parameters = ParameterSpace('simplest', [
+        ('f', [sin, cos, tan, cot]),
+        ('k', [1, 1, 2, 3]),
+        ('b', [0, 0, pi / 6, pi / 4, pi / 3]),
+        ('A', [1, 1, 2, -1]),
+        ('a_rhs', lambda p: TABULAR_VALUES[p['f'].__name__]),
+    ])
 
     def _generate(self):
-        sqrt2, sqrt3 = sympy.sqrt(2), sympy.sqrt(3)
-
-        tabular_rhs_map = {
-            'sin': [
-                0, 1, -1,
-                Rational(1, 2), Rational(-1, 2),
-                sqrt2 / 2, -sqrt2 / 2,
-                sqrt3 / 2, -sqrt3 / 2
-            ],
-            'cos': [
-                0, 1, -1,
-                Rational(1, 2), Rational(-1, 2),
-                sqrt2 / 2, -sqrt2 / 2,
-                sqrt3 / 2, -sqrt3 / 2
-            ],
-            'tan': [
-                0, 1, -1,
-                sqrt3 / 3, -sqrt3 / 3,
-                sqrt3, -sqrt3
-            ],
-            'cot': [
-                0, 1, -1,
-                sqrt3 / 3, -sqrt3 / 3,
-                sqrt3, -sqrt3
-            ]
-        }
-
-        while True:
-            f = random.choice([sin, cos, tan, cot])
-            f_name = f.__name__
-
-            k = random.choice([1, 1, 2, 3])
-            b = random.choice([0, 0, pi / 6, pi / 4, pi / 3])
-            A = random.choice([1, 1, 2, -1])
-
-            a_rhs = random.choice(tabular_rhs_map[f_name])
-            a_simplified = A * a_rhs
-
-            self.variables = {'A': A, 'k': k, 'b': b, 'a_rhs': a_rhs, 'f': f}
-            self.equation_obj = Eq(A * f(k * self.x + b), a_simplified)
-
-            if self.equation_obj.has(oo, zoo, nan):
-                continue
-
-            break
+        p = self.parameters.sample()
+        A, k, b, a_rhs, f = p['A'], p['k'], p['b'], p['a_rhs'], p['f']
+
+        self.variables = {'A': A, 'k': k, 'b': b, 'a_rhs': a_rhs, 'f': f}
+        self.equation_obj = Eq(A * f(k * self.x + b), A * a_rhs)
 
     def _solve(self):
         A = self.variables['A']
@@ -86,7 +37,7 @@ class SimplestEquation(TrigonometricEquation):
         a_rhs = self.variables['a_rhs']
         f = self.variables['f']
         f_name = f.__name__
-        n = symbols('n', integer=True)
+        n = N_INT
 
         if (f_name == 'sin' or f_name == 'cos') and (a_rhs > 1 or a_rhs < -1):
             self.solution_obj = EmptySet
@@ -99,9 +50,12 @@ class SimplestEquation(TrigonometricEquation):
             formula_expr, formula_latex = special_case_data
             simple_eq = Eq(arg_expr, formula_expr)
             sub_sol_expr = sympy.solve(simple_eq, self.x)[0].expand()
-            self.solution_obj = ImageSet(Lambda(n, sub_sol_expr), Integers)
+            self.solution_obj = union_solution_sets([ImageSet(Lambda(n, sub_sol_expr), Integers)])
         else:
-            self.solution_obj = solveset(self.equation_obj, self.x, domain=Reals)
+            self.solution_obj = union_solution_sets([self._solveset(self.equation_obj)])
+            if not (k == 1 and b == 0):
+                # Розв'язок для заміни t, який показують кроки.
+                self._solveset(Eq(f(T), a_rhs), T)
 
     def _build_solution_steps(self):
         if self.equation_obj is None:
@@ -113,19 +67,19 @@ class SimplestEquation(TrigonometricEquation):
         a_rhs = self.variables['a_rhs']
         f = self.variables['f']
         f_name = f.__name__
-        t = symbols('t')
-        n = symbols('n', integer=True)
+        t = T
+        n = N_INT
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         simple_eq_obj = Eq(f(k * self.x + b), a_rhs)
         if A != 1:
-            self.steps.append(("text", f"Розділимо обидві частини на ${A}:"))
-            self.steps.append(("math", sympy.latex(simple_eq_obj)))
+            self.steps.append(("text", f"Розділимо обидві частини на ${A}$:"))
+            self.steps.append(("math", latex(simple_eq_obj)))
 
         if (f_name == 'sin' or f_name == 'cos') and (a_rhs > 1 or a_rhs < -1):
             self.steps.append(("text",
-                               rf"Оскільки ${sympy.latex(a_rhs)}$ не належить області значень $\left[-1, 1\right]$ для функції ${f_name}$,"))
+                               rf"Оскільки ${latex(a_rhs)}$ не належить області значень $\left[-1, 1\right]$ для функції ${f_name}$,"))
             self.steps.append(("text", "рівняння не має дійсних розв'язків."))
             return
 
@@ -136,12 +90,12 @@ class SimplestEquation(TrigonometricEquation):
             formula_variable = "x"
         else:
             arg_expr = k * self.x + b
-            arg_expr_latex = sympy.latex(arg_expr)
+            arg_expr_latex = latex(arg_expr)
             t_equation = Eq(f(t), a_rhs)
             formula_variable = "t"
             self.steps.append(
                 ("text", rf"Це найпростіше тригонометричне рівняння. Введемо заміну $t = {arg_expr_latex}$:"))
-            self.steps.append(("math", sympy.latex(t_equation)))
+            self.steps.append(("math", latex(t_equation)))
 
         special_case_data = self.special_case_map.get(f_name, {}).get(a_rhs)
 
@@ -152,7 +106,7 @@ class SimplestEquation(TrigonometricEquation):
             self.steps.append(("math", formula_str))
         else:
             self.steps.append(("text", rf"Застосуємо загальну формулу розв'язку для ${f_name}$:"))
-            val_latex = sympy.latex(a_rhs)
+            val_latex = latex(a_rhs)
             raw_formula = self.general_formula_map[f_name]
             formula_with_val = raw_formula.replace('val', val_latex)
             final_formula = formula_with_val.replace('t', formula_variable)
@@ -163,14 +117,14 @@ class SimplestEquation(TrigonometricEquation):
                 formula_expr, _ = special_case_data
                 t_solution = formula_expr
             else:
-                t_solution = solveset(Eq(f(t), a_rhs), t, domain=Reals)
+                t_solution = self._solveset(Eq(f(t), a_rhs), t)
 
             self.steps.append(("text", f"Підставляємо наше значення та розв'язуємо для $t$:"))
-            self.steps.append(("math", f"t = {sympy.latex(t_solution)}"))
+            self.steps.append(("math", f"t = {latex(t_solution)}"))
             self.steps.append(("text", f"Повертаємось до заміни $t = {arg_expr_latex}$:"))
-            self.steps.append(("math", f"{arg_expr_latex} = {sympy.latex(t_solution)}"))
+            self.steps.append(("math", f"{arg_expr_latex} = {latex(t_solution)}"))
             self.steps.append(("text", f"Виражаємо $x$ та отримуємо кінцеву відповідь:"))
         else:
             self.steps.append(("text", "Обчислюємо та отримуємо кінцеву відповідь:"))
 
-        self.steps.append(("math", f"x = {sympy.latex(self.solution_obj)}"))
\ No newline at end of file
+        self.steps.append(("math", f"x = {latex(self.solution_obj)}"))
\ No newline at end of file
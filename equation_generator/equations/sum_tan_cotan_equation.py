@@ -1,8 +1,16 @@
-import random
 import sympy
-from sympy import sin, cos, tan, cot, Eq, solveset, Reals, symbols, Rational, sqrt, Union, S
+from sympy import sin, cos, tan, cot, Eq, Rational
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import union_solution_sets
+from ..surd import Surd, denominators_lcm
+from ..trig_tables import T, Y
+
+
+_VALID_ROOTS = [Surd(2), Surd(-2), 4 / Surd.sqrt(3), -4 / Surd.sqrt(3)]
+_DUMMY_ROOTS = [Surd(0), Surd(1), Surd(-1)]
 
 
 class SumTanCotanEquation(TrigonometricEquation):
@@ -11,7 +19,7 @@ class SumTanCotanEquation(TrigonometricEquation):
         def fmt_coeff(val):
             if val == 1: return ""
             if val == -1: return "-"
-            lat = sympy.latex(abs(val))
+            lat = latex(abs(val))
             if getattr(val, 'is_Add', False): return f"({lat})"
             return lat
 
@@ -24,9 +32,9 @@ class SumTanCotanEquation(TrigonometricEquation):
                 terms.append(f"-{var_name}^2")
             else:
                 if A > 0:
-                    terms.append(f"{sympy.latex(A)} {var_name}^2")
+                    terms.append(f"{latex(A)} {var_name}^2")
                 else:
-                    terms.append(f"-{sympy.latex(abs(A))} {var_name}^2")
+                    terms.append(f"-{latex(abs(A))} {var_name}^2")
 
         if B != 0:
             sign = "+" if B > 0 else "-"
@@ -38,84 +46,72 @@ class SumTanCotanEquation(TrigonometricEquation):
 
         if C != 0:
             sign = "+" if C > 0 else "-"
-            terms.append(f"{sign} {sympy.latex(abs(C))}")
+            terms.append(f"{sign} {latex(abs(C))}")
 
         if not terms: return "0 = 0"
         latex_str = " ".join(terms)
         if not latex_str.startswith('-'): latex_str = latex_str.lstrip('+ ')
         return latex_str + " = 0"
 
+    # Половина рівнянь має обидва корені |t| >= 2, решта -- один "порожній" корінь (|t| < 2).
+    # A = 1 після нормування, тож A_eq != 0 завжди.
+    parameters = ParameterSpace('sum_tan_cotan', [
+        ('roots_kind', ['valid', 'dummy']),
+        ('t1', _VALID_ROOTS),
+        ('t2', lambda p: _VALID_ROOTS if p['roots_kind'] == 'valid' else _DUMMY_ROOTS),
+    ])
+
     def _generate(self):
-        while True:
-            valid_roots = [2, -2, 4 / sqrt(3), -4 / sqrt(3)]
+        p = self.parameters.sample()
+        t1, t2 = p['t1'], p['t2']
 
-            dummy_roots = [0, 1, -1]
+        A_sq = Surd(1)
+        B_sq = -(t1 + t2)
+        C_sq = t1 * t2
 
-            if random.random() < 0.5:
-                t1 = random.choice(valid_roots)
-                t2 = random.choice(valid_roots)
-            else:
-                t1 = random.choice(valid_roots)
-                t2 = random.choice(dummy_roots)
-
-            A_sq = 1
-            B_sq = -(t1 + t2)
-            C_sq = t1 * t2
-
-            coeffs = [A_sq, B_sq, C_sq]
-            exprs = [A_sq, B_sq, C_sq]
-            mult = S(1)
-            for e in exprs:
-                e = sympy.simplify(e)
-                if e.has(sqrt(3)):
-                    numer, denom = e.as_numer_denom()
-                    if denom.has(sqrt(3)):
-                        mult = sympy.lcm(mult, denom)
-                if hasattr(e, 'q'):
-                    mult = sympy.lcm(mult, e.q)
-
-            A_sq = sympy.simplify(A_sq * mult)
-            B_sq = sympy.simplify(B_sq * mult)
-            C_sq = sympy.simplify(C_sq * mult)
-
-            A_eq = A_sq
-            B_eq = B_sq
-            C_eq = C_sq + 2 * A_sq
-
-            if A_eq == 0: continue
-
-            self.equation_obj = Eq(
-                A_eq * (tan(self.x) ** 2 + cot(self.x) ** 2) +
-                B_eq * (tan(self.x) + cot(self.x)) +
-                C_eq, 0
-            )
-
-            self.variables = {
-                'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq,
-                'A_sq': A_sq, 'B_sq': B_sq, 'C_sq': C_sq,
-                't1': t1, 't2': t2
-            }
-            break
+        # Корені на кшталт 4/sqrt(3) уже раціоналізовані, тож нормуємо лише раціональні коефіцієнти.
+        mult = denominators_lcm([A_sq, B_sq, C_sq])
+
+        A_sq = (A_sq * mult).to_sympy()
+        B_sq = (B_sq * mult).to_sympy()
+        C_sq = (C_sq * mult).to_sympy()
+        t1, t2 = t1.to_sympy(), t2.to_sympy()
+
+        A_eq = A_sq
+        B_eq = B_sq
+        C_eq = C_sq + 2 * A_sq
+
+        self.equation_obj = Eq(
+            A_eq * (tan(self.x) ** 2 + cot(self.x) ** 2) +
+            B_eq * (tan(self.x) + cot(self.x)) +
+            C_eq, 0
+        )
+
+        self.variables = {
+            'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq,
+            'A_sq': A_sq, 'B_sq': B_sq, 'C_sq': C_sq,
+            't1': t1, 't2': t2
+        }
 
     def _solve(self):
         t1 = self.variables['t1']
         t2 = self.variables['t2']
 
-        final_solution = sympy.EmptySet
+        sub_solutions = []
 
-        for t_val in [t1, t2]:
+        t_roots = self._solve_quadratic(self.variables['A_sq'], self.variables['B_sq'], self.variables['C_sq'],
+                                        known_roots=(t1, t2))
+        for t_val in t_roots:
             if abs(t_val) < 2:
                 continue
 
-            y = symbols('y')
-            quad_y = y ** 2 - t_val * y + 1
-            y_roots = sympy.solve(quad_y, y)
+            y_roots = self._solve_quadratic(1, -t_val, 1, Y)
 
             for root in y_roots:
-                sol = solveset(Eq(tan(self.x), root), self.x, domain=Reals)
-                final_solution = Union(final_solution, sol)
+                sol = self._solveset(Eq(tan(self.x), root))
+                sub_solutions.append(sol)
 
-        self.solution_obj = final_solution
+        self.solution_obj = union_solution_sets(sub_solutions)
 
     def _build_solution_steps(self):
         A_eq = self.variables['A_eq']
@@ -127,9 +123,9 @@ class SumTanCotanEquation(TrigonometricEquation):
         t1 = self.variables['t1']
         t2 = self.variables['t2']
 
-        t = symbols('t')
+        t = T
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         if B_eq != 0:
             self.steps.append(("text", r"Згрупуємо члени рівняння:"))
@@ -140,15 +136,15 @@ class SumTanCotanEquation(TrigonometricEquation):
             elif A_eq == -1:
                 grouped_latex += r"-(\text{tg}^2 x + \text{ctg}^2 x)"
             else:
-                grouped_latex += rf"{sympy.latex(A_eq)}(\text{{tg}}^2 x + \text{{ctg}}^2 x)"
+                grouped_latex += rf"{latex(A_eq)}(\text{{tg}}^2 x + \text{{ctg}}^2 x)"
 
             sign_b = "+" if B_eq > 0 else "-"
-            val_b = "" if abs(B_eq) == 1 else sympy.latex(abs(B_eq))
+            val_b = "" if abs(B_eq) == 1 else latex(abs(B_eq))
             grouped_latex += rf" {sign_b} {val_b}(\text{{tg}} x + \text{{ctg}} x)"
 
             if C_eq != 0:
                 sign_c = "+" if C_eq > 0 else "-"
-                grouped_latex += rf" {sign_c} {sympy.latex(abs(C_eq))}"
+                grouped_latex += rf" {sign_c} {latex(abs(C_eq))}"
 
             grouped_latex += " = 0"
             self.steps.append(("math", grouped_latex))
@@ -169,16 +165,16 @@ class SumTanCotanEquation(TrigonometricEquation):
         elif A_eq == -1:
             sub_eq_latex += "-(t^2 - 2)"
         else:
-            sub_eq_latex += rf"{sympy.latex(A_eq)}(t^2 - 2)"
+            sub_eq_latex += rf"{latex(A_eq)}(t^2 - 2)"
 
         if B_eq != 0:
             sign_b = "+" if B_eq > 0 else "-"
-            val_b = "" if abs(B_eq) == 1 else sympy.latex(abs(B_eq))
+            val_b = "" if abs(B_eq) == 1 else latex(abs(B_eq))
             sub_eq_latex += rf" {sign_b} {val_b}t"
 
         if C_eq != 0:
             sign_c = "+" if C_eq > 0 else "-"
-            sub_eq_latex += rf" {sign_c} {sympy.latex(abs(C_eq))}"
+            sub_eq_latex += rf" {sign_c} {latex(abs(C_eq))}"
 
         sub_eq_latex += " = 0"
         self.steps.append(("math", sub_eq_latex))
@@ -189,9 +185,9 @@ class SumTanCotanEquation(TrigonometricEquation):
 
         self.steps.append(("text", "Знаходимо корені квадратного рівняння:"))
         if t1 == t2:
-            self.steps.append(("math", f"t = {sympy.latex(t1)}"))
+            self.steps.append(("math", f"t = {latex(t1)}"))
         else:
-            self.steps.append(("math", f"t_1 = {sympy.latex(t1)}, \\quad t_2 = {sympy.latex(t2)}"))
+            self.steps.append(("math", f"t_1 = {latex(t1)}, \\quad t_2 = {latex(t2)}"))
 
         self.steps.append(("text",
                            r"Зауважимо, що $|t| = |\text{tg } x + \text{ctg } x| = |\text{tg } x + \frac{1}{\text{tg } x}| \ge 2$ (за нерівністю Коші)."))
@@ -200,12 +196,11 @@ class SumTanCotanEquation(TrigonometricEquation):
 
         final_sets_latex = []
 
-        unique_roots = [t1]
-        if t1 != t2: unique_roots.append(t2)
+        unique_roots = self._solve_quadratic(A_sq, B_sq, C_sq, known_roots=(t1, t2))
 
         for i, root in enumerate(unique_roots, 1):
             prefix = f"{i}) " if len(unique_roots) > 1 else ""
-            root_latex = sympy.latex(root)
+            root_latex = latex(root)
 
             if abs(root) < 2:
                 self.steps.append(("math",
@@ -215,18 +210,17 @@ class SumTanCotanEquation(TrigonometricEquation):
                 self.steps.append(("math",
                                    rf"\text{{tg }} x + \frac{{1}}{{\text{{tg }} x}} = {root_latex} \implies \text{{tg}}^2 x - ({root_latex})\text{{tg }} x + 1 = 0"))
 
-                y = symbols('y')
-                y_roots = sympy.solve(y ** 2 - root * y + 1, y)
+                y_roots = self._solve_quadratic(1, -root, 1, Y)
 
                 for yr in y_roots:
                     angle = sympy.atan(yr)
                     if isinstance(angle, sympy.atan):
-                        angle_latex = rf"\text{{arctg}}({sympy.latex(yr)})"
+                        angle_latex = rf"\text{{arctg}}({latex(yr)})"
                     else:
-                        angle_latex = sympy.latex(angle)
+                        angle_latex = latex(angle)
 
                     sol_line = rf"x = {angle_latex} + \pi n, n \in \mathbb{{Z}}"
-                    self.steps.append(("math", rf"\text{{tg }} x = {sympy.latex(yr)} \implies {sol_line}"))
+                    self.steps.append(("math", rf"\text{{tg }} x = {latex(yr)} \implies {sol_line}"))
 
                     final_sets_latex.append(
                         rf"\left\{{ {angle_latex} + \pi n \; \middle| \; n \in \mathbb{{Z}} \right\}}")
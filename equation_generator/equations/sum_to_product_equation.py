@@ -1,51 +1,34 @@
-import random
 import sympy
-from sympy import sin, cos, tan, cot, pi, Eq, solveset, Reals, symbols, ImageSet, Lambda, Integers, EmptySet
+from sympy import sin, cos, tan, cot, Eq
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import zero_solution_set, zero_solution_set_by_solve, union_solution_sets
+from ..trig_tables import SUM_TO_PRODUCT_FORMULAS, ZERO_CASE_SOLUTIONS, N_INT, N
 
 
 class SumToProductEquation(TrigonometricEquation):
 
-    def __init__(self):
-        self.formula_map = {
-            'sin+sin': r'\sin(\alpha) + \sin(\beta) = 2\sin\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
-            'sin-sin': r'\sin(\alpha) - \sin(\beta) = 2\sin\left(\frac{\alpha-\beta}{2}\right)\cos\left(\frac{\alpha+\beta}{2}\right)',
-            'cos+cos': r'\cos(\alpha) + \cos(\beta) = 2\cos\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
-            'cos-cos': r'\cos(\alpha) - \cos(\beta) = -2\sin\left(\frac{\alpha+\beta}{2}\right)\sin\left(\frac{\alpha-\beta}{2}\right)'
-        }
-
-        n_int = symbols('n', integer=True)
-        self.special_case_map = {
-            'sin': {
-                0: pi * n_int
-            },
-            'cos': {
-                0: pi / 2 + pi * n_int
-            }
-        }
+    formula_map = SUM_TO_PRODUCT_FORMULAS
+    special_case_map = ZERO_CASE_SOLUTIONS
 
-        super().__init__()
+    # Аргументи різні й однакової парності: тоді (alpha +- beta) / 2 цілі. Більший стає alpha.
+    parameters = ParameterSpace('sum_to_product', [
+        ('f', [sin, cos]),
+        ('alpha_arg', range(2, 8)),
+        ('beta_arg', range(1, 6)),
+        ('op', ['+', '-']),
+    ], constraints=[
+        lambda p: p['alpha_arg'] != p['beta_arg'],
+        lambda p: p['alpha_arg'] % 2 == p['beta_arg'] % 2,
+    ])
 
     def _generate(self):
-
-        f = random.choice([sin, cos])
+        p = self.parameters.sample()
+        f, op = p['f'], p['op']
         f_name = f.__name__
-
-        while True:
-            alpha_arg = random.randint(2, 7)
-            beta_arg = random.randint(1, 5)
-
-            if alpha_arg == beta_arg:
-                continue
-
-            if beta_arg > alpha_arg:
-                alpha_arg, beta_arg = beta_arg, alpha_arg
-
-            if (alpha_arg % 2) == (beta_arg % 2):
-                break
-
-        op = random.choice(['+', '-'])
+        alpha_arg, beta_arg = max(p['alpha_arg'], p['beta_arg']), min(p['alpha_arg'], p['beta_arg'])
 
         alpha_expr = alpha_arg * self.x
         beta_expr = beta_arg * self.x
@@ -61,8 +44,8 @@ class SumToProductEquation(TrigonometricEquation):
         else:
             self.equation_obj = Eq(f(alpha_expr) - f(beta_expr), 0)
 
-        alpha_latex = sympy.latex(alpha_expr)
-        beta_latex = sympy.latex(beta_expr)
+        alpha_latex = latex(alpha_expr)
+        beta_latex = latex(beta_expr)
 
         self.variables[
             'pretty_latex'] = rf"{f_name}{{\left({alpha_latex} \right)}} {op} {f_name}{{\left({beta_latex} \right)}} = 0"
@@ -80,7 +63,6 @@ class SumToProductEquation(TrigonometricEquation):
         alpha_expr = self.variables['alpha_arg'] * self.x
         beta_expr = self.variables['beta_arg'] * self.x
         f_name = f.__name__
-        n = symbols('n', integer=True)
 
         if f_name == 'sin' and op == '+':
             lhs = 2 * sin((alpha_expr + beta_expr) / 2) * cos((alpha_expr - beta_expr) / 2)
@@ -91,12 +73,13 @@ class SumToProductEquation(TrigonometricEquation):
         else:  # cos-cos
             lhs = -2 * sin((alpha_expr + beta_expr) / 2) * sin((alpha_expr - beta_expr) / 2)
 
-        simplified_lhs = sympy.simplify(lhs)
-
-        factors = simplified_lhs.as_ordered_factors()
+        # Аргументи однакової парності: (alpha +- beta) / 2 цілі, тож добуток уже остаточний.
+        factors = lhs.as_ordered_factors()
         self.variables['factors'] = factors
 
-        final_solution_set = EmptySet
+        if self.debug_checks:
+            self._debug_check_equal(factors, sympy.simplify(lhs).as_ordered_factors(), "множники")
+
         sub_solutions_list = []
 
         for factor in factors:
@@ -106,22 +89,18 @@ class SumToProductEquation(TrigonometricEquation):
             sub_eq = Eq(factor, 0)
             f_sub = factor.func
             arg_expr = factor.args[0]
-            rhs = 0
 
-            special_formula_expr = self.special_case_map.get(f_sub.__name__, {}).get(rhs)
-
-            if special_formula_expr:
-                simple_eq = Eq(arg_expr, special_formula_expr)
-                sub_sol_expr = sympy.solve(simple_eq, self.x)[0].expand()
-                sub_sol_set = ImageSet(Lambda(n, sub_sol_expr), Integers)
-            else:
-                sub_sol_set = solveset(sub_eq, self.x, domain=Reals)
+            sub_sol_set = zero_solution_set(f_sub.__name__, arg_expr, self.x)
+            if sub_sol_set is None:
+                sub_sol_set = self._solveset(sub_eq)
+            elif self.debug_checks:
+                self._debug_check_equal(sub_sol_set, zero_solution_set_by_solve(f_sub.__name__, arg_expr, self.x),
+                                        "множина розв'язків")
 
             sub_solutions_list.append(sub_sol_set)
-            final_solution_set = final_solution_set.union(sub_sol_set)
 
         self.variables['sub_solutions'] = sub_solutions_list
-        self.solution_obj = final_solution_set
+        self.solution_obj = union_solution_sets(sub_solutions_list)
 
     def _solve(self):
         pass
@@ -131,8 +110,6 @@ class SumToProductEquation(TrigonometricEquation):
 
         f = self.variables['f']
         op = self.variables['op']
-        alpha_str = f"{self.variables['alpha_arg']}*x"
-        beta_str = f"{self.variables['beta_arg']}*x"
 
         f_name = f.__name__
         formula_key = f"{f_name}{op}{f_name}"
@@ -142,22 +119,22 @@ class SumToProductEquation(TrigonometricEquation):
         self.steps.append(("text", "Це рівняння, що розв'язується перетворенням суми (або різниці) у добуток."))
         self.steps.append(("text", rf"Застосуємо формулу: ${formula}$"))
 
-        alpha_expr = sympy.sympify(alpha_str)
-        beta_expr = sympy.sympify(beta_str)
+        alpha_expr = self.variables['alpha_arg'] * self.x
+        beta_expr = self.variables['beta_arg'] * self.x
 
         self.steps.append(
-            ("text", rf"Підставляємо $\alpha = {sympy.latex(alpha_expr)}$ та $\beta = {sympy.latex(beta_expr)}$:"))
+            ("text", rf"Підставляємо $\alpha = {latex(alpha_expr)}$ та $\beta = {latex(beta_expr)}$:"))
 
         factors = self.variables['factors']
         simplified_lhs = 1
         for f_ in factors: simplified_lhs *= f_
 
-        self.steps.append(("math", f"{sympy.latex(simplified_lhs)} = 0"))
+        self.steps.append(("math", f"{latex(simplified_lhs)} = 0"))
         self.steps.append(("text", "Добуток дорівнює нулю, коли хоча б один із множників дорівнює нулю."))
 
         sub_sols = self.variables['sub_solutions']
         factor_index = 0
-        n_latex = symbols('n')
+        n_latex = N
 
         for i, factor in enumerate(factors):
             if factor.is_number:
@@ -173,18 +150,18 @@ class SumToProductEquation(TrigonometricEquation):
             special_formula_expr = self.special_case_map.get(f_sub_name, {}).get(rhs)
 
             self.steps.append(("text", f"Розв'язуємо {factor_index + 1}-й множник:"))
-            self.steps.append(("math", sympy.latex(sub_eq)))
+            self.steps.append(("math", latex(sub_eq)))
 
             is_simple_arg = (arg_expr == self.x)
 
             if not is_simple_arg:
-                if special_formula_expr:
-                    formula_latex = sympy.latex(special_formula_expr.subs(symbols('n', integer=True), n_latex))
-                    formula_str = f"{sympy.latex(arg_expr)} = {formula_latex}, n " + r"\in \mathbb{Z}"
+                if special_formula_expr is not None:
+                    formula_latex = latex(special_formula_expr.subs(N_INT, n_latex))
+                    formula_str = f"{latex(arg_expr)} = {formula_latex}, n " + r"\in \mathbb{Z}"
                     self.steps.append(("math", formula_str))
 
             sub_sol_set = sub_sols[factor_index]
-            sub_sol_latex = sympy.latex(sub_sol_set)
+            sub_sol_latex = latex(sub_sol_set)
 
             if not is_simple_arg:
                 self.steps.append(("text", "Виражаємо $x$:"))
@@ -195,6 +172,6 @@ class SumToProductEquation(TrigonometricEquation):
 
             factor_index += 1
 
-        final_sol_latex = sympy.latex(self.solution_obj)
+        final_sol_latex = latex(self.solution_obj)
         self.steps.append(("text", "Об'єднуючи всі розв'язки, отримуємо кінцеву відповідь:"))
         self.steps.append(("math", f"x = {final_sol_latex}"))
\ No newline at end of file
@@ -1,7 +1,19 @@
-import random
 import sympy
-from sympy import sin, cos, Eq, solveset, Reals, symbols, pi, sqrt, Rational, S, Union
+from sympy import sin, cos, Eq, pi, sqrt, Rational, S, Union
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..solution_sets import sine_solution_set, N_DUMMY, union_solution_sets
+from ..surd import Surd, denominators_lcm
+from ..trig_tables import T
+
+
+_NICE_T_ROOTS = [
+    Surd(0), Surd(1), Surd(-1),
+    Surd.sqrt(2), -Surd.sqrt(2),
+    Surd.sqrt(2) / 2, -Surd.sqrt(2) / 2,
+    1 / Surd.sqrt(2), -1 / Surd.sqrt(2)
+]
 
 
 class SymmetricEquation(TrigonometricEquation):
@@ -10,7 +22,7 @@ class SymmetricEquation(TrigonometricEquation):
         def fmt_coeff(val):
             if val == 1: return ""
             if val == -1: return "-"
-            lat = sympy.latex(abs(val))
+            lat = latex(abs(val))
             if getattr(val, 'is_Add', False):
                 return f"({lat})"
             return lat
@@ -25,9 +37,9 @@ class SymmetricEquation(TrigonometricEquation):
                 terms.append(f"-{var_name}^2")
             else:
                 if A > 0:
-                    terms.append(f"{sympy.latex(A)} {var_name}^2")
+                    terms.append(f"{latex(A)} {var_name}^2")
                 else:
-                    terms.append(f"-{sympy.latex(abs(A))} {var_name}^2")
+                    terms.append(f"-{latex(abs(A))} {var_name}^2")
 
         if B != 0:
             sign = "+" if B > 0 else "-"
@@ -39,7 +51,7 @@ class SymmetricEquation(TrigonometricEquation):
 
         if C != 0:
             sign = "+" if C > 0 else "-"
-            terms.append(f"{sign} {sympy.latex(abs(C))}")
+            terms.append(f"{sign} {latex(abs(C))}")
 
         if not terms:
             return "0 = 0"
@@ -50,80 +62,70 @@ class SymmetricEquation(TrigonometricEquation):
 
         return latex_str + " = 0"
 
+    # a_quad != 0, тож A_eq != 0 в обох варіантах.
+    parameters = ParameterSpace('symmetric', [
+        ('t1', _NICE_T_ROOTS),
+        ('t2', _NICE_T_ROOTS),
+        ('sub_type', ['plus', 'minus']),
+        ('a_quad', [1, -1, 2]),
+    ], constraints=[
+        lambda p: abs(p['t1']) <= Surd.sqrt(2) or abs(p['t2']) <= Surd.sqrt(2),
+    ])
+
     def _generate(self):
-        while True:
-            nice_t_roots = [
-                0, 1, -1,
-                sqrt(2), -sqrt(2),
-                sqrt(2) / 2, -sqrt(2) / 2,
-                1 / sqrt(2), -1 / sqrt(2)
-            ]
-
-            t1 = random.choice(nice_t_roots)
-            t2 = random.choice(nice_t_roots)
-
-            if abs(t1) > sqrt(2) and abs(t2) > sqrt(2):
-                continue
-
-            sub_type = random.choice(['plus', 'minus'])
-
-            a_quad = random.choice([1, -1, 2])
-            b_quad = -a_quad * (t1 + t2)
-            c_quad = a_quad * t1 * t2
-
-            coeffs = [a_quad, b_quad, c_quad]
-            denoms = [c.q for c in coeffs if hasattr(c, 'q')]
-            if denoms:
-                lcm = sympy.lcm(denoms)
-                a_quad *= lcm
-                b_quad *= lcm
-                c_quad *= lcm
-
-            a_quad = sympy.simplify(a_quad)
-            b_quad = sympy.simplify(b_quad)
-            c_quad = sympy.simplify(c_quad)
-
-            if a_quad == 0:
-                continue
-
-            if sub_type == 'plus':
-                A_eq = a_quad
-                B_eq = b_quad
-                C_eq = c_quad + a_quad
-                term_linear = sin(self.x) + cos(self.x)
-            else:
-                A_eq = -a_quad
-                B_eq = b_quad
-                C_eq = c_quad + a_quad
-                term_linear = sin(self.x) - cos(self.x)
+        p = self.parameters.sample()
+        t1, t2, sub_type, a_quad = p['t1'], p['t2'], p['sub_type'], p['a_quad']
+
+        b_quad = -a_quad * (t1 + t2)
+        c_quad = a_quad * t1 * t2
+
+        lcm = denominators_lcm([a_quad, b_quad, c_quad])
+        a_quad = Surd(a_quad * lcm).to_sympy()
+        b_quad = (b_quad * lcm).to_sympy()
+        c_quad = (c_quad * lcm).to_sympy()
+        t1, t2 = t1.to_sympy(), t2.to_sympy()
 
-            if A_eq == 0 and B_eq == 0:
-                continue
+        if sub_type == 'plus':
+            A_eq = a_quad
+            B_eq = b_quad
+            C_eq = c_quad + a_quad
+            term_linear = sin(self.x) + cos(self.x)
+        else:
+            A_eq = -a_quad
+            B_eq = b_quad
+            C_eq = c_quad + a_quad
+            term_linear = sin(self.x) - cos(self.x)
 
-            self.equation_obj = Eq(A_eq * sin(2 * self.x) + B_eq * term_linear + C_eq, 0)
+        self.equation_obj = Eq(A_eq * sin(2 * self.x) + B_eq * term_linear + C_eq, 0)
 
-            self.variables = {
-                'sub_type': sub_type,
-                't1': t1, 't2': t2,
-                'a_quad': a_quad, 'b_quad': b_quad, 'c_quad': c_quad,
-                'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq
-            }
-            break
+        self.variables = {
+            'sub_type': sub_type,
+            't1': t1, 't2': t2,
+            'a_quad': a_quad, 'b_quad': b_quad, 'c_quad': c_quad,
+            'A_eq': A_eq, 'B_eq': B_eq, 'C_eq': C_eq
+        }
 
     def _solve(self):
-        t1 = self.variables['t1']
-        t2 = self.variables['t2']
-        sub_type = self.variables['sub_type']
+        t_roots = self._solve_quadratic(self.variables['a_quad'], self.variables['b_quad'], self.variables['c_quad'],
+                                        known_roots=(self.variables['t1'], self.variables['t2']))
 
-        if sub_type == 'plus':
-            expr = sin(self.x) + cos(self.x)
+        # sin x + cos x = sqrt(2) sin(x + pi/4), sin x - cos x = sqrt(2) sin(x - pi/4).
+        if self.variables['sub_type'] == 'plus':
+            expr, shift = sin(self.x) + cos(self.x), pi / 4
         else:
-            expr = sin(self.x) - cos(self.x)
+            expr, shift = sin(self.x) - cos(self.x), -pi / 4
 
-        sol1 = solveset(Eq(expr, t1), self.x, domain=Reals)
-        sol2 = solveset(Eq(expr, t2), self.x, domain=Reals)
+        sub_solutions = []
+        for t_val in t_roots:
+            sol = sine_solution_set(t_val / sqrt(2), shift, self.x)
+            if sol is None:
+                sol = self._solveset(Eq(expr, t_val))
+            elif self.debug_checks:
+                for family in (sol.args if isinstance(sol, Union) else (sol,) if sol != S.EmptySet else ()):
+                    self._debug_check(expr.subs(self.x, family.lamda.expr.subs(N_DUMMY, 0)), t_val, "серія розв'язків")
+            sub_solutions.append(sol)
 
-        self.solution_obj = Union(sol1, sol2)
+        self.solution_obj = union_solution_sets(sub_solutions)
 
     def _build_solution_steps(self):
         sub_type = self.variables['sub_type']
@@ -133,9 +135,9 @@ class SymmetricEquation(TrigonometricEquation):
         b_quad = self.variables['b_quad']
         c_quad = self.variables['c_quad']
 
-        t = symbols('t')
+        t = T
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         sign_str = "+" if sub_type == 'plus' else "-"
 
@@ -163,17 +165,17 @@ class SymmetricEquation(TrigonometricEquation):
 
         sub_eq_str = ""
         if A_eq != 0:
-            A_lat = sympy.latex(A_eq) if A_eq != 1 and A_eq != -1 else ("-" if A_eq == -1 else "")
+            A_lat = latex(A_eq) if A_eq != 1 and A_eq != -1 else ("-" if A_eq == -1 else "")
             sub_eq_str += f"{A_lat}{term_sin2x}"
 
         if B_eq != 0:
             sign = "+" if (B_eq > 0 and sub_eq_str) else "-"
-            B_val = sympy.latex(abs(B_eq)) if abs(B_eq) != 1 else ""
+            B_val = latex(abs(B_eq)) if abs(B_eq) != 1 else ""
             sub_eq_str += f" {sign} {B_val}t"
 
         if C_eq != 0:
             sign = "+" if (C_eq > 0 and sub_eq_str) else "-"
-            sub_eq_str += f" {sign} {sympy.latex(abs(C_eq))}"
+            sub_eq_str += f" {sign} {latex(abs(C_eq))}"
 
         sub_eq_str += " = 0"
         self.steps.append(("math", sub_eq_str))
@@ -185,18 +187,16 @@ class SymmetricEquation(TrigonometricEquation):
         self.steps.append(("text", "Знаходимо корені:"))
 
         if t1 == t2:
-            self.steps.append(("math", f"t = {sympy.latex(t1)}"))
+            self.steps.append(("math", f"t = {latex(t1)}"))
         else:
-            self.steps.append(("math", f"t_1 = {sympy.latex(t1)}, \\quad t_2 = {sympy.latex(t2)}"))
+            self.steps.append(("math", f"t_1 = {latex(t1)}, \\quad t_2 = {latex(t2)}"))
 
         self.steps.append(("text",
                            rf"Зауважимо, що $|t| = |\sin x {sign_str} \cos x| = |\sqrt{{2}}\sin(x \pm \frac{{\pi}}{{4}})| \le \sqrt{{2}} \approx 1.41$."))
 
         self.steps.append(("text", "Повертаємось до заміни:"))
 
-        unique_roots = [t1]
-        if t1 != t2:
-            unique_roots.append(t2)
+        unique_roots = self._solve_quadratic(a_quad, b_quad, c_quad, known_roots=(t1, t2))
 
         solution_sets_latex = []
 
@@ -205,24 +205,24 @@ class SymmetricEquation(TrigonometricEquation):
 
             if abs(root) > sqrt(2):
                 self.steps.append(("math",
-                                   rf"{prefix}\sin x {sign_str} \cos x = {sympy.latex(root)} \implies \text{{розв'язків немає, бо }} |{sympy.latex(root)}| > \sqrt{{2}}"))
+                                   rf"{prefix}\sin x {sign_str} \cos x = {latex(root)} \implies \text{{розв'язків немає, бо }} |{latex(root)}| > \sqrt{{2}}"))
             else:
                 if len(unique_roots) > 1:
                     self.steps.append(("text", rf"{i}) Розв'язуємо рівняння:"))
                 else:
                     self.steps.append(("text", rf"Розв'язуємо рівняння:"))
 
-                self.steps.append(("math", rf"\sin x {sign_str} \cos x = {sympy.latex(root)}"))
+                self.steps.append(("math", rf"\sin x {sign_str} \cos x = {latex(root)}"))
 
                 self.steps.append(("text", r"Поділимо на $\sqrt{2}$ та зведемо до синуса суми/різниці:"))
                 val_div = root / sqrt(2)
                 sign_pi = "+" if sub_type == "plus" else "-"
 
                 self.steps.append(("math",
-                                   rf"\frac{{1}}{{\sqrt{{2}}}}\sin x {sign_str} \frac{{1}}{{\sqrt{{2}}}}\cos x = \frac{{{sympy.latex(root)}}}{{\sqrt{{2}}}}"))
+                                   rf"\frac{{1}}{{\sqrt{{2}}}}\sin x {sign_str} \frac{{1}}{{\sqrt{{2}}}}\cos x = \frac{{{latex(root)}}}{{\sqrt{{2}}}}"))
                 self.steps.append(("math",
-                                   rf"\sin x \cos\frac{{\pi}}{{4}} {sign_str} \cos x \sin\frac{{\pi}}{{4}} = {sympy.latex(val_div)}"))
-                self.steps.append(("math", rf"\sin(x {sign_pi} \frac{{\pi}}{{4}}) = {sympy.latex(val_div)}"))
+                                   rf"\sin x \cos\frac{{\pi}}{{4}} {sign_str} \cos x \sin\frac{{\pi}}{{4}} = {latex(val_div)}"))
+                self.steps.append(("math", rf"\sin(x {sign_pi} \frac{{\pi}}{{4}}) = {latex(val_div)}"))
 
                 try:
                     angle = sympy.asin(val_div)
@@ -233,12 +233,12 @@ class SymmetricEquation(TrigonometricEquation):
                         is_neg = True
                         angle = -angle
 
-                    angle_latex = sympy.latex(angle)
+                    angle_latex = latex(angle)
 
                     power_n = "n+1" if is_neg else "n"
 
                     self.steps.append(("text",
-                                       rf"Оскільки $\arcsin({sympy.latex(val_div)}) = {('-' if is_neg else '')}{angle_latex}$, маємо:"))
+                                       rf"Оскільки $\arcsin({latex(val_div)}) = {('-' if is_neg else '')}{angle_latex}$, маємо:"))
                     self.steps.append(("math",
                                        rf"x {sign_pi} \frac{{\pi}}{{4}} = (-1)^{{{power_n}}} \cdot {angle_latex} + \pi n, n \in \mathbb{{Z}}"))
 
@@ -253,9 +253,10 @@ class SymmetricEquation(TrigonometricEquation):
                     solution_sets_latex.append(rf"\left\{{ {final_x_expr} \; \middle| \; n \in \mathbb{{Z}} \right\}}")
 
                 except:
-                    sol = solveset(Eq(sin(self.x + (pi / 4 if sub_type == 'plus' else -pi / 4)), val_div), self.x,
-                                   domain=Reals)
-                    lat = sympy.latex(sol)
+                    # sin(x +- pi/4) = root / sqrt(2) рівносильне sin x +- cos x = root, яке вже розв'язано в _solve.
+                    expr = sin(self.x) + cos(self.x) if sub_type == 'plus' else sin(self.x) - cos(self.x)
+                    sol = self._solveset(Eq(expr, root))
+                    lat = latex(sol)
                     self.steps.append(("math", rf"x \in {lat}"))
                     solution_sets_latex.append(lat)
 
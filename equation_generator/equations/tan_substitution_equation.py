@@ -1,8 +1,37 @@
-import random
 import sympy
-from sympy import sin, cos, tan, Eq, solveset, Reals, symbols, Rational, sqrt, Union, S
+from sympy import sin, cos, tan, Eq, Rational, S
 
 from ..base_class import TrigonometricEquation
+from ..latex_render import latex
+from ..param_space import ParameterSpace
+from ..polynomials import synthetic_division, sorted_roots, poly_expr
+from ..solution_sets import union_solution_sets
+from ..surd import Surd
+from ..trig_tables import T
+
+
+_NICE_ROOTS = [
+    Surd(0),
+    Surd(1), Surd(-1),
+    Surd.sqrt(3), -Surd.sqrt(3),
+    Surd.sqrt(3) / 3, -Surd.sqrt(3) / 3
+]
+
+
+def _free_term(p):
+    # C = A * f(2x) + B * t1 при tg x = t1, точно: 1 + t1^2 раціональне для всіх _NICE_ROOTS.
+    t1 = p['t1']
+    denom = 1 + t1 * t1
+    val_func = 2 * t1 / denom if p['target_func'] == sin else (1 - t1 * t1) / denom
+    return p['A'] * val_func + p['B'] * t1
+
+
+def _nice_free_term(p):
+    # Права частина C має бути цілою або дробом зі знаменником < 10.
+    # Старий фільтр дозволяв і C.has(sqrt), але ця умова ніколи не виконується (sqrt -- не клас SymPy),
+    # тож ірраціональні C відкидалися; зберігаємо саме цю поведінку. B != 0, тож кубічне рівняння не вироджується.
+    C = _free_term(p)
+    return C.is_rational and C.rational_part.denominator < 10
 
 
 class TanSubstitutionEquation(TrigonometricEquation):
@@ -19,7 +48,7 @@ class TanSubstitutionEquation(TrigonometricEquation):
             elif c == -1 and power != 0:
                 str_c = "-"
             else:
-                str_c = sympy.latex(c)
+                str_c = latex(c)
 
             if power == 0:
                 str_var = ""
@@ -41,71 +70,57 @@ class TanSubstitutionEquation(TrigonometricEquation):
         if not terms: return "0"
         return " ".join(terms)
 
-    def _generate(self):
-        while True:
-            target_func = random.choice([sin, cos])
-            nice_roots = [
-                0,
-                1, -1,
-                sqrt(3), -sqrt(3),
-                sqrt(3) / 3, -sqrt(3) / 3
-            ]
-            t1 = random.choice(nice_roots)
-
-            A = random.choice([1, -1, 2, -2, 3, -3])
-            B = random.choice([1, -1, 2, -2, 3, -3])
-            denom = 1 + t1 ** 2
-
-            if target_func == sin:
-                val_func = 2 * t1 / denom
-            else:
-                val_func = (1 - t1 ** 2) / denom
-
-            C = A * val_func + B * t1
+    parameters = ParameterSpace('tan_substitution', [
+        ('target_func', [sin, cos]),
+        ('t1', _NICE_ROOTS),
+        ('A', [1, -1, 2, -2, 3, -3]),
+        ('B', [1, -1, 2, -2, 3, -3]),
+    ], constraints=[_nice_free_term])
 
-            C = sympy.sympify(C)
-            C = sympy.simplify(C)
-
-            if not (C.is_integer or (hasattr(C, 'q') and C.q < 10) or C.has(sqrt)):
-                continue
-
-            self.equation_obj = Eq(A * target_func(2 * self.x) + B * tan(self.x), C)
+    def _generate(self):
+        p = self.parameters.sample()
+        target_func, A, B = p['target_func'], p['A'], p['B']
+        t1 = p['t1'].to_sympy()
+        C = _free_term(p).to_sympy()
 
-            if target_func == sin:
-                poly_coeffs = [B, -C, 2 * A + B, -C]
-            else:
-                poly_coeffs = [B, -A - C, B, A - C]
+        self.equation_obj = Eq(A * target_func(2 * self.x) + B * tan(self.x), C)
 
-            if poly_coeffs[0] == 0:
-                continue
+        if target_func == sin:
+            poly_coeffs = [B, -C, 2 * A + B, -C]
+        else:
+            poly_coeffs = [B, -A - C, B, A - C]
 
-            self.variables = {
-                'target_func': target_func,
-                'A': A, 'B': B, 'C': C,
-                't1': t1,
-                'poly_coeffs': poly_coeffs
-            }
-            break
+        self.variables = {
+            'target_func': target_func,
+            'A': A, 'B': B, 'C': C,
+            't1': t1,
+            'poly_coeffs': poly_coeffs
+        }
 
     def _solve(self):
-        t = symbols('t')
         poly_coeffs = self.variables['poly_coeffs']
 
-        poly = 0
-        degree = len(poly_coeffs) - 1
-        for i, c in enumerate(poly_coeffs):
-            poly += c * t ** (degree - i)
+        # Один корінь відомий з побудови (t1, або 0, якщо вільний член нульовий):
+        # ділимо на (t - t_known) за Горнером і розв'язуємо квадратну частку за формулою.
+        known_root = S(0) if poly_coeffs[-1] == 0 else S(self.variables['t1'])
+        quotient_coeffs, remainder = synthetic_division(poly_coeffs, known_root)
+        self._debug_check(remainder, S(0), "остача від ділення")
 
-        t_roots = sympy.solve(poly, t)
+        quotient_roots = self._solve_quadratic(*quotient_coeffs)
+        t_roots = sorted_roots([known_root] + quotient_roots)
 
-        final_solution = sympy.EmptySet
+        self.variables['known_root'] = known_root
+        self.variables['quotient_coeffs'] = quotient_coeffs
+        self.variables['quotient_roots'] = quotient_roots
+        self.variables['t_roots'] = t_roots
+
+        sub_solutions = []
         for root in t_roots:
-            s_root = sympy.sympify(root)
-            if s_root.is_real:
-                sol = solveset(Eq(tan(self.x), s_root), self.x, domain=Reals)
-                final_solution = Union(final_solution, sol)
+            if root.is_real:
+                sol = self._solveset(Eq(tan(self.x), root))
+                sub_solutions.append(sol)
 
-        self.solution_obj = final_solution
+        self.solution_obj = union_solution_sets(sub_solutions)
 
     def _build_solution_steps(self):
         A = self.variables['A']
@@ -115,9 +130,9 @@ class TanSubstitutionEquation(TrigonometricEquation):
         poly_coeffs = self.variables['poly_coeffs']
         target_func = self.variables['target_func']
         func_name = target_func.__name__
-        t = symbols('t')
+        t = T
 
-        self.steps.append(("text", f"Маємо рівняння: ${sympy.latex(self.equation_obj)}$"))
+        self.steps.append(("text", f"Маємо рівняння: ${latex(self.equation_obj)}$"))
 
         self.steps.append(("text",
                            rf"Рівняння містить ${func_name}(2x)$ та $\text{{tg}}(x)$. Виразимо ${func_name}(2x)$ через $\text{{tg}}(x)$ за формулою:"))
@@ -136,29 +151,29 @@ class TanSubstitutionEquation(TrigonometricEquation):
         def fmt(val):
             if val == 1: return ""
             if val == -1: return "-"
-            return sympy.latex(val)
+            return latex(val)
 
         eq_sub = rf"{fmt(A)} \cdot {sub_expr}"
 
         if B > 0:
             eq_sub += f" + {fmt(B)}t"
         elif B < 0:
-            eq_sub += f" - {sympy.latex(abs(B))}t"
+            eq_sub += f" - {latex(abs(B))}t"
 
-        eq_sub += f" = {sympy.latex(C)}"
+        eq_sub += f" = {latex(C)}"
         self.steps.append(("math", eq_sub))
 
         self.steps.append(
             ("text", r"Помножимо обидві частини на $(1+t^2)$ (оскільки $1+\text{tg}^2 x \neq 0$) та розкриємо дужки:"))
 
         if target_func == sin:
-            step_inter = rf"{sympy.latex(2 * A)}t + {sympy.latex(B)}t(1+t^2) = {sympy.latex(C)}(1+t^2)"
+            step_inter = rf"{latex(2 * A)}t + {latex(B)}t(1+t^2) = {latex(C)}(1+t^2)"
         else:
-            term_A = f"{sympy.latex(A)}(1-t^2)"
+            term_A = f"{latex(A)}(1-t^2)"
             B_sign = "+" if B > 0 else "-" if B < 0 else ""
-            term_B = f"{B_sign} {sympy.latex(abs(B))}t(1+t^2)" if B != 0 else ""
+            term_B = f"{B_sign} {latex(abs(B))}t(1+t^2)" if B != 0 else ""
 
-            step_inter = rf"{term_A} {term_B} = {sympy.latex(C)}(1+t^2)"
+            step_inter = rf"{term_A} {term_B} = {latex(C)}(1+t^2)"
 
         self.steps.append(("math", step_inter))
 
@@ -167,11 +182,7 @@ class TanSubstitutionEquation(TrigonometricEquation):
             ("text", "Перенесемо все в одну сторону і зведемо подібні доданки. Отримуємо кубічне рівняння:"))
         self.steps.append(("math", poly_latex))
 
-        t = symbols('t')
-        poly_sym = 0
-        deg = len(poly_coeffs) - 1
-        for i, c in enumerate(poly_coeffs): poly_sym += c * t ** (deg - i)
-        all_t_roots = sympy.solve(poly_sym, t)
+        all_t_roots = self.variables['t_roots']
 
         if poly_coeffs[-1] == 0:
             self.steps.append(("text", "Вільний член дорівнює 0, тому винесемо спільний множник $t$ за дужки:"))
@@ -182,30 +193,32 @@ class TanSubstitutionEquation(TrigonometricEquation):
 
             self.steps.append(("text", "Звідси перший корінь $t_1 = 0$."))
 
-            other_roots = [r for r in all_t_roots if r != 0]
+            other_roots = [r for r in all_t_roots if r != 0 and r.is_real]
 
             if other_roots:
                 self.steps.append(("text", "Розв'яжемо квадратне рівняння в дужках:"))
-                roots_display = ", ".join([f"t = {sympy.latex(r)}" for r in other_roots])
+                roots_display = ", ".join([f"t = {latex(r)}" for r in other_roots])
                 self.steps.append(("math", rf"{quad_latex} = 0 \implies {roots_display}"))
+            else:
+                self.steps.append(("text", "Квадратне рівняння в дужках не має дійсних коренів."))
 
         else:
             self.steps.append(("text",
-                               f"Спробуємо підібрати корінь серед дільників вільного члена ({sympy.latex(poly_coeffs[-1])})."))
-            self.steps.append(("text", rf"Перевіримо $t = {sympy.latex(t1)}$:"))
+                               f"Спробуємо підібрати корінь серед дільників вільного члена ({latex(poly_coeffs[-1])})."))
+            self.steps.append(("text", rf"Перевіримо $t = {latex(t1)}$:"))
             self.steps.append(
-                ("math", rf"P({sympy.latex(t1)}) = 0 \implies t_1 = {sympy.latex(t1)} \text{{ є коренем.}}"))
+                ("math", rf"P({latex(t1)}) = 0 \implies t_1 = {latex(t1)} \text{{ є коренем.}}"))
 
             self.steps.append(
-                ("text", rf"Розділимо многочлен на $(t - ({sympy.latex(t1)}))$ і отримаємо квадратне рівняння:"))
+                ("text", rf"Розділимо многочлен на $(t - ({latex(t1)}))$ і отримаємо квадратне рівняння:"))
 
-            quotient, remainder = sympy.div(poly_sym, t - t1)
-            self.steps.append(("math", sympy.latex(Eq(quotient, 0))))
+            quotient = poly_expr(self.variables['quotient_coeffs'], t)
+            self.steps.append(("math", latex(Eq(quotient, 0))))
 
-            other_roots = sympy.solve(quotient, t)
+            other_roots = [r for r in self.variables['quotient_roots'] if r.is_real]
             if other_roots:
                 self.steps.append(("text", "Корені цього квадратного рівняння:"))
-                roots_display = ", ".join([f"t = {sympy.latex(r)}" for r in other_roots])
+                roots_display = ", ".join([f"t = {latex(r)}" for r in other_roots])
                 self.steps.append(("math", roots_display))
             else:
                 self.steps.append(("text", "Це квадратне рівняння не має дійсних коренів."))
@@ -216,10 +229,8 @@ class TanSubstitutionEquation(TrigonometricEquation):
 
         unique_roots = []
         for r in all_t_roots:
-            s_r = sympy.sympify(r)
-            if s_r.is_real:
-                if s_r not in unique_roots:
-                    unique_roots.append(s_r)
+            if r.is_real:
+                unique_roots.append(r)
 
         unique_roots.sort(key=lambda x: float(x))
 
@@ -227,9 +238,9 @@ class TanSubstitutionEquation(TrigonometricEquation):
             angle = sympy.atan(root)
 
             if isinstance(angle, sympy.atan):
-                angle_latex = rf"\text{{arctg}}({sympy.latex(root)})"
+                angle_latex = rf"\text{{arctg}}({latex(root)})"
             else:
-                angle_latex = sympy.latex(angle)
+                angle_latex = latex(angle)
 
             if angle_latex == "0":
                 x_expr = r"\pi n"
@@ -239,7 +250,7 @@ class TanSubstitutionEquation(TrigonometricEquation):
             prefix = f"{i}) " if len(unique_roots) > 1 else ""
 
             self.steps.append(
-                ("math", rf"{prefix}\text{{tg}}(x) = {sympy.latex(root)} \implies x = {x_expr}, n \in \mathbb{{Z}}"))
+                ("math", rf"{prefix}\text{{tg}}(x) = {latex(root)} \implies x = {x_expr}, n \in \mathbb{{Z}}"))
 
             final_sets_latex.append(rf"\left\{{ {x_expr} \; \middle| \; n \in \mathbb{{Z}} \right\}}")
 
@@ -0,0 +1,38 @@
+class EquationGenerationError(Exception):
+    pass
+
+
+class UnknownEquationTypeError(EquationGenerationError, KeyError):
+
+    def __init__(self, type_key):
+        self.type_key = type_key
+        super().__init__(f"Тип рівняння '{type_key}' не знайдено у EQUATION_REGISTRY.")
+
+    def __str__(self):
+        # KeyError інакше друкує повідомлення в лапках.
+        return self.args[0]
+
+
+class AnswerVerificationError(EquationGenerationError, ValueError):
+
+    def __init__(self, type_key, attempts, problem):
+        self.type_key = type_key
+        self.attempts = attempts
+        self.problem = problem
+        super().__init__(f"Відповідь рівняння типу '{type_key}' не пройшла перевірку після {attempts} спроб: {problem}")
+
+
+class FailureBudgetExceeded(EquationGenerationError):
+
+    def __init__(self, type_key, requested, generated, failures, max_failures, errors):
+        self.type_key = type_key
+        self.requested = requested
+        self.generated = generated
+        self.failures = failures
+        self.max_failures = max_failures
+        # Повідомлення помилки -> скільки разів вона трапилась.
+        self.errors = dict(errors)
+        super().__init__(
+            f"Тип '{type_key}': {failures} невдалих генерацій перевищили бюджет {max_failures}, "
+            f"згенеровано {generated} з {requested}."
+        )
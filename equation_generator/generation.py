@@ -0,0 +1,90 @@
+import random
+from contextlib import contextmanager
+
+from .equation_record import EquationRecord
+from .errors import UnknownEquationTypeError, AnswerVerificationError
+
+# Менеджер кешів процесу-воркера (встановлюється ініціалізатором пулу).
+_cache_manager = None
+
+# Скільки разів перегенеровуємо рівняння, відповідь якого не пройшла числову перевірку.
+VERIFY_ATTEMPTS = 5
+
+
+def install_cache_manager(manager):
+    global _cache_manager
+    _cache_manager = manager
+
+
+def take_cache_metrics():
+    # Приріст метрик менеджера кешів воркера для батьківського процесу (None, якщо менеджера немає).
+    if _cache_manager is None:
+        return None
+    return _cache_manager.take_delta()
+
+
+@contextmanager
+def seeded_random(seed):
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def get_equation_class(type_key):
+    from . import EQUATION_REGISTRY
+    return EQUATION_REGISTRY.get(type_key)
+
+
+def generate_equation(type_key, seed):
+    klass = get_equation_class(type_key)
+    if klass is None:
+        raise UnknownEquationTypeError(type_key)
+
+    with seeded_random(seed):
+        return klass()
+
+
+def next_seed(seed):
+    return random.Random(seed).getrandbits(32)
+
+
+def generate_verified_equation(type_key, seed):
+    # Повертає (рівняння, seed): seed -- той, з якого згенеровано рівняння, що пройшло перевірку.
+    from . import verification
+
+    if not verification.verify_enabled:
+        return generate_equation(type_key, seed), seed
+
+    problem = None
+    for _ in range(VERIFY_ATTEMPTS):
+        equation = generate_equation(type_key, seed)
+        problem = verification.check_solution(equation, seed)
+        if problem is None:
+            return equation, seed
+        seed = next_seed(seed)
+    raise AnswerVerificationError(type_key, VERIFY_ATTEMPTS, problem)
+
+
+def generate_record(task):
+    type_key, seed = task
+    equation, seed = generate_verified_equation(type_key, seed)
+    return EquationRecord.from_equation(equation, type_key, seed)
+
+
+def generate_record_metered(task):
+    # Для pool.map: результат разом із приростом метрик кешу воркера.
+    record, error = generate_record_safe(task)
+    return record, error, take_cache_metrics()
+
+
+def generate_record_safe(task):
+    try:
+        return generate_record(task), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    finally:
+        if _cache_manager is not None:
+            _cache_manager.after_equation()
@@ -0,0 +1,34 @@
+import functools
+
+import sympy
+
+LATEX_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=LATEX_CACHE_SIZE, typed=True)
+def _cached_latex(expr, options):
+    return sympy.latex(expr, **dict(options))
+
+
+def latex(expr, **options) -> str:
+    # Ключ кешу - структурний хеш виразу SymPy разом з опціями друку.
+    try:
+        return _cached_latex(expr, tuple(sorted(options.items())))
+    except TypeError:
+        return sympy.latex(expr, **options)
+
+
+def latex_cache_stats() -> dict:
+    info = _cached_latex.cache_info()
+    calls = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': info.hits / calls if calls else 0.0,
+    }
+
+
+def clear_latex_cache():
+    _cached_latex.cache_clear()
@@ -0,0 +1,273 @@
+import math
+import random
+from fractions import Fraction
+
+
+class Domain:
+    # Скінченна множина значень параметра з цілими вагами.
+    __slots__ = ('values', 'weights')
+
+    def __init__(self, values, weights=None):
+        self.values = tuple(values)
+        self.weights = tuple(weights) if weights is not None else (1,) * len(self.values)
+        if len(self.weights) != len(self.values):
+            raise ValueError("Кількість ваг не збігається з кількістю значень.")
+        if any(w <= 0 for w in self.weights):
+            raise ValueError("Ваги домену мають бути додатними.")
+
+    @classmethod
+    def from_choices(cls, choices):
+        # [1, 1, 2, 3] -> значення (1, 2, 3) з вагами (2, 1, 1), як у random.choice за тим самим списком.
+        values, weights = [], []
+        for value in choices:
+            for i, known in enumerate(values):
+                if type(known) is type(value) and known == value:
+                    weights[i] += 1
+                    break
+            else:
+                values.append(value)
+                weights.append(1)
+        return cls(values, weights)
+
+    @classmethod
+    def coerce(cls, value):
+        if isinstance(value, Domain):
+            return value
+        if isinstance(value, dict):
+            return cls(value.keys(), value.values())
+        return cls.from_choices(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+def alias_table(weights):
+    # Метод псевдонімів Вокера (варіант Воуза) у цілих числах: вибірка за O(1) без похибок округлення.
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n for w in weights]
+    threshold = [total] * n
+    alias = list(range(n))
+    small = [i for i, s in enumerate(scaled) if s < total]
+    large = [i for i, s in enumerate(scaled) if s >= total]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        threshold[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= total - scaled[s]
+        (small if scaled[l] < total else large).append(l)
+    return threshold, alias, total
+
+
+class ParameterSpace:
+    # Декларативний простір параметрів генератора: (ім'я, домен) по порядку та обмеження на повну точку.
+    # Домен -- список з повторами (як для random.choice), dict {значення: вага}, Domain, вкладений
+    # ParameterSpace (його параметри додаються до точки) або функція від уже вибраних параметрів,
+    # що повертає один з них. Порожній домен відкидає гілку; None від функції -- параметра в цій гілці
+    # немає (у точці він буде None).
+    # Ймовірність точки -- добуток умовних ймовірностей її значень, нормований на точки, що задовольняють
+    # обмеження: рівно той розподіл, який давав цикл `while True: ...; if not ok: continue`.
+
+    def __init__(self, name, parameters, constraints=()):
+        self.name = name
+        # Статичні домени зводимо до Domain одразу; функції та вкладені простори -- під час компіляції.
+        self.parameters = tuple((name, domain if callable(domain) or isinstance(domain, ParameterSpace)
+                                 else Domain.coerce(domain)) for name, domain in parameters)
+        self.constraints = tuple(constraints)
+        self._compiled = None
+        self._nested = {}
+
+    def _walk(self, index, point, numerator, denominator):
+        # Ймовірність гілки -- numerator / denominator; точку змінюємо на місці, тож споживач читає її одразу.
+        if index == len(self.parameters):
+            yield point, numerator, denominator
+            return
+        name, domain = self.parameters[index]
+        if callable(domain):
+            domain = domain(point)
+        if domain is None:
+            yield from self._walk(index + 1, point, numerator, denominator)
+            return
+        if isinstance(domain, ParameterSpace):
+            # Вкладений простір зі своїми обмеженнями: відкидання всередині нього не змінює ймовірностей зовнішніх параметрів.
+            self._nested[id(domain)] = domain
+            sub = domain.compiled
+            for values, weight in zip(sub['points'], sub['weights']):
+                point.update(zip(sub['names'], values))
+                yield from self._walk(index + 1, point, numerator * weight, denominator * sub['total'])
+            for sub_name in sub['names']:
+                del point[sub_name]
+            return
+        domain = Domain.coerce(domain)
+        total = sum(domain.weights)
+        for value, weight in zip(domain.values, domain.weights):
+            point[name] = value
+            yield from self._walk(index + 1, point, numerator * weight, denominator * total)
+        # Порожній домен відкидає гілку, не записавши значення.
+        point.pop(name, None)
+
+    def _compile(self):
+        names = {}
+        points, numerators, denominators = [], [], []
+        raw_size = 0
+        self._nested = {}
+        for point, numerator, denominator in self._walk(0, {}, 1, 1):
+            raw_size += 1
+            names.update(dict.fromkeys(point))
+            if all(constraint(point) for constraint in self.constraints):
+                points.append(dict(point))
+                numerators.append(numerator)
+                denominators.append(denominator)
+        if not points:
+            raise ValueError(f"Простір параметрів '{self.name}' порожній: жодна точка не задовольняє обмеження.")
+        # Параметри, яких у гілці немає, -- None.
+        names = tuple(names)
+        points = [tuple(point.get(name) for name in names) for point in points]
+
+        # Ймовірності -> цілі ваги зі спільним знаменником.
+        common_denominator = math.lcm(*set(denominators))
+        weights = [n * (common_denominator // d) for n, d in zip(numerators, denominators)]
+        accepted = Fraction(sum(weights), common_denominator)
+        common = math.gcd(*weights)
+        weights = [w // common for w in weights]
+
+        threshold, alias, total = alias_table(weights)
+        self._compiled = {
+            'names': names,
+            'points': points,
+            'weights': weights,
+            'total': total,
+            'threshold': threshold,
+            'alias': alias,
+            'raw_size': raw_size,
+            'acceptance': accepted,
+        }
+        return self._compiled
+
+    @property
+    def compiled(self):
+        return self._compiled or self._compile()
+
+    def invalidate(self):
+        self._compiled = None
+
+    def nested_spaces(self):
+        # Вкладені простори (рекурсивно), які трапились під час компіляції.
+        self.compiled
+        result = []
+        for space in self._nested.values():
+            result.append(space)
+            result.extend(s for s in space.nested_spaces() if s not in result)
+        return result
+
+    @property
+    def names(self):
+        return self.compiled['names']
+
+    @property
+    def size(self):
+        return len(self.compiled['points'])
+
+    @property
+    def raw_size(self):
+        # Кількість точок до обмежень.
+        return self.compiled['raw_size']
+
+    @property
+    def acceptance(self):
+        # Точна частка вибірок, яку пропускав би цикл з відкиданням.
+        return self.compiled['acceptance']
+
+    def sample(self, rng=random):
+        compiled = self.compiled
+        points = compiled['points']
+        i = rng.randrange(len(points))
+        if rng.randrange(compiled['total']) >= compiled['threshold'][i]:
+            i = compiled['alias'][i]
+        return dict(zip(self.names, points[i]))
+
+    def points(self):
+        compiled = self.compiled
+        total = sum(compiled['weights'])
+        for point, weight in zip(compiled['points'], compiled['weights']):
+            yield dict(zip(self.names, point)), Fraction(weight, total)
+
+    def probability(self, point):
+        key = tuple(point[name] for name in self.names)
+        compiled = self.compiled
+        total = sum(compiled['weights'])
+        return sum((Fraction(w, total) for p, w in zip(compiled['points'], compiled['weights']) if p == key),
+                   Fraction(0))
+
+    def marginals(self):
+        # Точний розподіл кожного параметра: {ім'я: [(значення, ймовірність), ...]}.
+        result = {name: [] for name in self.names}
+        for point, probability in self.points():
+            for name in self.names:
+                entries = result[name]
+                for i, (value, known) in enumerate(entries):
+                    if type(value) is type(point[name]) and value == point[name]:
+                        entries[i] = (value, known + probability)
+                        break
+                else:
+                    entries.append((point[name], probability))
+        return result
+
+    def coverage(self, samples):
+        # Звіт про вибірку: скільки точок простору трапилось і наскільки частоти параметрів відхиляються від точних.
+        compiled = self.compiled
+        index = {point: i for i, point in enumerate(compiled['points'])}
+        hits = [0] * len(index)
+        count = 0
+        unknown = 0
+        for sample in samples:
+            count += 1
+            i = index.get(tuple(sample[name] for name in self.names))
+            if i is None:
+                unknown += 1
+            else:
+                hits[i] += 1
+
+        total = sum(compiled['weights'])
+        covered = sum(1 for h in hits if h)
+        # Очікувана кількість різних точок серед count незалежних вибірок.
+        expected = sum(1 - (1 - w / total) ** count for w in compiled['weights'])
+        deviation = {}
+        for name, entries in self.marginals().items():
+            position = self.names.index(name)
+            observed = [0] * len(entries)
+            for point, h in zip(compiled['points'], hits):
+                if h:
+                    for j, (value, _) in enumerate(entries):
+                        if type(value) is type(point[position]) and value == point[position]:
+                            observed[j] += h
+                            break
+            deviation[name] = max(abs(o / count - float(p)) for o, (_, p) in zip(observed, entries)) if count else 0.0
+        return {
+            'space': self.name,
+            'size': len(hits),
+            'samples': count,
+            'covered': covered,
+            'coverage': covered / len(hits),
+            'expected_covered': expected,
+            'unknown': unknown,
+            'max_marginal_deviation': deviation,
+        }
+
+
+class PooledSpace:
+    # Дескриптор класу генератора: простір, побудований з пулів-атрибутів класу (build(*пули)).
+    # Індекс кешується за вмістом пулів, тож зміна пулу (або підклас з іншими пулами) дає новий індекс.
+
+    def __init__(self, build, *pool_names):
+        self.build = build
+        self.pool_names = pool_names
+        self._spaces = {}
+
+    def __get__(self, instance, owner):
+        pools = tuple(tuple(getattr(owner, name)) for name in self.pool_names)
+        space = self._spaces.get(pools)
+        if space is None:
+            space = self._spaces[pools] = self.build(*pools)
+        return space
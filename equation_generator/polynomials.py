@@ -0,0 +1,51 @@
+import sympy
+from sympy.core.sorting import default_sort_key
+from sympy.polys.polyroots import roots_quadratic
+
+from .trig_tables import T
+
+
+def exact(value):
+    # Float з цілим значенням (наприклад 0.0 після ділення int / int) переводимо в Rational.
+    value = sympy.sympify(value)
+    if isinstance(value, sympy.Float):
+        return sympy.Rational(value)
+    return value
+
+
+def poly_expr(coeffs, var=T):
+    degree = len(coeffs) - 1
+    return sum((c * var ** (degree - i) for i, c in enumerate(coeffs)), sympy.S.Zero)
+
+
+def synthetic_division(coeffs, root):
+    # Схема Горнера: ділимо многочлен на (var - root) в точній арифметиці.
+    coeffs = [exact(c) for c in coeffs]
+    root = exact(root)
+
+    quotient = [coeffs[0]]
+    for c in coeffs[1:]:
+        quotient.append(sympy.expand(c + root * quotient[-1]))
+
+    remainder = quotient.pop()
+    return quotient, remainder
+
+
+def sorted_roots(roots):
+    # Той самий порядок, що й у sympy.solve.
+    return sorted(set(roots), key=default_sort_key)
+
+
+def known_quadratic_roots(roots):
+    # Корені відомі з побудови: зберігаємо порядок генератора, прибираємо повтори.
+    unique = []
+    for root in roots:
+        if root not in unique:
+            unique.append(root)
+    return unique
+
+
+def quadratic_roots(a, b, c, var=T, known_roots=None):
+    if known_roots is not None:
+        return known_quadratic_roots(known_roots)
+    return sorted_roots(roots_quadratic(sympy.Poly(poly_expr([exact(a), exact(b), exact(c)], var), var)))
@@ -0,0 +1,58 @@
+import importlib
+from collections.abc import Mapping
+
+EQUATION_PATHS = {
+    "1": ('.equations.simplest_equation', 'SimplestEquation'),
+    "2": ('.equations.homogeneous_equation', 'HomogeneousEquation'),
+    "3": ('.equations.sum_to_product_equation', 'SumToProductEquation'),
+    "4": ('.equations.grouping_equation', 'GroupingEquation'),
+    "5": ('.equations.power_reduction_equation', 'PowerReductionEquation'),
+    "6": ('.equations.quadratic_trig_equation', 'QuadraticTrigEquation'),
+    "7": ('.equations.double_angle_to_quadratic_equation', 'DoubleAngleToQuadraticEquation'),
+    "8": ('.equations.linear_combination_equation', 'LinearCombinationEquation'),
+    "9": ('.equations.reducible_to_homogenous_equation', 'ReducibleToHomogeneousEquation'),
+    "10": ('.equations.symmetric_equation', 'SymmetricEquation'),
+    "11": ('.equations.tan_substitution_equation', 'TanSubstitutionEquation'),
+    "12": ('.equations.sum_tan_cotan_equation', 'SumTanCotanEquation'),
+    "13": ('.equations.bounded_sum_equation', 'BoundedSumEquation'),
+    "14": ('.equations.inverse_trig_equation', 'InverseTrigEquation'),
+}
+
+
+class LazyRegistry(Mapping):
+
+    def __init__(self, paths, package=__package__):
+        self._paths = dict(paths)
+        self._package = package
+        self._loaded = {}
+
+    def __getitem__(self, type_key):
+        klass = self._loaded.get(type_key)
+        if klass is None:
+            module_path, class_name = self._paths[type_key]
+            module = importlib.import_module(module_path, self._package)
+            klass = getattr(module, class_name)
+            self._loaded[type_key] = klass
+        return klass
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, type_key):
+        return type_key in self._paths
+
+    def is_loaded(self, type_key) -> bool:
+        return type_key in self._loaded
+
+    def class_name(self, type_key) -> str:
+        return self._paths[type_key][1]
+
+    def __repr__(self):
+        loaded = ", ".join(self._loaded) or "-"
+        return f"LazyRegistry({len(self._paths)} types, loaded: {loaded})"
+
+
+EQUATION_REGISTRY = LazyRegistry(EQUATION_PATHS)
@@ -0,0 +1,88 @@
+import time
+
+from .generation import generate_record_safe, take_cache_metrics
+
+# Початкові оцінки вартості рівняння за типом, мс: p50 generate_record (з перевіркою відповіді), одне ядро,
+# 2026-10-19, `python -m benchmarks.bench_generation --seeds 300 --pdf-per-type 0`.
+# Це лише стартова точка: CostModel уточнює їх за вимірами.
+DEFAULT_COSTS_MS = {
+    '1': 30.1, '2': 19.4, '3': 5.4, '4': 13.0, '5': 26.4, '6': 70.3, '7': 49.4,
+    '8': 5.2, '9': 41.7, '10': 11.9, '11': 17.9, '12': 28.2, '13': 4.7, '14': 10.9,
+}
+DEFAULT_COST_MS = 50.0
+EWMA_ALPHA = 0.2
+# Пакет дешевих задач має коштувати хоча б стільки, інакше накладні витрати IPC помітні.
+MIN_CHUNK_MS = 20.0
+# Пакет -- не більше 1 / (processes * CHUNKS_PER_WORKER) ще не розданої роботи.
+CHUNKS_PER_WORKER = 4
+# maxtasksperchild пулу рахує пакети, а не рівняння: обмежуємо довжину пакета, щоб воркер перезапускався
+# не пізніше ніж після max_tasks_per_worker * MAX_CHUNK_TASKS рівнянь.
+MAX_CHUNK_TASKS = 16
+
+
+class CostModel:
+    # Оцінка вартості одного рівняння кожного типу: експоненційне ковзне середнє виміряних часів.
+
+    def __init__(self, priors=None, alpha=EWMA_ALPHA):
+        self.alpha = alpha
+        self.estimates = dict(DEFAULT_COSTS_MS if priors is None else priors)
+        self.observations = {}
+
+    def estimate(self, type_key):
+        if type_key in self.estimates:
+            return self.estimates[type_key]
+        if self.estimates:
+            return sum(self.estimates.values()) / len(self.estimates)
+        return DEFAULT_COST_MS
+
+    def record(self, type_key, ms):
+        count = self.observations.get(type_key, 0)
+        previous = self.estimates.get(type_key)
+        if previous is None:
+            self.estimates[type_key] = ms
+        else:
+            # Перші виміри важать більше (як у звичайному середньому), далі -- стала вага alpha.
+            weight = max(self.alpha, 1 / (count + 2))
+            self.estimates[type_key] = previous + weight * (ms - previous)
+        self.observations[type_key] = count + 1
+
+    def to_dict(self):
+        return {'alpha': self.alpha, 'estimates': dict(self.estimates), 'observations': dict(self.observations)}
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls(priors=data['estimates'], alpha=data.get('alpha', EWMA_ALPHA))
+        model.observations = dict(data.get('observations', {}))
+        return model
+
+
+def plan_chunks(tasks, cost_model, processes, min_chunk_ms=MIN_CHUNK_MS):
+    # tasks: [(index, type_key, seed)]. Найдовші задачі першими (LPT); пакет набираємо до budget мс, де budget
+    # пропорційний ще не розданій роботі (guided self-scheduling): дорогі задачі на початку йдуть майже поодинці,
+    # а хвіст дробиться на дрібні пакети, щоб воркери закінчували одночасно.
+    costed = sorted(((cost_model.estimate(task[1]), task) for task in tasks), key=lambda item: -item[0])
+    remaining = sum(cost for cost, _ in costed)
+    share = max(processes, 1) * CHUNKS_PER_WORKER
+
+    chunks = []
+    current, current_cost = [], 0.0
+    for cost, task in costed:
+        if current and (current_cost + cost > max(min_chunk_ms, remaining / share) or len(current) == MAX_CHUNK_TASKS):
+            chunks.append(current)
+            remaining -= current_cost
+            current, current_cost = [], 0.0
+        current.append(task)
+        current_cost += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run_chunk(chunk):
+    # Виконується у воркері: ([(index, record, error, ms)], приріст метрик кешу воркера або None).
+    results = []
+    for index, type_key, seed in chunk:
+        t0 = time.perf_counter()
+        record, error = generate_record_safe((type_key, seed))
+        results.append((index, record, error, (time.perf_counter() - t0) * 1000))
+    return results, take_cache_metrics()
@@ -0,0 +1,266 @@
+import math
+from fractions import Fraction
+
+import sympy
+from sympy import Eq, ImageSet, Lambda, Integers, EmptySet, Union, Dummy, pi
+
+from .trig_tables import ZERO_CASE_SOLUTIONS, N_INT, X
+
+# Параметр серій у формі solveset (Dummy друкується як n, але сортується так само, як у solveset).
+N_DUMMY = Dummy('n')
+
+
+def zero_solution_set(func_name, arg_expr, x=X):
+    # sin(kx) = 0 -> x = pi*n/k, cos(kx) = 0 -> x = pi/(2k) + pi*n/k: без виклику solve.
+    special_formula_expr = ZERO_CASE_SOLUTIONS.get(func_name, {}).get(0)
+    if special_formula_expr is None:
+        return None
+
+    coeff = arg_expr.as_coefficient(x)
+    if coeff is None or not coeff.is_Rational or coeff == 0:
+        return None
+
+    return ImageSet(Lambda(N_INT, (special_formula_expr / coeff).expand()), Integers)
+
+
+def zero_solution_set_by_solve(func_name, arg_expr, x=X):
+    special_formula_expr = ZERO_CASE_SOLUTIONS.get(func_name, {}).get(0)
+    if special_formula_expr is None:
+        return None
+
+    sub_sol_expr_list = sympy.solve(Eq(arg_expr, special_formula_expr), x)
+    if not sub_sol_expr_list:
+        return EmptySet
+    return ImageSet(Lambda(N_INT, sub_sol_expr_list[0].expand()), Integers)
+
+
+def sine_solution_set(value, shift=0, x=X):
+    # sin(x + shift) = value: дві серії x = arcsin(value) - shift та pi - arcsin(value) - shift,
+    # початок серії зводимо до [0, 2pi), як це робить solveset.
+    if abs(value) > 1:
+        return EmptySet
+
+    angle = sympy.asin(value)
+    if isinstance(angle, sympy.asin):
+        return None
+
+    bases = []
+    for base in ((angle - shift) % (2 * pi), (pi - angle - shift) % (2 * pi)):
+        if base not in bases:
+            bases.append(base)
+    return Union(*[ImageSet(Lambda(N_DUMMY, 2 * pi * N_DUMMY + base), Integers) for base in bases])
+
+
+def series_bases(solution_set, period=2 * pi, digits=9):
+    # Початки серій, зведені до [0, period), як числа: для порівняння відповідей різної форми.
+    # Серія з кроком period * p/q дає q початків. Повертає None, якщо множина не є об'єднанням серій.
+    if isinstance(solution_set, PeriodicSolutionSet):
+        solution_set = solution_set.to_sympy()
+    if solution_set == EmptySet:
+        return ()
+    families = solution_set.args if isinstance(solution_set, Union) else (solution_set,)
+
+    period_value = float(period)
+    bases = set()
+    for family in families:
+        if not isinstance(family, ImageSet) or family.base_sets != (Integers,):
+            return None
+        var, expr = family.lamda.variables[0], family.lamda.expr
+        start = expr.subs(var, 0)
+        ratio = sympy.nsimplify((expr.subs(var, 1) - start) / period)
+        if not ratio.is_Rational or ratio == 0:
+            return None
+        for j in range(ratio.q):
+            value = complex(sympy.N(start + period * j / ratio.q, 30)).real % period_value
+            value = round(value, digits)
+            bases.add(0.0 if value == round(period_value, digits) else value)
+    return tuple(sorted(bases))
+
+
+def _pi_fraction(value):
+    # value = c * pi з раціональним c -> Fraction(c), інакше None.
+    c = sympy.sympify(value) / pi
+    if c.is_Rational:
+        return Fraction(int(c.p), int(c.q))
+    return None
+
+
+def _fraction_lcm(values):
+    numerators = [v.numerator for v in values]
+    denominators = [v.denominator for v in values]
+    return Fraction(math.lcm(*numerators), math.gcd(*denominators))
+
+
+def _period_latex(period):
+    p, q = period.numerator, period.denominator
+    coeff = "" if p == 1 else f"{p} "
+    if q == 1:
+        return rf"{coeff}\pi n"
+    return rf"\frac{{{coeff}\pi n}}{{{q}}}"
+
+
+class PeriodicSolutionSet:
+    # Об'єднання серій x = base + period * n: period і раціональна частина base -- кратні pi (Fraction),
+    # rest -- ірраціональний зсув SymPy (atan(2) тощо, за замовчуванням 0). SymPy-множина будується лише на вимогу.
+    # Порівнюємо серії за base mod period, а друкуємо з тим представником, з яким серія прийшла.
+    __slots__ = ('families', '_display')
+
+    def __init__(self, families=()):
+        normalized = []
+        display = {}
+        for period, base, rest in families:
+            period, base, rest = Fraction(period), Fraction(base), sympy.sympify(rest)
+            family = (period, base % period, rest)
+            normalized.append(family)
+            display.setdefault(family, base)
+        self.families = self._merge(normalized)
+        self._display = {family: display.get(family, family[1]) for family in self.families}
+
+    @staticmethod
+    def _residues(items, common):
+        residues = set()
+        for period, base in items:
+            for j in range(int(common / period)):
+                residues.add((base + j * period) % common)
+        return residues
+
+    @classmethod
+    def _merge(cls, families):
+        # Серії з однаковим rest: прибираємо ті, що вже покриті іншими (pi*n у pi*n/3), і зливаємо
+        # k серій з кроком period, що утворюють повний набір зсувів на period/k: pi*n та pi/2 + pi*n -> pi*n/2.
+        groups = {}
+        for period, base, rest in families:
+            items = groups.setdefault(rest, [])
+            if (period, base) not in items:
+                items.append((period, base))
+
+        merged = []
+        for rest, items in groups.items():
+            changed = True
+            while changed:
+                changed = False
+                common = _fraction_lcm([period for period, _ in items])
+                for item in sorted(items, reverse=True):
+                    others = [other for other in items if other != item]
+                    if others and cls._residues([item], common) <= cls._residues(others, common):
+                        items = others
+                        changed = True
+                        break
+                if changed:
+                    continue
+
+                bases_by_period = {}
+                for period, base in items:
+                    bases_by_period.setdefault(period, set()).add(base)
+                for period, bases in sorted(bases_by_period.items(), reverse=True):
+                    for k in range(len(bases), 1, -1):
+                        if period.denominator * k > 1000:
+                            continue
+                        step = period / k
+                        for base in sorted(bases):
+                            coset = {(base + j * step) % period for j in range(k)}
+                            if coset <= bases:
+                                items = [item for item in items if not (item[0] == period and item[1] in coset)]
+                                items.append((step, base % step))
+                                changed = True
+                                break
+                        if changed:
+                            break
+                    if changed:
+                        break
+            merged.extend((period, base, rest) for period, base in items)
+
+        merged.sort(key=lambda f: (float(f[1]) * math.pi + float(f[2]), f[0]))
+        return tuple(merged)
+
+    @classmethod
+    def from_sympy(cls, solution_set):
+        # None, якщо множина не є об'єднанням серій з періодом, кратним pi.
+        if solution_set == EmptySet:
+            return cls()
+        parts = solution_set.args if isinstance(solution_set, Union) else (solution_set,)
+
+        families = []
+        for part in parts:
+            if not isinstance(part, ImageSet) or part.base_sets != (Integers,):
+                return None
+            var, expr = part.lamda.variables[0], sympy.expand(part.lamda.expr)
+            step = expr.coeff(var)
+            base = sympy.expand(expr - step * var)
+            period = _pi_fraction(step)
+            if period is None or period == 0 or base.has(var):
+                return None
+
+            base_pi = base.coeff(pi)
+            if not base_pi.is_Rational:
+                base_pi = sympy.S.Zero
+            rest = sympy.expand(base - base_pi * pi)
+            if rest.has(pi):
+                return None
+            families.append((abs(period), Fraction(int(base_pi.p), int(base_pi.q)), rest))
+        return cls(families)
+
+    @property
+    def is_empty(self):
+        return not self.families
+
+    def _display_families(self):
+        return [(period, self._display[(period, base, rest)], rest) for period, base, rest in self.families]
+
+    def union(self, *others):
+        families = self._display_families()
+        for other in others:
+            families.extend(other._display_families())
+        return PeriodicSolutionSet(families)
+
+    __or__ = union
+
+    def to_sympy(self, n=N_INT):
+        if self.is_empty:
+            return EmptySet
+        return Union(*[ImageSet(Lambda(n, period * pi * n + base * pi + rest), Integers)
+                       for period, base, rest in self._display_families()])
+
+    def latex(self):
+        from .latex_render import latex
+        if self.is_empty:
+            return r"\emptyset"
+
+        parts = []
+        for period, base, rest in self._display_families():
+            body = _period_latex(period)
+            base_expr = sympy.Rational(base.numerator, base.denominator) * pi + rest
+            if base_expr != 0:
+                base_latex = latex(base_expr)
+                if base_latex.startswith('-'):
+                    body += f" - {base_latex[1:].lstrip()}"
+                else:
+                    body += f" + {base_latex}"
+            parts.append(rf"\left\{{{body}\; \middle|\; n \in \mathbb{{Z}}\right\}}")
+        return r" \cup ".join(parts)
+
+    def _latex(self, printer=None):
+        # Друк через sympy.latex / latex_render.latex.
+        return self.latex()
+
+    def __eq__(self, other):
+        # Структурна рівність, як у SymPy: з представниками для друку (на ній тримається кеш latex_render).
+        if isinstance(other, PeriodicSolutionSet):
+            return self._display_families() == other._display_families()
+        if other == EmptySet:
+            return self.is_empty
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self._display_families()))
+
+    def __repr__(self):
+        return f"PeriodicSolutionSet({self.to_sympy()})"
+
+
+def union_solution_sets(solution_sets):
+    # Об'єднання підрозв'язків: компактно, якщо всі вони -- серії з періодом, кратним pi; інакше Union SymPy.
+    periodic = [PeriodicSolutionSet.from_sympy(s) for s in solution_sets]
+    if any(p is None for p in periodic):
+        return Union(*solution_sets)
+    return PeriodicSolutionSet().union(*periodic)
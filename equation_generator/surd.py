@@ -0,0 +1,181 @@
+import math
+from fractions import Fraction
+
+import sympy
+
+
+def _split_square(n):
+    # n = k^2 * d, d вільне від квадратів.
+    k, d = 1, n
+    f = 2
+    while f * f <= d:
+        while d % (f * f) == 0:
+            d //= f * f
+            k *= f
+        f += 1
+    return k, d
+
+
+class Surd:
+    # Точне число p/q + r/s * sqrt(d) + ...: раціональні коефіцієнти при коренях з вільних від квадратів d
+    # (d = 1 -- раціональна частина). Для побудови параметрів генераторів без симпліфікатора SymPy.
+    __slots__ = ('terms',)
+
+    def __init__(self, rational=0, radicals=None):
+        self.terms = {}
+        if rational:
+            self.terms[1] = Fraction(rational)
+        for n, coeff in (radicals or {}).items():
+            self._add_term(n, Fraction(coeff))
+
+    def _add_term(self, n, coeff):
+        if n < 0:
+            raise ValueError(f"Від'ємне підкореневе число не підтримується: {n}")
+        if coeff == 0 or n == 0:
+            return
+        k, d = _split_square(n)
+        value = self.terms.get(d, 0) + coeff * k
+        if value:
+            self.terms[d] = value
+        else:
+            self.terms.pop(d, None)
+
+    @classmethod
+    def sqrt(cls, n, coeff=1):
+        return cls(radicals={n: coeff})
+
+    @classmethod
+    def coerce(cls, value):
+        if isinstance(value, Surd):
+            return value
+        if isinstance(value, (int, Fraction)):
+            return cls(value)
+        return NotImplemented
+
+    @property
+    def is_rational(self):
+        return all(d == 1 for d in self.terms)
+
+    @property
+    def rational_part(self):
+        return self.terms.get(1, Fraction(0))
+
+    def __add__(self, other):
+        other = Surd.coerce(other)
+        if other is NotImplemented:
+            return other
+        result = Surd()
+        result.terms = dict(self.terms)
+        for d, coeff in other.terms.items():
+            result._add_term(d, coeff)
+        return result
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        result = Surd()
+        result.terms = {d: -coeff for d, coeff in self.terms.items()}
+        return result
+
+    def __pos__(self):
+        return self
+
+    def __sub__(self, other):
+        other = Surd.coerce(other)
+        if other is NotImplemented:
+            return other
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        other = Surd.coerce(other)
+        if other is NotImplemented:
+            return other
+        result = Surd()
+        for d1, c1 in self.terms.items():
+            for d2, c2 in other.terms.items():
+                result._add_term(d1 * d2, c1 * c2)
+        return result
+
+    __rmul__ = __mul__
+
+    def _inverse(self):
+        # Обертаємо лише одночлени c * sqrt(d): 1 / (c sqrt(d)) = sqrt(d) / (c d).
+        if len(self.terms) != 1:
+            raise ValueError(f"Ділення на багаточлен з коренями не підтримується: {self}")
+        (d, coeff), = self.terms.items()
+        return Surd(radicals={d: 1 / (coeff * d)})
+
+    def __truediv__(self, other):
+        other = Surd.coerce(other)
+        if other is NotImplemented:
+            return other
+        return self * other._inverse()
+
+    def __rtruediv__(self, other):
+        return Surd.coerce(other) * self._inverse()
+
+    def __float__(self):
+        return float(sum(float(coeff) * math.sqrt(d) for d, coeff in self.terms.items()))
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def __abs__(self):
+        return -self if self < 0 else self
+
+    def _sign(self, other):
+        # Рівність перевіряємо точно, знак ненульової різниці -- через float (значення малі й далекі від нуля).
+        diff = self - other
+        if not diff:
+            return 0
+        return 1 if float(diff) > 0 else -1
+
+    def __eq__(self, other):
+        other = Surd.coerce(other)
+        if other is NotImplemented:
+            return other
+        return self.terms == other.terms
+
+    def __hash__(self):
+        if self.is_rational:
+            return hash(self.rational_part)
+        return hash(frozenset(self.terms.items()))
+
+    def __lt__(self, other):
+        return self._sign(other) < 0
+
+    def __le__(self, other):
+        return self._sign(other) <= 0
+
+    def __gt__(self, other):
+        return self._sign(other) > 0
+
+    def __ge__(self, other):
+        return self._sign(other) >= 0
+
+    def to_sympy(self):
+        parts = [sympy.Rational(coeff.numerator, coeff.denominator) * (sympy.sqrt(d) if d != 1 else 1)
+                 for d, coeff in sorted(self.terms.items())]
+        return sympy.Add(*parts)
+
+    def latex(self):
+        from .latex_render import latex
+        return latex(self.to_sympy())
+
+    def __repr__(self):
+        return f"Surd({self.to_sympy()})"
+
+
+def denominators_lcm(values):
+    # НСК знаменників лише чисто раціональних значень (доданки з коренями не нормуються).
+    denoms = [Surd.coerce(v).rational_part.denominator for v in values if Surd.coerce(v).is_rational]
+    return math.lcm(*denoms) if denoms else 1
+
+
+def terms_denominators_lcm(values):
+    # НСК знаменників усіх доданків, разом з коефіцієнтами при коренях: після множення коефіцієнти з Z[sqrt(d)].
+    denoms = [coeff.denominator for v in values for coeff in Surd.coerce(v).terms.values()]
+    return math.lcm(*denoms) if denoms else 1
@@ -0,0 +1,148 @@
+from types import MappingProxyType
+
+import sympy
+from sympy import sin, cos, pi, sqrt, Rational
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Спільні символи: створюються один раз на процес.
+X = sympy.symbols('x')
+N_INT = sympy.symbols('n', integer=True)
+N = sympy.symbols('n')
+T = sympy.symbols('t')
+Y = sympy.symbols('y')
+ALPHA = sympy.symbols('alpha')
+
+SQRT2 = sqrt(2)
+SQRT3 = sqrt(3)
+
+GENERAL_FORMULAS = _freeze({
+    'sin': r't = (-1)^n \arcsin(val) + \pi n, n \in \mathbb{Z}',
+    'cos': r't = \pm \arccos(val) + 2\pi n, n \in \mathbb{Z}',
+    'tan': r't = \arctan(val) + \pi n, n \in \mathbb{Z}',
+    'cot': r't = \text{arcctg}(val) + \pi n, n \in \mathbb{Z}'
+})
+
+# Окремі випадки sin/cos = 0, 1, -1 разом з готовою LaTeX-формулою.
+SPECIAL_CASE_FORMULAS = _freeze({
+    'sin': {
+        0: (pi * N_INT, r't = \pi n, n \in \mathbb{Z}'),
+        1: (pi / 2 + 2 * pi * N_INT, r't = \frac{\pi}{2} + 2\pi n, n \in \mathbb{Z}'),
+        -1: (-pi / 2 + 2 * pi * N_INT, r't = -\frac{\pi}{2} + 2\pi n, n \in \mathbb{Z}')
+    },
+    'cos': {
+        0: (pi / 2 + pi * N_INT, r't = \frac{\pi}{2} + \pi n, n \in \mathbb{Z}'),
+        1: (2 * pi * N_INT, r't = 2\pi n, n \in \mathbb{Z}'),
+        -1: (pi + 2 * pi * N_INT, r't = \pi + 2\pi n, n \in \mathbb{Z}')
+    }
+})
+
+SPECIAL_CASE_SOLUTIONS = _freeze({
+    'sin': {
+        0: pi * N_INT,
+        1: pi / 2 + 2 * pi * N_INT,
+        -1: -pi / 2 + 2 * pi * N_INT
+    },
+    'cos': {
+        0: pi / 2 + pi * N_INT,
+        1: 2 * pi * N_INT,
+        -1: pi + 2 * pi * N_INT
+    },
+    'tan': {
+        0: pi * N_INT
+    },
+    'cot': {
+        0: pi / 2 + pi * N_INT
+    }
+})
+
+ZERO_CASE_SOLUTIONS = _freeze({
+    'sin': {
+        0: pi * N_INT
+    },
+    'cos': {
+        0: pi / 2 + pi * N_INT
+    }
+})
+
+SUM_TO_PRODUCT_FORMULAS = _freeze({
+    'sin+sin': r'\sin(\alpha) + \sin(\beta) = 2\sin\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
+    'sin-sin': r'\sin(\alpha) - \sin(\beta) = 2\sin\left(\frac{\alpha-\beta}{2}\right)\cos\left(\frac{\alpha+\beta}{2}\right)',
+    'cos+cos': r'\cos(\alpha) + \cos(\beta) = 2\cos\left(\frac{\alpha+\beta}{2}\right)\cos\left(\frac{\alpha-\beta}{2}\right)',
+    'cos-cos': r'\cos(\alpha) - \cos(\beta) = -2\sin\left(\frac{\alpha+\beta}{2}\right)\sin\left(\frac{\alpha-\beta}{2}\right)'
+})
+
+POWER_REDUCTION_FORMULAS = _freeze({
+    'sin': r'\sin^2(\alpha) = \frac{1 - \cos(2\alpha)}{2}',
+    'cos': r'\cos^2(\alpha) = \frac{1 + \cos(2\alpha)}{2}',
+    'cos+cos': SUM_TO_PRODUCT_FORMULAS['cos+cos'],
+    'cos-cos': SUM_TO_PRODUCT_FORMULAS['cos-cos']
+})
+
+IDENTITY_MAP = _freeze({
+    'sin': (cos(ALPHA) ** 2, r'\cos^2(\alpha) = 1 - \sin^2(\alpha)'),
+    'cos': (sin(ALPHA) ** 2, r'\sin^2(\alpha) = 1 - \cos^2(\alpha)')
+})
+
+# Табличні значення правої частини для найпростіших рівнянь.
+TABULAR_VALUES = _freeze({
+    'sin': [
+        0, 1, -1,
+        Rational(1, 2), Rational(-1, 2),
+        SQRT2 / 2, -SQRT2 / 2,
+        SQRT3 / 2, -SQRT3 / 2
+    ],
+    'cos': [
+        0, 1, -1,
+        Rational(1, 2), Rational(-1, 2),
+        SQRT2 / 2, -SQRT2 / 2,
+        SQRT3 / 2, -SQRT3 / 2
+    ],
+    'tan': [
+        0, 1, -1,
+        SQRT3 / 3, -SQRT3 / 3,
+        SQRT3, -SQRT3
+    ],
+    'cot': [
+        0, 1, -1,
+        SQRT3 / 3, -SQRT3 / 3,
+        SQRT3, -SQRT3
+    ]
+})
+
+# Допоміжні кути: phi -> (sin phi, cos phi).
+AUXILIARY_ANGLES = _freeze({
+    pi / 6: (Rational(1, 2), SQRT3 / 2),
+    pi / 4: (SQRT2 / 2, SQRT2 / 2),
+    pi / 3: (SQRT3 / 2, Rational(1, 2)),
+})
+AUXILIARY_AMPLITUDES = (2, SQRT2)
+AUXILIARY_TARGETS = (0, 1, -1, Rational(1, 2), Rational(-1, 2), SQRT2 / 2, -SQRT2 / 2)
+
+# BoundedSum: x0 -> допустимі доданки (func, k, sign, weight), для яких func(k * x0) = sign = +-1.
+# Таблицю обчислюємо один раз: sin/cos від кратних pi/2 SymPy обчислює автоматично.
+BOUNDED_SUM_ROOTS = (0, pi, pi / 2, 3 * pi / 2)
+BOUNDED_SUM_K_WEIGHTS = _freeze({1: 2, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1})
+
+
+def _bounded_sum_terms():
+    table = {}
+    for x0 in BOUNDED_SUM_ROOTS:
+        terms = []
+        for func in (sin, cos):
+            for k, weight in BOUNDED_SUM_K_WEIGHTS.items():
+                value = func(k * x0)
+                if value in (1, -1):
+                    terms.append((func, k, int(value), weight))
+        table[x0] = tuple(terms)
+    return table
+
+
+BOUNDED_SUM_TERMS = _freeze(_bounded_sum_terms())
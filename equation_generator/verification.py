@@ -0,0 +1,215 @@
+import linecache
+import math
+import os
+import random
+
+import sympy
+from sympy import FiniteSet
+
+from .solution_sets import PeriodicSolutionSet
+
+# Перевірка кожного згенерованого рівняння перед записом (EQUAGEN_VERIFY=0 вимикає).
+verify_enabled = os.environ.get('EQUAGEN_VERIFY', '1') not in ('', '0')
+
+TOLERANCE = 1e-8
+# Вузли сітки з меншою нев'язкою вважаємо коренями; строгіше за TOLERANCE, бо біля кратних коренів нев'язка дуже пласка.
+GRID_TOLERANCE = 1e-12
+MEMBER_DISTANCE = 1e-3
+MEMBER_RANGE = 8
+GRID_POINTS = 1024
+BISECTION_STEPS = 48
+# Локальний мінімум |нев'язки| на сітці, менший за MINIMUM_CANDIDATE, уточнюємо золотим перетином;
+# якщо уточнений мінімум не більший за MINIMUM_TOLERANCE, це корінь парної кратності (без зміни знаку).
+MINIMUM_CANDIDATE = 0.05
+MINIMUM_TOLERANCE = 1e-10
+GOLDEN_STEPS = 60
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+_numpy = None
+
+
+def _load_numpy():
+    # numpy необов'язковий: без нього обчислюємо ту саму функцію поточково через math.
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _lambdify(equation):
+    numpy = _load_numpy()
+    # arcctg у задачах має значення в (0, pi), а acot SymPy -- у (-pi/2, pi/2].
+    if numpy:
+        acot = lambda v: numpy.pi / 2 - numpy.arctan(v)
+    else:
+        acot = lambda v: math.pi / 2 - math.atan(v)
+    func = sympy.lambdify(equation.x, (equation.equation_obj.lhs, equation.equation_obj.rhs),
+                          modules=[{'acot': acot}, 'numpy' if numpy else 'math'])
+    # lambdify реєструє згенероване джерело в linecache: на довгих прогонах це витік пам'яті.
+    linecache.cache.pop(func.__code__.co_filename, None)
+    return func
+
+
+def _residuals_numpy(func, points):
+    numpy = _numpy
+    xs = numpy.asarray(points, dtype=float)
+    with numpy.errstate(all='ignore'):
+        lhs, rhs = func(xs)
+        lhs = numpy.broadcast_to(numpy.asarray(lhs, dtype=complex), xs.shape)
+        rhs = numpy.broadcast_to(numpy.asarray(rhs, dtype=complex), xs.shape)
+        diff = lhs - rhs
+        values = diff.real / (1 + numpy.abs(lhs) + numpy.abs(rhs))
+        values[~numpy.isfinite(diff) | (numpy.abs(diff.imag) > TOLERANCE)] = numpy.nan
+    return values.tolist()
+
+
+def _residuals_math(func, points):
+    values = []
+    for x in points:
+        try:
+            lhs, rhs = func(x)
+            value = (lhs - rhs) / (1 + abs(lhs) + abs(rhs))
+        except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+            value = math.nan
+        values.append(value)
+    return values
+
+
+def residuals(func, points):
+    # Знакова відносна нев'язка (lhs - rhs) / (1 + |lhs| + |rhs|): у полюсах вона прямує до +-1, а не до нескінченності.
+    # nan -- точка поза областю визначення.
+    if not points:
+        return []
+    if _load_numpy():
+        return _residuals_numpy(func, points)
+    return _residuals_math(func, points)
+
+
+def _solution_points(solution_obj):
+    # (сім'ї (крок, початок) у радіанах, окремі корені) або None, якщо множину не перевіряємо.
+    if isinstance(solution_obj, FiniteSet):
+        if not all(value.is_real for value in solution_obj):
+            return None
+        return [], [float(value) for value in solution_obj]
+
+    periodic = solution_obj if isinstance(solution_obj, PeriodicSolutionSet) \
+        else PeriodicSolutionSet.from_sympy(solution_obj)
+    if periodic is None:
+        return None
+    families = [(float(period) * math.pi, float(base) * math.pi + float(rest))
+                for period, base, rest in periodic.families]
+    return families, []
+
+
+def _in_solution(x, families, roots, tolerance=MEMBER_DISTANCE):
+    for step, start in families:
+        n = (x - start) / step
+        if abs(n - round(n)) * step < tolerance:
+            return True
+    return any(abs(x - root) < tolerance for root in roots)
+
+
+def _scan_interval(families, roots):
+    if families:
+        return -math.pi, math.pi
+    radius = 1 + 2 * max((abs(root) for root in roots), default=5)
+    return -radius, radius
+
+
+def _local_minima(grid, values, low, high):
+    # Інтервали [лівий сусід, правий сусід] навколо вузлів, де |нев'язка| не більша, ніж у сусідів.
+    # Крайні вузли порівнюємо з одним сусідом, а інтервал доводимо до межі сканування:
+    # корінь на кшталт x = pi лежить саме на межі [-pi, pi].
+    size = len(grid)
+    brackets = []
+    for i, value in enumerate(values):
+        if not abs(value) < MINIMUM_CANDIDATE:
+            continue
+        left = abs(values[i - 1]) if i > 0 else math.inf
+        right = abs(values[i + 1]) if i + 1 < size else math.inf
+        if left != left or right != right or abs(value) > left or abs(value) > right:
+            continue
+        brackets.append((grid[i - 1] if i > 0 else low, grid[i + 1] if i + 1 < size else high))
+    return brackets
+
+
+def _refine_minima(func, brackets):
+    # Золотий перетин для всіх інтервалів одразу; повертає точки мінімуму |нев'язки| та значення в них.
+    for _ in range(GOLDEN_STEPS):
+        if not brackets:
+            break
+        inner = [(b - GOLDEN_RATIO * (b - a), a + GOLDEN_RATIO * (b - a)) for a, b in brackets]
+        values = residuals(func, [x for pair in inner for x in pair])
+        narrowed = []
+        for i, ((a, b), (c, d)) in enumerate(zip(brackets, inner)):
+            value_c, value_d = abs(values[2 * i]), abs(values[2 * i + 1])
+            if value_c != value_c or value_d != value_d:
+                continue
+            narrowed.append((a, d) if value_c <= value_d else (c, b))
+        brackets = narrowed
+    points = [(a + b) / 2 for a, b in brackets]
+    return list(zip(points, residuals(func, points)))
+
+
+def _find_roots(func, low, high, rng):
+    # Один випадковий вузол на комірку; корінь уточнюємо бісекцією всіх інтервалів зі зміною знаку одразу.
+    # Корені парної кратності знаку не змінюють -- їх шукаємо серед локальних мінімумів |нев'язки|.
+    # Повертає пари (корінь, допустима відстань до відповіді).
+    width = (high - low) / GRID_POINTS
+    grid = [low + (i + rng.random()) * width for i in range(GRID_POINTS)]
+    values = residuals(func, grid)
+
+    # Вузол біля кратного кореня не уточнюємо, тож він може бути на відстані до ширини комірки.
+    found = [(x, width) for x, value in zip(grid, values) if abs(value) <= GRID_TOLERANCE]
+    brackets = [(grid[i], grid[i + 1], values[i]) for i in range(GRID_POINTS - 1)
+                if values[i] * values[i + 1] < 0 and abs(values[i]) > TOLERANCE and abs(values[i + 1]) > TOLERANCE]
+
+    for _ in range(BISECTION_STEPS):
+        if not brackets:
+            break
+        mids = [(a + b) / 2 for a, b, _ in brackets]
+        mid_values = residuals(func, mids)
+        narrowed = []
+        for (a, b, value_a), mid, value_mid in zip(brackets, mids, mid_values):
+            if value_mid != value_mid:
+                continue
+            if value_a * value_mid <= 0:
+                narrowed.append((a, mid, value_a))
+            else:
+                narrowed.append((mid, b, value_mid))
+        brackets = narrowed
+
+    # Після бісекції мала нев'язка -- корінь, велика -- полюс (там нев'язка прямує до +-1).
+    ends = [(a + b) / 2 for a, b, _ in brackets]
+    found.extend((x, MEMBER_DISTANCE) for x, value in zip(ends, residuals(func, ends)) if abs(value) <= 1e-6)
+
+    # Біля плаского мінімуму золотий перетин визначає точку лише з точністю близько sqrt(похибки) --
+    # для кореня кратності 4 це вже ~1e-4, тож допуск той самий, що й після бісекції.
+    minima = _refine_minima(func, _local_minima(grid, values, low, high))
+    found.extend((x, MEMBER_DISTANCE) for x, value in minima if abs(value) <= MINIMUM_TOLERANCE)
+    return found
+
+
+def check_solution(equation, seed=0):
+    # None, якщо відповідь узгоджується з рівнянням, інакше опис першої знайденої проблеми.
+    points = _solution_points(equation.solution_obj)
+    if points is None:
+        return None
+    families, roots = points
+    func = _lambdify(equation)
+
+    members = [start + step * n for step, start in families for n in range(-MEMBER_RANGE, MEMBER_RANGE + 1)]
+    members.extend(roots)
+    for x, value in zip(members, residuals(func, members)):
+        if not abs(value) <= TOLERANCE:
+            return f"x = {x:.10g} з відповіді не задовольняє рівняння (нев'язка {value:.3g})"
+
+    low, high = _scan_interval(families, roots)
+    for x, distance in _find_roots(func, low, high, random.Random(seed)):
+        if not _in_solution(x, families, roots, distance):
+            return f"x = {x:.10g} задовольняє рівняння, але не входить у відповідь"
+    return None
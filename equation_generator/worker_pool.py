@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+
+from .generation import generate_equation, install_cache_manager
+
+DEFAULT_MAX_TASKS_PER_WORKER = 1000
+
+
+def warm_up(type_keys=None, seeds=(0,)):
+    from . import EQUATION_REGISTRY
+
+    # Перший виклик solveset/latex на тригонометричних рівняннях значно повільніший:
+    # наповнюємо кеші SymPy до того, як воркер отримає реальні задачі.
+    for type_key in type_keys or list(EQUATION_REGISTRY):
+        for seed in seeds:
+            try:
+                generate_equation(type_key, seed)
+            except Exception:
+                pass
+
+
+def _init_worker(warmup, type_keys, seeds, cache_manager):
+    if warmup:
+        warm_up(type_keys, seeds)
+    if cache_manager is not None:
+        # Копія несе лічильники батьківського процесу на момент старту пулу: їх уже враховано там.
+        cache_manager.take_delta()
+    install_cache_manager(cache_manager)
+
+
+class WorkerPool:
+
+    def __init__(self, processes=None, max_tasks_per_worker=DEFAULT_MAX_TASKS_PER_WORKER,
+                 warmup=True, warmup_types=None, warmup_seeds=(0,), cache_manager=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.warmup = warmup
+        self.warmup_types = list(warmup_types) if warmup_types else None
+        self.warmup_seeds = tuple(warmup_seeds)
+        # Кожен воркер отримує власну копію менеджера кешів; приріст її метрик повертається з результатами
+        # (generate_record_metered, run_chunk), і EquationSet зводить його в цей екземпляр.
+        self.cache_manager = cache_manager
+        self._pool = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self):
+        if self._pool is None:
+            initializer, initargs = None, ()
+            if self.warmup or self.cache_manager is not None:
+                initializer = _init_worker
+                initargs = (self.warmup, self.warmup_types, self.warmup_seeds, self.cache_manager)
+
+            self._pool = multiprocessing.Pool(
+                self.processes,
+                initializer=initializer,
+                initargs=initargs,
+                # Рахує завдання пулу: у map це одне рівняння, в add_mix -- пакет до MAX_CHUNK_TASKS рівнянь.
+                maxtasksperchild=self.max_tasks_per_worker,
+            )
+        return self
+
+    def map(self, func, tasks, chunksize=1):
+        return self.start()._pool.map(func, tasks, chunksize)
+
+    def imap_unordered(self, func, tasks, chunksize=1):
+        return self.start()._pool.imap_unordered(func, tasks, chunksize)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
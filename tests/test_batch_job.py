@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import equation_generator.equation_container as equation_container
+from equation_generator.batch_job import BatchJob
+from equation_generator.errors import FailureBudgetExceeded
+
+BLUEPRINT = {'13': 7, '3': 5, '4': 4}
+
+
+def run_job(directory, **kwargs):
+    job = BatchJob(str(directory), BLUEPRINT, seed=3, block_size=4, **kwargs)
+    job.run()
+    return job
+
+
+@pytest.fixture(scope='module')
+def reference(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('reference')
+    run_job(directory)
+    return (directory / 'journal.jsonl').read_bytes()
+
+
+def test_uninterrupted_run_writes_every_record(reference, tmp_path):
+    job = run_job(tmp_path)
+    records = list(job.records())
+    assert job.done
+    assert (tmp_path / 'journal.jsonl').read_bytes() == reference
+    assert [sum(r.type_key == t for r in records) for t in BLUEPRINT] == list(BLUEPRINT.values())
+    records[0].rehydrate()
+    assert job.load().equations == records
+
+
+def test_resume_after_torn_write_matches_uninterrupted_run(reference, tmp_path):
+    job = BatchJob(str(tmp_path), BLUEPRINT, seed=3, block_size=4)
+    job.run(max_blocks=2)
+    checkpointed = job.journal_bytes
+    # Падіння посеред наступного блоку: частина рядка вже в журналі, контрольна точка -- ні.
+    with open(tmp_path / 'journal.jsonl', 'ab') as f:
+        f.write(b'{"type_key": "13", "se')
+
+    resumed = BatchJob(str(tmp_path))
+    assert resumed.blocks == 2 and not resumed.done
+    assert (tmp_path / 'journal.jsonl').stat().st_size == checkpointed
+    resumed.run(max_blocks=1)
+    BatchJob(str(tmp_path), BLUEPRINT, seed=3).run()
+    assert (tmp_path / 'journal.jsonl').read_bytes() == reference
+
+
+def test_resume_rejects_different_parameters(tmp_path):
+    BatchJob(str(tmp_path), BLUEPRINT, seed=3, block_size=4)
+    with pytest.raises(ValueError):
+        BatchJob(str(tmp_path), BLUEPRINT, seed=4)
+    with pytest.raises(ValueError):
+        BatchJob(str(tmp_path), {'13': 1}, seed=3)
+    with pytest.raises(ValueError):
+        BatchJob(str(tmp_path), block_size=8)
+    with pytest.raises(ValueError):
+        BatchJob(str(tmp_path / 'missing'))
+
+
+def test_failure_budget_is_checkpointed(tmp_path, monkeypatch):
+    original = equation_container.generate_record_safe
+
+    def flaky(task):
+        if task[1] % 3 == 0:
+            return None, 'boom'
+        return original(task)
+
+    monkeypatch.setattr(equation_container, 'generate_record_safe', flaky)
+    job = BatchJob(str(tmp_path), {'13': 20}, seed=1, block_size=5, max_failures=1)
+    with pytest.raises(FailureBudgetExceeded):
+        job.run()
+
+    checkpoint = json.loads((tmp_path / 'checkpoint.json').read_text(encoding='utf-8'))
+    assert checkpoint['progress']['13']['failures'] > 1
+    # Бюджет -- не частина контрольної точки: його передають знову, а більший дозволяє продовжити.
+    with pytest.raises(FailureBudgetExceeded):
+        BatchJob(str(tmp_path), max_failures=1).run()
+    resumed = BatchJob(str(tmp_path), max_failures=None)
+    assert resumed.run()['13']['generated'] == 20
+    assert len(list(resumed.records())) == 20
+
+
+def test_failing_type_does_not_fill_the_block(tmp_path, monkeypatch):
+    calls = []
+
+    def broken(task):
+        calls.append(task)
+        return None, 'boom'
+
+    monkeypatch.setattr(equation_container, 'generate_record_safe', broken)
+    job = BatchJob(str(tmp_path), {'13': 500}, seed=1, block_size=100, max_failures=3)
+    with pytest.raises(FailureBudgetExceeded):
+        job.run()
+    assert len(calls) == 4
@@ -0,0 +1,52 @@
+import pytest
+
+from equation_generator.cache_control import CacheManager
+from equation_generator.equation_container import EquationSet
+from equation_generator.worker_pool import WorkerPool
+
+BLUEPRINT = {'13': 4, '3': 4}
+
+
+def run_mix(processes, manager):
+    pool = WorkerPool(processes, warmup=False, cache_manager=manager) if processes > 1 else None
+    with EquationSet(seed=1, pool=pool, cache_manager=manager) as equation_set:
+        equation_set.add_mix(BLUEPRINT)
+        equation_set.add_equations('13', 3)
+        metrics = equation_set.cache_metrics
+    if pool is not None:
+        pool.close()
+    return metrics
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_metrics_count_every_equation(processes):
+    # max_cache_entries=1: кожна перевірка очищає кеші, тож очищень стільки ж, скільки рівнянь.
+    metrics = run_mix(processes, CacheManager(max_cache_entries=1))
+    assert metrics['equations'] == metrics['checks'] == metrics['clears'] == 11
+    assert metrics['entries_cleared'] > 0
+    assert metrics['peak_cache_entries'] > 0
+    if metrics['rss_mb'] is not None:
+        assert 0 < metrics['rss_mb'] <= metrics['peak_rss_mb']
+
+
+def test_pool_metrics_skip_counts_inherited_by_workers():
+    manager = CacheManager(max_cache_entries=1)
+    with EquationSet(seed=1, cache_manager=manager) as equation_set:
+        equation_set.add_equations('13', 2)
+    assert manager.equations == 2
+    # Копія у воркерах стартує з equations=2; у батьківський менеджер мають повернутися лише нові рівняння.
+    assert run_mix(2, manager)['equations'] == 13
+
+
+def test_take_delta_and_merge():
+    worker = CacheManager(max_cache_entries=None)
+    for _ in range(3):
+        worker.after_equation()
+    parent = CacheManager(max_cache_entries=None)
+    parent.merge(worker.take_delta())
+    worker.after_equation()
+    delta = worker.take_delta()
+    assert delta['equations'] == 1
+    parent.merge(delta)
+    assert parent.equations == parent.checks == 4
+    assert worker.take_delta()['equations'] == 0
@@ -0,0 +1,62 @@
+import pytest
+
+import equation_generator.equation_container as equation_container
+from equation_generator.equation_container import EquationSet
+from equation_generator.errors import FailureBudgetExceeded
+
+
+@pytest.fixture
+def attempts(monkeypatch):
+    # Сід, кратний 3, -- невдача; тип '3' падає завжди. Список фіксує всі спроби.
+    original = equation_container.generate_record_safe
+    calls = []
+
+    def flaky(task):
+        calls.append(task)
+        if task[0] == '3':
+            return None, 'RuntimeError: завжди'
+        if task[1] % 3 == 0:
+            return None, 'ValueError: кратний 3'
+        return original(task)
+
+    monkeypatch.setattr(equation_container, 'generate_record_safe', flaky)
+    return calls
+
+
+def test_add_equations_retries_until_count(attempts):
+    equation_set = EquationSet(seed=5, max_failures=None)
+    report = equation_set.add_equations('13', 12)
+    assert report['generated'] == len(equation_set.equations) == 12
+    assert report['failures'] == len(attempts) - 12 > 0
+    assert report['errors'] == {'ValueError: кратний 3': report['failures']}
+
+
+def test_always_failing_type_stops_at_budget(attempts):
+    equation_set = EquationSet(seed=5, max_failures=10)
+    with pytest.raises(FailureBudgetExceeded) as info:
+        equation_set.add_equations('3', 500)
+    # Бюджет 10 -- рівно 11 спроб, а не 500.
+    assert len(attempts) == 11
+    error = info.value
+    assert (error.type_key, error.requested, error.generated, error.failures, error.max_failures) == ('3', 500, 0, 11, 10)
+    assert error.errors == {'RuntimeError: завжди': 11}
+    assert equation_set.equations == []
+
+
+def test_add_mix_budget_per_type(attempts):
+    equation_set = EquationSet(seed=5, max_failures={'3': 2, '13': None})
+    with pytest.raises(FailureBudgetExceeded) as info:
+        equation_set.add_mix({'13': 6, '3': 400})
+    assert info.value.type_key == '3'
+    assert sum(task[0] == '3' for task in attempts) == 3
+
+    reports = EquationSet(seed=5, max_failures={'3': 2, '13': None}).add_mix({'13': 6})
+    assert reports['13']['generated'] == 6
+    assert reports['13']['failures'] == sum(reports['13']['errors'].values())
+
+
+def test_round_size():
+    assert EquationSet.round_size(500, 0, 10) == 11
+    assert EquationSet.round_size(500, 10, 10) == 1
+    assert EquationSet.round_size(4, 0, 10) == 4
+    assert EquationSet.round_size(500, 3, None) == 500
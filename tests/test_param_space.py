@@ -0,0 +1,125 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from equation_generator.param_space import Domain, ParameterSpace, PooledSpace, alias_table
+
+
+def alias_probabilities(weights):
+    # Точний розподіл вибірки з таблиці: рівномірний стовпчик i, далі i з імовірністю threshold / total, інакше alias.
+    threshold, alias, total = alias_table(weights)
+    n = len(weights)
+    result = [Fraction(0)] * n
+    for i in range(n):
+        result[i] += Fraction(threshold[i], total * n)
+        result[alias[i]] += Fraction(total - threshold[i], total * n)
+    return result
+
+
+@pytest.mark.parametrize('weights', [[1], [1, 1], [3, 1], [1, 2, 3, 4], [7, 1, 1, 1, 1, 1, 1, 13], [5, 5, 1]])
+def test_alias_table_is_exact(weights):
+    assert alias_probabilities(weights) == [Fraction(w, sum(weights)) for w in weights]
+
+
+def test_domain_from_choices_counts_repeats_by_type():
+    domain = Domain.from_choices([1, 1, 2, 1.0, True])
+    assert domain.values == (1, 2, 1.0, True)
+    assert domain.weights == (2, 1, 1, 1)
+    assert Domain.coerce({'a': 3, 'b': 1}).weights == (3, 1)
+    with pytest.raises(ValueError):
+        Domain([1, 2], [1])
+
+
+def test_points_follow_domain_weights():
+    space = ParameterSpace('weights', [('k', [1, 1, 2, 3]), ('s', {'+': 1, '-': 3})])
+    probabilities = {(p['k'], p['s']): prob for p, prob in space.points()}
+    assert probabilities[(1, '-')] == Fraction(2, 4) * Fraction(3, 4)
+    assert sum(probabilities.values()) == 1
+    assert space.marginals()['k'] == [(1, Fraction(1, 2)), (2, Fraction(1, 4)), (3, Fraction(1, 4))]
+
+
+def test_constraints_match_rejection_loop():
+    space = ParameterSpace('constrained', [
+        ('a', [1, 2, 3]),
+        ('b', lambda p: list(range(p['a'] + 1))),
+    ], constraints=[lambda p: (p['a'] + p['b']) % 2 == 0])
+
+    # Цикл з відкиданням: точка приймається з імовірністю acceptance, розподіл -- умовний.
+    raw = {}
+    for a in (1, 2, 3):
+        for b in range(a + 1):
+            raw[(a, b)] = Fraction(1, 3) * Fraction(1, a + 1)
+    accepted = {key: prob for key, prob in raw.items() if sum(key) % 2 == 0}
+
+    assert space.raw_size == len(raw)
+    assert space.size == len(accepted)
+    assert space.acceptance == sum(accepted.values())
+    for point, probability in space.points():
+        assert probability == accepted[(point['a'], point['b'])] / space.acceptance
+
+
+def test_empty_space_raises():
+    space = ParameterSpace('empty', [('a', [1, 2])], constraints=[lambda p: p['a'] > 5])
+    with pytest.raises(ValueError):
+        space.compiled
+
+
+def test_empty_domain_drops_branch_and_none_skips_parameter():
+    space = ParameterSpace('branches', [
+        ('path', ['x', 'y', 'z']),
+        ('k', lambda p: [] if p['path'] == 'z' else [1, 2]),
+        ('m', lambda p: None if p['path'] == 'x' else [5]),
+    ])
+    assert space.names == ('path', 'k', 'm')
+    paths = {point['path']: probability for point, probability in space.points() if point['k'] == 1}
+    assert set(paths) == {'x', 'y'}
+    assert all(point['m'] is None for point, _ in space.points() if point['path'] == 'x')
+    assert space.acceptance == Fraction(2, 3)
+
+
+def test_nested_space_names_and_probabilities():
+    inner = ParameterSpace('inner', [('u', [1, 2]), ('v', [1, 2])], constraints=[lambda p: p['u'] != p['v']])
+    outer = ParameterSpace('outer', [
+        ('kind', ['plain', 'nested']),
+        ('pair', lambda p: inner if p['kind'] == 'nested' else None),
+        ('w', [0, 1]),
+    ])
+    assert outer.names == ('kind', 'w', 'u', 'v')
+    assert outer.nested_spaces() == [inner]
+    # Відкидання всередині вкладеного простору не змінює ймовірності зовнішніх параметрів.
+    assert dict(outer.marginals()['kind']) == {'plain': Fraction(1, 2), 'nested': Fraction(1, 2)}
+    assert outer.probability({'kind': 'nested', 'w': 0, 'u': 1, 'v': 2}) == Fraction(1, 8)
+    assert outer.probability({'kind': 'plain', 'w': 1, 'u': None, 'v': None}) == Fraction(1, 4)
+
+
+def test_sample_uses_rng_and_covers_space():
+    space = ParameterSpace('sampling', [('k', [1, 2, 3]), ('s', [-1, 1])], constraints=[lambda p: p['k'] * p['s'] != -3])
+    samples = [space.sample(random.Random(seed)) for seed in range(400)]
+    assert samples == [space.sample(random.Random(seed)) for seed in range(400)]
+    report = space.coverage(samples)
+    assert report['covered'] == space.size == 5
+    assert report['unknown'] == 0
+    assert max(report['max_marginal_deviation'].values()) < 0.1
+
+
+def test_pooled_space_rebuilds_when_pool_changes():
+    built = []
+
+    def build(pool):
+        built.append(pool)
+        return ParameterSpace('pooled', [('k', pool)])
+
+    class Generator:
+        k_pool = [1, 2]
+        parameters = PooledSpace(build, 'k_pool')
+
+    class Subclass(Generator):
+        k_pool = [3]
+
+    assert Generator.parameters is Generator.parameters
+    assert Subclass.parameters.names == ('k',)
+    assert [p['k'] for p, _ in Subclass.parameters.points()] == [3]
+    Generator.k_pool = [1, 2, 4]
+    assert [p['k'] for p, _ in Generator.parameters.points()] == [1, 2, 4]
+    assert built == [(1, 2), (3,), (1, 2, 4)]
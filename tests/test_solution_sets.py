@@ -0,0 +1,53 @@
+from fractions import Fraction
+
+import sympy
+from sympy import EmptySet, ImageSet, Integers, Lambda, Union, atan, pi
+
+from equation_generator.solution_sets import PeriodicSolutionSet, series_bases, union_solution_sets
+from equation_generator.trig_tables import N_INT, X
+
+
+def series(start, step):
+    return ImageSet(Lambda(N_INT, step * N_INT + start), Integers)
+
+
+def test_merges_complete_shift_sets():
+    result = union_solution_sets([series(0, pi), series(pi / 2, pi)])
+    assert isinstance(result, PeriodicSolutionSet)
+    assert result.families == ((Fraction(1, 2), Fraction(0), 0),)
+    assert result.latex() == r"\left\{\frac{\pi n}{2}\; \middle|\; n \in \mathbb{Z}\right\}"
+
+
+def test_drops_duplicate_and_covered_series():
+    result = union_solution_sets([series(pi / 3, pi), series(pi / 3 + 2 * pi, pi), series(0, pi / 3)])
+    assert result.families == ((Fraction(1, 3), Fraction(0), 0),)
+
+
+def test_keeps_distinct_irrational_shifts():
+    result = union_solution_sets([series(atan(2), pi), series(pi / 4, pi)])
+    assert isinstance(result, PeriodicSolutionSet)
+    assert len(result.families) == 2
+    assert series_bases(result) == series_bases(Union(series(atan(2), pi), series(pi / 4, pi)))
+
+
+def test_same_points_as_sympy_union():
+    parts = [series(pi / 6, 2 * pi), series(5 * pi / 6, 2 * pi), series(pi / 2, pi), series(-pi / 2, 2 * pi)]
+    result = union_solution_sets(parts)
+    assert series_bases(result) == series_bases(Union(*parts))
+    assert series_bases(result.to_sympy()) == series_bases(Union(*parts))
+
+
+def test_empty_and_fallback():
+    assert union_solution_sets([EmptySet]).is_empty
+    assert union_solution_sets([EmptySet]) == EmptySet
+    # Серія з кроком, не кратним pi, -- звичайний Union SymPy.
+    other = ImageSet(Lambda(N_INT, N_INT + 1), Integers)
+    assert isinstance(union_solution_sets([series(0, pi), other]), Union)
+
+
+def test_from_sympy_roundtrip_and_hash():
+    solution = sympy.solveset(sympy.sin(2 * X), X, sympy.Reals)
+    periodic = PeriodicSolutionSet.from_sympy(union_solution_sets([series(0, pi / 2)]).to_sympy())
+    assert periodic == union_solution_sets([series(0, pi / 2)])
+    assert hash(periodic) == hash(union_solution_sets([series(0, pi / 2)]))
+    assert series_bases(periodic) == series_bases(solution)
@@ -0,0 +1,34 @@
+import pytest
+from sympy import Eq, sin
+
+from equation_generator import EQUATION_REGISTRY
+from equation_generator.base_class import TrigonometricEquation
+from equation_generator.generation import generate_equation
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(TrigonometricEquation, 'strict_steps', True)
+
+
+@pytest.mark.parametrize('type_key', list(EQUATION_REGISTRY))
+def test_steps_only_read_sub_solutions(strict, type_key):
+    # Кроки будуються з підрозв'язків _solve: у строгому режимі жоден розв'язувач не викликається повторно.
+    for seed in range(20):
+        equation = generate_equation(type_key, seed)
+        assert equation.steps
+
+
+def test_solver_in_steps_raises(strict):
+    class SolvesInSteps(TrigonometricEquation):
+        def _generate(self):
+            self.equation_obj = Eq(sin(self.x), 0)
+
+        def _solve(self):
+            self.solution_obj = self._solveset(self.equation_obj)
+
+        def _build_solution_steps(self):
+            self._solveset(Eq(sin(self.x), 1))
+
+    with pytest.raises(AssertionError):
+        SolvesInSteps()
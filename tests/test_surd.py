@@ -0,0 +1,59 @@
+from fractions import Fraction
+
+import pytest
+import sympy
+
+from equation_generator.surd import Surd, denominators_lcm, terms_denominators_lcm
+
+VALUES = [
+    (Surd(0), sympy.S(0)),
+    (Surd(Fraction(-3, 4)), sympy.Rational(-3, 4)),
+    (Surd.sqrt(3), sympy.sqrt(3)),
+    (Surd.sqrt(2) / 2, sympy.sqrt(2) / 2),
+    (1 - Surd.sqrt(3) / 3, 1 - sympy.sqrt(3) / 3),
+    (Surd.sqrt(12, Fraction(1, 5)), sympy.sqrt(12) / 5),
+]
+
+
+def assert_same(surd, expr):
+    assert sympy.simplify(surd.to_sympy() - expr) == 0
+    assert float(surd) == pytest.approx(float(expr))
+
+
+@pytest.mark.parametrize('a, a_expr', VALUES)
+@pytest.mark.parametrize('b, b_expr', VALUES)
+def test_ring_operations_match_sympy(a, a_expr, b, b_expr):
+    assert_same(a + b, a_expr + b_expr)
+    assert_same(a - b, a_expr - b_expr)
+    assert_same(a * b, a_expr * b_expr)
+    assert (a == b) == (sympy.simplify(a_expr - b_expr) == 0)
+    if a != b:
+        assert (a < b) == bool(a_expr < b_expr)
+
+
+def test_division_by_monomials():
+    assert_same(Surd(1) / Surd.sqrt(3), 1 / sympy.sqrt(3))
+    assert_same((2 + Surd.sqrt(2)) / (3 * Surd.sqrt(2)), (2 + sympy.sqrt(2)) / (3 * sympy.sqrt(2)))
+    assert_same(5 / Surd.sqrt(5, 2), 5 / (2 * sympy.sqrt(5)))
+    with pytest.raises(ValueError):
+        Surd(1) / (1 + Surd.sqrt(2))
+
+
+def test_normalizes_square_factors_and_cancels_terms():
+    assert Surd.sqrt(8) == 2 * Surd.sqrt(2)
+    assert Surd.sqrt(3) * Surd.sqrt(3) == 3
+    assert (Surd.sqrt(2) - Surd.sqrt(2)).terms == {}
+    assert (Surd.sqrt(2) * Surd.sqrt(6)).to_sympy() == 2 * sympy.sqrt(3)
+
+
+def test_rational_values_hash_like_fractions():
+    assert Surd(Fraction(1, 2)).is_rational
+    assert not (Surd(1) + Surd.sqrt(2)).is_rational
+    assert hash(Surd(Fraction(1, 2))) == hash(Fraction(1, 2))
+    assert len({Surd(2), Surd.sqrt(4), Surd(1) + 1}) == 1
+
+
+def test_denominator_helpers():
+    values = [Surd(Fraction(1, 2)), Surd(Fraction(2, 3)), Surd.sqrt(3) / 5]
+    assert denominators_lcm(values) == 6
+    assert terms_denominators_lcm(values) == 30
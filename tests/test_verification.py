@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+from sympy import Eq, ImageSet, Integers, Lambda, cos, pi, sin
+
+from equation_generator.generation import generate_equation
+from equation_generator.solution_sets import union_solution_sets
+from equation_generator.trig_tables import N_INT, X
+from equation_generator.verification import check_solution
+
+
+def equation(lhs, rhs, *series):
+    solution = union_solution_sets([ImageSet(Lambda(N_INT, step * N_INT + start), Integers) for start, step in series])
+    return SimpleNamespace(x=X, equation_obj=Eq(lhs, rhs), solution_obj=solution)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bounded_sum_missing_tangential_family(seed):
+    # BoundedSum, сід 8: cos 2x + cos 6x = 2 з відповіддю 2pi n. x = pi теж корінь, але нев'язка там знаку не змінює.
+    assert check_solution(equation(cos(2 * X) + cos(6 * X), 2, (0, 2 * pi)), seed) is not None
+    assert check_solution(equation(cos(2 * X) + cos(6 * X), 2, (0, pi)), seed) is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_missing_double_root_of_quadratic_factor(seed):
+    # Множник (sin x - 1) дає корінь x = pi/2 парної кратності.
+    lhs = (sin(X) - 1) * (2 * sin(X) + 1)
+    full = [(pi / 2, 2 * pi), (-pi / 6, 2 * pi), (-5 * pi / 6, 2 * pi)]
+    assert check_solution(equation(lhs, 0, *full[1:]), seed) is not None
+    assert check_solution(equation(lhs, 0, *full), seed) is None
+
+
+def test_sign_change_roots_still_checked():
+    assert check_solution(equation(sin(2 * X), 0, (0, pi)), 0) is not None
+    assert check_solution(equation(sin(2 * X), 0, (0, pi / 2)), 0) is None
+
+
+def test_bounded_sum_answers_every_common_root():
+    # Сід 8 раніше давав 2pi n; тепер відповідь -- усі спільні корені доданків.
+    equation_8 = generate_equation('13', 8)
+    assert equation_8.solution_obj == union_solution_sets([ImageSet(Lambda(N_INT, pi * N_INT), Integers)])
+    for seed in range(150):
+        assert check_solution(generate_equation('13', seed), seed) is None